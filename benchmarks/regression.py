@@ -0,0 +1,193 @@
+"""
+Проверка производительности относительно сохраненной базовой линии.
+Замеры повторяются, сравниваются медианы с учетом межквартильного
+размаха (IQR), при регрессии команда завершается с кодом 1.
+
+    python -m benchmarks.regression --repeat 7
+    python -m benchmarks.regression --current results.json --tolerance 0.15
+    python -m benchmarks.regression --update --sizes 10000 50000
+
+Абсолютное время зависит от машины, поэтому базовая линия хранит описание
+хоста (meta.host), и сравнение с замером на другом хосте отклоняется.
+"""
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from benchmarks.suite import run_benchmarks
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+TIME_TOLERANCE = 0.25
+MEMORY_TOLERANCE = 0.10
+DEFAULT_REPEAT = 7
+BASELINE_SIZES = (10_000, 50_000)
+# Код выхода, если базовая линия снята на другом хосте
+HOST_MISMATCH = 2
+
+Key = Tuple[str, int]
+
+
+class Stats(NamedTuple):
+    """Медиана и квартили времени вызова в секундах"""
+    median: float
+    q1: float
+    q3: float
+
+    @property
+    def iqr(self) -> float:
+        return self.q3 - self.q1
+
+
+class Finding(NamedTuple):
+    name: str
+    size: int
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def timing_stats(timings: Sequence[float]) -> Stats:
+    """Медиана и квартили; для одного замера размах нулевой"""
+    if not timings:
+        raise ValueError("Нет замеров времени")
+    if len(timings) == 1:
+        return Stats(timings[0], timings[0], timings[0])
+    q1, median, q3 = statistics.quantiles(timings, n=4, method="inclusive")
+    return Stats(median, q1, q3)
+
+
+def _index(report: Dict[str, Any]) -> Dict[Key, Dict[str, Any]]:
+    return {(result["name"], result["size"]): result for result in report["results"]}
+
+
+def compare(
+        baseline: Dict[str, Any],
+        current: Dict[str, Any],
+        tolerance: float = TIME_TOLERANCE,
+        memory_tolerance: float = MEMORY_TOLERANCE
+) -> List[Finding]:
+    """
+    Возвращает регрессии текущего отчета run_benchmarks относительно базового.
+    Время считается ухудшившимся, если медиана выросла больше чем на tolerance
+    и при этом нижний квартил текущих замеров выше верхнего квартиля базовых,
+    то есть разница не объясняется шумом. Пиковая память сравнивается с допуском
+    memory_tolerance. Замеры, которых нет в одном из отчетов, не сравниваются.
+    """
+    findings = []
+    current_results = _index(current)
+    for key, base in _index(baseline).items():
+        result = current_results.get(key)
+        if result is None:
+            continue
+        name, size = key
+
+        base_stats = timing_stats(base["timings"])
+        stats = timing_stats(result["timings"])
+        if stats.median > base_stats.median * (1 + tolerance) and stats.q1 > base_stats.q3:
+            findings.append(Finding(name, size, "median_seconds", base_stats.median, stats.median))
+
+        base_peak = base.get("peak_bytes")
+        peak = result.get("peak_bytes")
+        if base_peak and peak and peak > base_peak * (1 + memory_tolerance):
+            findings.append(Finding(name, size, "peak_bytes", base_peak, peak))
+
+    return findings
+
+
+def format_report(baseline: Dict[str, Any], current: Dict[str, Any], findings: List[Finding]) -> str:
+    """Таблица сравнения всех общих замеров; регрессии отмечены"""
+    regressed = {(finding.name, finding.size, finding.metric) for finding in findings}
+    current_results = _index(current)
+    lines = [f"{'замер':<42} {'размер':>9} {'база, с':>10} {'сейчас, с':>10} {'IQR, с':>9} {'память':>8}"]
+    for key, base in _index(baseline).items():
+        result = current_results.get(key)
+        if result is None:
+            lines.append(f"{key[0]:<42} {key[1]:>9} нет в текущем замере")
+            continue
+        base_stats = timing_stats(base["timings"])
+        stats = timing_stats(result["timings"])
+        memory = ""
+        if base.get("peak_bytes") and result.get("peak_bytes"):
+            memory = f"{result['peak_bytes'] / base['peak_bytes'] - 1:+.0%}"
+        marks = "".join(
+            mark for metric, mark in (("median_seconds", " ВРЕМЯ"), ("peak_bytes", " ПАМЯТЬ"))
+            if (key[0], key[1], metric) in regressed
+        )
+        lines.append(
+            f"{key[0]:<42} {key[1]:>9} {base_stats.median:>10.4f} {stats.median:>10.4f} "
+            f"{stats.iqr:>9.4f} {memory:>8}{marks}"
+        )
+    for finding in findings:
+        lines.append(
+            f"Регрессия {finding.name} [{finding.size}] {finding.metric}: "
+            f"{finding.baseline:.6g} -> {finding.current:.6g} ({finding.change:+.1%})"
+        )
+    return "\n".join(lines)
+
+
+def host_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Поля описания хоста, которыми различаются отчеты; пустой список, если хост тот же"""
+    base_host = baseline.get("meta", {}).get("host") or {}
+    host = current.get("meta", {}).get("host") or {}
+    return [field for field in sorted(set(base_host) | set(host)) if base_host.get(field) != host.get(field)]
+
+
+def _load(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        report: Dict[str, Any] = json.load(file)
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение производительности с базовой линией")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--current", type=Path, help="готовый отчет benchmarks.suite вместо нового замера")
+    parser.add_argument("--tolerance", type=float, default=TIME_TOLERANCE, help="допустимый рост медианы времени")
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--update", action="store_true", help="записать новый замер как базовую линию")
+    parser.add_argument("--sizes", type=int, nargs="+", help="размеры для --update, по умолчанию BASELINE_SIZES")
+    parser.add_argument(
+        "--allow-host-mismatch", action="store_true", help="сравнивать с базовой линией, снятой на другом хосте"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None if args.update else _load(args.baseline)
+    if args.current is not None:
+        current = _load(args.current)
+    else:
+        # Новый замер повторяет размеры и набор функций базовой линии
+        sizes = sorted({result["size"] for result in baseline["results"]}) if baseline else None
+        names = list(dict.fromkeys(result["name"] for result in baseline["results"])) if baseline else None
+        current = run_benchmarks(sizes or args.sizes or BASELINE_SIZES, names, args.repeat)
+
+    if baseline is None:
+        args.baseline.write_text(json.dumps(current, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        print(f"Базовая линия сохранена в {args.baseline}")
+        return 0
+
+    mismatch = host_mismatch(baseline, current)
+    if mismatch:
+        message = f"Базовая линия снята на другом хосте (различаются: {', '.join(mismatch)})"
+        if not args.allow_host_mismatch:
+            print(
+                f"{message}. Обновите ее на этом хосте (--update) или укажите --allow-host-mismatch",
+                file=sys.stderr,
+            )
+            return HOST_MISMATCH
+        print(f"Предупреждение: {message}, сравнение времени неточно", file=sys.stderr)
+
+    findings = compare(baseline, current, args.tolerance, args.memory_tolerance)
+    print(format_report(baseline, current, findings))
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
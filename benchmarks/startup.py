@@ -0,0 +1,66 @@
+"""
+Замер времени запуска: сколько стоит импорт main.py в новом процессе.
+
+    python -m benchmarks.startup --runs 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = (
+    "import sys; sys.path.insert(0, {root!r}); import main; "
+    "print(sorted(m for m in ('openpyxl', 'requests', 'dotenv', 'multiprocessing') if m in sys.modules))"
+)
+
+
+def measure_startup(runs: int = 10, module_probe: str = PROBE) -> Dict[str, object]:
+    """
+    Запускает импорт main в отдельных процессах из пустой временной папки
+    и возвращает медиану и разброс времени, а также признаки побочных эффектов.
+    """
+    timings: List[float] = []
+    heavy_modules: List[str] = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for _ in range(runs):
+            start = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, "-c", module_probe.format(root=str(ROOT))],
+                cwd=workdir,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            timings.append(time.perf_counter() - start)
+            heavy_modules = json.loads(completed.stdout.strip().replace("'", '"'))
+
+        created = sorted(os.listdir(workdir))
+
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+        "heavy_modules_imported": heavy_modules,
+        "files_created": created,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер времени запуска main.py")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+    print(json.dumps(measure_startup(args.runs), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
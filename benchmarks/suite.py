@@ -0,0 +1,316 @@
+"""
+Замер времени и пиковой памяти горячих функций на синтетических данных
+разного размера. Результат - JSON, пригодный для сравнения между запусками.
+
+    python -m benchmarks.suite --sizes 10000 100000 --repeat 5 --output results.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from benchmarks.synthetic import XLSX_MAX_ROWS, write_csv, write_json, write_xlsx
+from src.decorators import profile_registry
+
+DEFAULT_SIZES = (10_000, 100_000)
+SEARCH_TEXT = "перевод"
+STATE = "EXECUTED"
+T = TypeVar("T")
+CATEGORIES = ["Перевод организации", "Перевод с карты на карту", "Перевод со счета на счет", "Открытие вклада"]
+
+
+class BenchmarkData:
+    """
+    Входные данные одного размера: файлы создаются и загружаются при
+    первом обращении и переиспользуются всеми функциями этого размера.
+    """
+
+    def __init__(self, size: int, workdir: Path, seed: int = 0) -> None:
+        self.size = size
+        self.workdir = workdir
+        self.seed = seed
+        self._values: Dict[str, Any] = {}
+
+    def cached(self, name: str, build: Callable[[], T]) -> T:
+        """Возвращает значение name, вычисляя его через build при первом обращении"""
+        if name not in self._values:
+            self._values[name] = build()
+        value: T = self._values[name]
+        return value
+
+    def _file(self, name: str, write: Callable[[Path, int, int], Path]) -> str:
+        return self.cached(name, lambda: str(write(self.workdir / name, self.size, self.seed)))
+
+    @property
+    def json_path(self) -> str:
+        return self._file("operations.json", write_json)
+
+    @property
+    def csv_path(self) -> str:
+        return self._file("transactions.csv", write_csv)
+
+    @property
+    def xlsx_path(self) -> str:
+        return self._file("transactions.xlsx", write_xlsx)
+
+    @property
+    def raw(self) -> List[Dict]:
+        from src.file_loaders import load_json
+
+        return self.cached("raw", lambda: load_json(self.json_path))
+
+    @property
+    def normalized(self) -> List[Dict]:
+        from src.utils import normalize_transaction_data
+
+        return self.cached("normalized", lambda: normalize_transaction_data(self.raw))
+
+
+def _load_json(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.file_loaders import load_json
+
+    return load_json, (data.json_path,)
+
+
+def _load_csv(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.file_loaders import load_csv
+
+    return load_csv, (data.csv_path,)
+
+
+def _load_xlsx(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.file_loaders import load_xlsx
+
+    return load_xlsx, (data.xlsx_path,)
+
+
+def _json_load(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    """Чтение того же файла стандартным json.load - ориентир для чтения из кеша"""
+    def json_load(path: str) -> Any:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    return json_load, (data.json_path,)
+
+
+def _load_cached(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.file_loaders import load_cached
+
+    # Кеш создается при подготовке, замеряется повторное чтение
+    data.cached("dataset_cache", lambda: load_cached(data.json_path))
+    return load_cached, (data.json_path,)
+
+
+def _load_table(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.file_loaders import load_table
+
+    data.cached("table_cache", lambda: load_table(data.json_path))
+    return load_table, (data.json_path,)
+
+
+def _normalize(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.utils import normalize_transaction_data
+
+    return normalize_transaction_data, (data.raw,)
+
+
+def _filter_by_state(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.processing import filter_by_state
+
+    return filter_by_state, (data.normalized, STATE)
+
+
+def _sort_by_date(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.processing import sort_by_date
+
+    return sort_by_date, (data.normalized,)
+
+
+def _filter_by_description(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.regex_operations import filter_by_description
+
+    return filter_by_description, (data.normalized, SEARCH_TEXT)
+
+
+def _count_by_category(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.regex_operations import count_by_category
+
+    return count_by_category, (data.normalized, CATEGORIES)
+
+
+def _parties(data: BenchmarkData, is_card: bool) -> List[str]:
+    """Номера карт или счетов из полей from/to"""
+    numbers = []
+    for operation in data.normalized:
+        for party in (operation.get("from"), operation.get("to")):
+            if party and party.startswith("Счет") != is_card:
+                numbers.append(party.rsplit(" ", 1)[-1])
+    return numbers
+
+
+def _mask_cards(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.masks import mask_cards_bulk
+
+    return mask_cards_bulk, (data.cached("cards", lambda: _parties(data, True)),)
+
+
+def _mask_accounts(data: BenchmarkData) -> Tuple[Callable, tuple]:
+    from src.masks import mask_accounts_bulk
+
+    return mask_accounts_bulk, (data.cached("accounts", lambda: _parties(data, False)),)
+
+
+# Имя замера -> подготовка (функция и ее аргументы); подготовка не входит в замер
+BENCHMARKS: Dict[str, Callable[[BenchmarkData], Tuple[Callable, tuple]]] = {
+    "file_loaders.load_json": _load_json,
+    "file_loaders.load_csv": _load_csv,
+    "file_loaders.load_xlsx": _load_xlsx,
+    "json.load": _json_load,
+    "file_loaders.load_cached": _load_cached,
+    "file_loaders.load_table": _load_table,
+    "utils.normalize_transaction_data": _normalize,
+    "processing.filter_by_state": _filter_by_state,
+    "processing.sort_by_date": _sort_by_date,
+    "regex_operations.filter_by_description": _filter_by_description,
+    "regex_operations.count_by_category": _count_by_category,
+    "masks.mask_cards_bulk": _mask_cards,
+    "masks.mask_accounts_bulk": _mask_accounts,
+}
+
+# Ограничения размера для отдельных замеров
+SIZE_LIMITS = {"file_loaders.load_xlsx": XLSX_MAX_ROWS}
+
+
+def _cpu_model() -> str:
+    """Модель процессора из /proc/cpuinfo (Linux) или platform.processor()"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_info() -> Dict[str, Any]:
+    """
+    Описание машины и интерпретатора, от которых зависят абсолютные замеры.
+    Имя хоста не входит: одинаковые машины CI должны совпадать.
+    """
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": _cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "implementation": platform.python_implementation(),
+        "python": platform.python_version(),
+    }
+
+
+def _time_call(func: Callable, args: tuple) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _peak_memory(func: Callable, args: tuple) -> int:
+    """Пиковый объем памяти, выделенной во время вызова (tracemalloc)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmarks(
+        sizes: Sequence[int] = DEFAULT_SIZES,
+        names: Optional[Sequence[str]] = None,
+        repeat: int = 3,
+        measure_memory: bool = True,
+        seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Запускает замеры для каждого размера и возвращает словарь для JSON:
+    время каждого из repeat вызовов, медиану, пропускную способность
+    (операций в секунду) и пиковую память отдельного вызова под tracemalloc.
+    Декоратор profile на время замеров отключается.
+    """
+    if repeat < 1:
+        raise ValueError("repeat должен быть положительным")
+    names = list(BENCHMARKS) if names is None else list(names)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Неизвестные замеры: {', '.join(unknown)}")
+
+    results: List[Dict[str, Any]] = []
+    profiling = profile_registry.enabled
+    profile_registry.configure(enabled=False, sample_rate=profile_registry.sample_rate)
+    try:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as workdir:
+                data = BenchmarkData(size, Path(workdir), seed)
+                for name in names:
+                    if size > SIZE_LIMITS.get(name, size):
+                        continue
+                    func, args = BENCHMARKS[name](data)
+                    # Прогревочный вызов не учитывается: кеши файловой системы, импорты, кеши функций
+                    func(*args)
+                    timings = [_time_call(func, args) for _ in range(repeat)]
+                    median = statistics.median(timings)
+                    results.append({
+                        "name": name,
+                        "size": size,
+                        "timings": timings,
+                        "median_seconds": median,
+                        "rows_per_second": size / median if median else None,
+                        "peak_bytes": _peak_memory(func, args) if measure_memory else None,
+                    })
+    finally:
+        profile_registry.configure(enabled=profiling, sample_rate=profile_registry.sample_rate)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "host": host_info(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Замеры горячих функций на синтетических данных")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="запустить только эти замеры")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="не замерять пиковую память")
+    parser.add_argument("--output", type=Path, help="файл для результата, по умолчанию stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.only, args.repeat, not args.no_memory, args.seed)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        args.output.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Генератор синтетических операций в форматах файлов из data/:
+JSON (operationAmount с вложенной валютой), CSV (разделитель ';')
+и XLSX (плоские столбцы currency_name/currency_code).
+
+    python -m benchmarks.synthetic --count 1000000 --format csv --output big.csv
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from src.generators import card_number_generator
+
+STATES = ("EXECUTED", "EXECUTED", "EXECUTED", "EXECUTED", "CANCELED", "PENDING")
+DESCRIPTIONS = (
+    "Перевод с карты на карту",
+    "Перевод с карты на карту",
+    "Перевод с карты на карту",
+    "Открытие вклада",
+    "Перевод организации",
+    "Перевод со счета на счет",
+    "Перевод с карты на счет",
+)
+CURRENCIES = (
+    ("RUB", "руб."), ("RUB", "руб."), ("USD", "USD"), ("EUR", "Euro"),
+    ("CNY", "Yuan Renminbi"), ("IDR", "Rupiah"), ("PHP", "Peso"), ("PEN", "Sol"),
+)
+CARD_TYPES = ("Visa Classic", "Visa Platinum", "Visa Gold", "Maestro", "MasterCard", "МИР", "Discover")
+
+# Номера карт и счетов берутся из ограниченного набора, как у реальных клиентов
+CARD_POOL_SIZE = 10_000
+ACCOUNT_POOL_SIZE = 10_000
+FIRST_DATE = datetime(2018, 1, 1)
+DATE_RANGE_SECONDS = 6 * 365 * 24 * 60 * 60
+
+ID_STEP = 97
+
+# В XLSX лист не может содержать больше строк
+XLSX_MAX_ROWS = 1_048_575
+
+FORMATS = ("json", "csv", "xlsx")
+CSV_HEADER = ("id", "state", "date", "amount", "currency_name", "currency_code", "from", "to", "description")
+
+Operation = Tuple[int, str, str, str, Tuple[str, str], str, str, str]
+
+
+def _parties(rng: random.Random) -> Tuple[List[str], List[str]]:
+    """Наборы карт (номера из card_number_generator) и счетов"""
+    start = rng.randrange(10 ** 15, 10 ** 16 - CARD_POOL_SIZE)
+    cards = [
+        f"{rng.choice(CARD_TYPES)} {number.replace(' ', '')}"
+        for number in card_number_generator(start, start + CARD_POOL_SIZE - 1)
+    ]
+    rng.shuffle(cards)
+    accounts = [f"Счет {rng.randrange(10 ** 19, 10 ** 20)}" for _ in range(ACCOUNT_POOL_SIZE)]
+    return cards, accounts
+
+
+def iter_operations(count: int, seed: int = 0) -> Iterator[Operation]:
+    """
+    Выдает count операций в виде кортежей
+    (id, state, date, amount, (code, name), from, to, description).
+    Результат детерминирован для заданного seed.
+    """
+    rng = random.Random(seed)
+    cards, accounts = _parties(rng)
+    parties = cards + accounts
+    random_ = rng.random
+    choice = rng.choice
+
+    for number in range(count):
+        # Идентификаторы уникальны без хранения множества выданных значений
+        operation_id = 100_000 + number * ID_STEP + rng.randrange(ID_STEP)
+        description = choice(DESCRIPTIONS)
+        # Открытие вклада не имеет отправителя
+        source = "" if description == "Открытие вклада" else choice(parties)
+        target = choice(accounts) if description.endswith("счет") or source == "" else choice(parties)
+        date = FIRST_DATE + timedelta(seconds=random_() * DATE_RANGE_SECONDS)
+
+        yield (
+            operation_id,
+            choice(STATES),
+            date.isoformat(),
+            f"{random_() * 100_000:.2f}",
+            choice(CURRENCIES),
+            source,
+            target,
+            description,
+        )
+
+
+def generate_operations(count: int, seed: int = 0, shape: str = "json") -> Iterator[Dict]:
+    """Операции в виде словарей в формате JSON (shape="json") или плоских строк CSV/XLSX"""
+    for operation_id, state, date, amount, (code, name), source, target, description in iter_operations(count, seed):
+        if shape == "json":
+            operation: Dict = {
+                "id": operation_id,
+                "state": state,
+                "date": date,
+                "operationAmount": {"amount": amount, "currency": {"name": name, "code": code}},
+                "description": description,
+            }
+            if source:
+                operation["from"] = source
+            operation["to"] = target
+        else:
+            operation = dict(zip(CSV_HEADER, (
+                operation_id, state, date + "Z", amount, name, code, source, target, description
+            )))
+        yield operation
+
+
+def write_json(path: Path, count: int, seed: int = 0) -> Path:
+    """Записывает массив операций потоково, не собирая его в памяти"""
+    # Постоянные строки экранируются один раз
+    quoted = {value: json.dumps(value, ensure_ascii=False) for value in STATES + DESCRIPTIONS}
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[")
+        for number, (operation_id, state, date, amount, (code, name), source, target, description) in enumerate(
+                iter_operations(count, seed)
+        ):
+            source_field = f'"from": "{source}", ' if source else ""
+            file.write(
+                f'{"," if number else ""}\n  {{"id": {operation_id}, "state": {quoted[state]}, "date": "{date}", '
+                f'"operationAmount": {{"amount": "{amount}", "currency": {{"name": "{name}", "code": "{code}"}}}}, '
+                f'"description": {quoted[description]}, {source_field}"to": "{target}"}}'
+            )
+        file.write("\n]\n")
+    return path
+
+
+def write_csv(path: Path, count: int, seed: int = 0) -> Path:
+    """Записывает операции в CSV с разделителем ';', как data/transactions.csv"""
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        file.write(";".join(CSV_HEADER) + "\n")
+        for operation in iter_operations(count, seed):
+            operation_id, state, date, amount, (code, name), source, target, description = operation
+            file.write(f"{operation_id};{state};{date}Z;{amount};{name};{code};{source};{target};{description}\n")
+    return path
+
+
+def write_xlsx(path: Path, count: int, seed: int = 0) -> Path:
+    """Записывает операции на первый лист книги XLSX, как data/transactions_excel.xlsx"""
+    if count > XLSX_MAX_ROWS:
+        raise ValueError(f"XLSX лист вмещает не больше {XLSX_MAX_ROWS} операций")
+
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(CSV_HEADER)
+    for operation_id, state, date, amount, (code, name), source, target, description in iter_operations(count, seed):
+        sheet.append((operation_id, state, date + "Z", float(amount), name, code, source or None, target, description))
+    workbook.save(path)
+    return path
+
+
+WRITERS = {"json": write_json, "csv": write_csv, "xlsx": write_xlsx}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Генерация синтетических банковских операций")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--format", choices=FORMATS, default="json")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, required=True)
+    args = parser.parse_args()
+    WRITERS[args.format](args.output, args.count, args.seed)
+
+
+if __name__ == "__main__":
+    main()
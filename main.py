@@ -2,8 +2,9 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from src import processing, utils, widget
-from src import file_loaders, regex_operations
+from src import widget
+from src import file_loaders
+from src.query import Query, Source
 
 
 def find_data_file(file_type: str) -> Optional[Path]:
@@ -64,21 +65,16 @@ def load_transactions_from_file(file_type: str) -> List[Dict]:
     file_path = find_data_file(file_type)
 
     try:
-        if file_type == "json":
-            transactions = file_loaders.load_json(str(file_path))
-        elif file_type == "csv":
-            transactions = file_loaders.load_csv(str(file_path))
-        elif file_type == "xlsx":
-            transactions = file_loaders.load_xlsx(str(file_path))
-        else:
+        if file_type not in ("json", "csv", "xlsx"):
             return []
 
-        if not transactions:
+        # Загрузка и нормализация; повторные запуски читают колоночный кеш рядом с файлом
+        normalized_transactions = file_loaders.load_cached(str(file_path))
+
+        if not normalized_transactions:
             print("Файл пуст или не содержит данных")
             return []
 
-        # Нормализуем данные
-        normalized_transactions = utils.normalize_transaction_data(transactions)
         return normalized_transactions
 
     except FileNotFoundError:
@@ -229,9 +225,19 @@ def format_transaction_for_display(transaction: Dict) -> str:
     return "\n".join(lines)
 
 
-def display_transactions(transactions: List[Dict]) -> None:
+PAGE_SIZE = 50
+
+
+def display_transactions(
+        transactions: Source,
+        total: Optional[int] = None,
+        page: int = 1,
+        page_size: Optional[int] = None
+) -> None:
     """
     Отображает транзакции в требуемом формате.
+    transactions - выводимая страница, total - размер всей выборки,
+    page - номер страницы (с 1), заголовок выборки печатается на первой странице.
     """
     if not transactions:
         print("\n" + "=" * 60)
@@ -239,10 +245,18 @@ def display_transactions(transactions: List[Dict]) -> None:
         print("=" * 60)
         return
 
-    print("\n" + "=" * 60)
-    print("Распечатываю итоговый список транзакций...")
-    print("=" * 60)
-    print(f"\nВсего банковских операций в выборке: {len(transactions)}\n")
+    if total is None:
+        total = len(transactions)
+
+    if page == 1:
+        print("\n" + "=" * 60)
+        print("Распечатываю итоговый список транзакций...")
+        print("=" * 60)
+        print(f"\nВсего банковских операций в выборке: {total}\n")
+
+    if page_size and total > page_size:
+        pages = (total + page_size - 1) // page_size
+        print(f"Страница {page} из {pages}\n")
 
     for i, transaction in enumerate(transactions, 1):
         print(format_transaction_for_display(transaction))
@@ -284,10 +298,12 @@ def main() -> None:
     if not transactions:
         return
 
+    # Все выбранные условия собираются в один ленивый запрос; количество для
+    # сообщений берется из count() того же запроса, без промежуточных списков
     status = get_valid_status()
-    filtered_transactions = processing.filter_by_state(transactions, status)
+    query = Query(transactions).where_state(status)
 
-    if not filtered_transactions:
+    if not query.count():
         print("Не найдено операций с выбранным статусом")
 
         unique_states = set()
@@ -301,37 +317,35 @@ def main() -> None:
 
         return
 
-    # Сортировка по дате
+    # Сортировка выполняется в конце и только для выводимой страницы
     if get_yes_no_answer("Отсортировать операции по дате? Да/Нет"):
-        sort_descending = get_sort_order()
-        filtered_transactions = processing.sort_by_date(filtered_transactions, sort_descending)
+        query = query.order_by_date(get_sort_order())
 
     # Фильтрация по рублевым транзакциям
     if get_yes_no_answer("Выводить только рублевые транзакции? Да/Нет"):
-        ruble_transactions = []
-        for transaction in filtered_transactions:
-            operation_amount = transaction.get("operationAmount", {})
-            if isinstance(operation_amount, dict):
-                currency = operation_amount.get("currency", {})
-                if isinstance(currency, dict) and currency.get("code") == "RUB":
-                    ruble_transactions.append(transaction)
-
-        filtered_transactions = ruble_transactions
-        if filtered_transactions:
-            print(f"Оставлено {len(filtered_transactions)} рублевых транзакций\n")
+        query = query.where_currency("RUB")
+        rub_count = query.count()
+        if rub_count:
+            print(f"Оставлено {rub_count} рублевых транзакций\n")
         else:
             print("Рублевых транзакций не найдено\n")
 
-    # Поиск по описанию
+    search_word = ""
     if get_yes_no_answer("Отфильтровать список транзакций по определенному слову в описании? Да/Нет"):
         search_word = input("Введите слово для поиска: ").strip()
-        if search_word:
-            search_results = regex_operations.filter_by_description(filtered_transactions, search_word)
-            print(f"Найдено {len(search_results)} транзакций по слову '{search_word}'\n")
-            filtered_transactions = search_results
+        query = query.search(search_word)
 
-    # Отображение результатов
-    display_transactions(filtered_transactions[:50])  # Ограничиваем вывод
+    # Отображение результатов постранично: запрашивается только срез текущей страницы
+    page = 1
+    while True:
+        rows, total = query.limit(PAGE_SIZE, (page - 1) * PAGE_SIZE).execute()
+        if page == 1 and search_word:
+            print(f"Найдено {total} транзакций по слову '{search_word}'\n")
+        display_transactions(rows, total, page, PAGE_SIZE)
+
+        if page * PAGE_SIZE >= total or not get_yes_no_answer("Показать следующую страницу? Да/Нет"):
+            break
+        page += 1
 
     print("\n" + "=" * 60)
     print("Работа программы завершена успешно!")
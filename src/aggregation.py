@@ -0,0 +1,190 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from src.amounts import to_decimal, transaction_minor_units
+from src.decorators import profile
+from src.transaction_table import MISSING_AMOUNT, MISSING_DATE, TransactionTable, extract_currency, parse_date_key
+
+GROUP_FIELDS = ("state", "currency", "day", "month", "from", "to")
+# Суммы в разных валютах не складываются, поэтому валюта всегда входит в ключ группы
+REQUIRED_FIELD = "currency"
+
+_EPOCH_DATE = date(1970, 1, 1)
+_DAY_MICROSECONDS = 86_400_000_000
+
+
+class GroupStats(NamedTuple):
+    """
+    Итоги группы. operations - число операций в группе, sum/min/max/mean
+    считаются по операциям с известной суммой (как агрегаты SQL
+    пропускают NULL) и равны None, если таких операций нет.
+    """
+    operations: int
+    sum: Optional[Decimal]
+    min: Optional[Decimal]
+    max: Optional[Decimal]
+    mean: Optional[Decimal]
+
+
+def _day_number(date_key: int) -> Optional[int]:
+    """Номер дня от начала эпохи по ключу даты parse_date_key (в UTC)"""
+    return None if date_key == MISSING_DATE else date_key // _DAY_MICROSECONDS
+
+
+def _day_label(day: Optional[int]) -> Optional[str]:
+    return None if day is None else (_EPOCH_DATE + timedelta(days=day)).isoformat()
+
+
+def _month_label(day: Optional[int]) -> Optional[str]:
+    return None if day is None else (_EPOCH_DATE + timedelta(days=day)).isoformat()[:7]
+
+
+def _transaction_day(transaction: Dict) -> Optional[int]:
+    return _day_number(parse_date_key(transaction.get("date")))
+
+
+def _currency_code(transaction: Dict) -> Any:
+    return extract_currency(transaction)[0]
+
+
+_EXTRACTORS: Dict[str, Callable[[Dict], Any]] = {
+    "state": lambda transaction: transaction.get("state"),
+    "currency": _currency_code,
+    "day": lambda transaction: _day_label(_transaction_day(transaction)),
+    "month": lambda transaction: _month_label(_transaction_day(transaction)),
+    "from": lambda transaction: transaction.get("from"),
+    "to": lambda transaction: transaction.get("to"),
+}
+
+
+def _check_fields(by: Union[str, Sequence[str]]) -> Tuple[str, ...]:
+    fields = (by,) if isinstance(by, str) else tuple(by)
+    unknown = [field for field in fields if field not in GROUP_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Неизвестные поля группировки: {', '.join(map(str, unknown))}. Доступны: {', '.join(GROUP_FIELDS)}"
+        )
+    if REQUIRED_FIELD not in fields:
+        raise ValueError(
+            f"Группировка должна включать поле {REQUIRED_FIELD}: суммы в разных валютах не складываются"
+        )
+    return fields
+
+
+# Накопитель группы: [число операций, число сумм, сумма, минимум, максимум] в минимальных единицах
+Accumulator = List[Any]
+
+
+def _new_accumulator() -> Accumulator:
+    return [0, 0, 0, None, None]
+
+
+def _add(accumulator: Accumulator, units: Optional[int]) -> None:
+    accumulator[0] += 1
+    if units is None:
+        return
+    accumulator[1] += 1
+    accumulator[2] += units
+    if accumulator[3] is None or units < accumulator[3]:
+        accumulator[3] = units
+    if accumulator[4] is None or units > accumulator[4]:
+        accumulator[4] = units
+
+
+def _merge(target: Accumulator, source: Accumulator) -> None:
+    target[0] += source[0]
+    target[1] += source[1]
+    target[2] += source[2]
+    for position, better in ((3, min), (4, max)):
+        if source[position] is not None:
+            current = target[position]
+            target[position] = source[position] if current is None else better(current, source[position])
+
+
+def _stats(accumulator: Accumulator) -> GroupStats:
+    operations, known, total, smallest, largest = accumulator
+    if not known:
+        return GroupStats(operations, None, None, None, None)
+    amount = to_decimal(total)
+    return GroupStats(operations, amount, to_decimal(smallest), to_decimal(largest), amount / known)
+
+
+@profile()
+def aggregate(
+        data: Union[Iterable[Dict], TransactionTable], by: Union[str, Sequence[str]] = REQUIRED_FIELD
+) -> Dict[Tuple[Any, ...], GroupStats]:
+    """
+    Считает количество, сумму, минимум, максимум и среднее сумм операций
+    с группировкой по сочетанию полей GROUP_FIELDS: state, currency (код),
+    day и month (ISO дата и месяц в UTC, как у ключа parse_date_key), from, to.
+    Поле currency обязательно, иначе ValueError: суммы в разных валютах не складываются.
+    Ключ результата - кортеж значений полей в порядке by,
+    группы идут в порядке первого появления. Суммы точные (Decimal из amount_minor).
+    Список или поток словарей обрабатывается одним проходом со словарем групп,
+    для TransactionTable группируются целые коды столбцов, а значения
+    декодируются один раз на группу.
+    """
+    fields = _check_fields(by)
+
+    if isinstance(data, TransactionTable):
+        groups = _aggregate_table(data, fields)
+    else:
+        groups = _aggregate_rows(data, fields)
+
+    return {key: _stats(accumulator) for key, accumulator in groups.items()}
+
+
+def _aggregate_rows(data: Iterable[Dict], fields: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Accumulator]:
+    extractors = [_EXTRACTORS[field] for field in fields]
+    groups: Dict[Tuple[Any, ...], Accumulator] = {}
+
+    for transaction in data:
+        if not isinstance(transaction, dict):
+            continue
+        key = tuple(extract(transaction) for extract in extractors)
+        accumulator = groups.get(key)
+        if accumulator is None:
+            accumulator = groups[key] = _new_accumulator()
+        _add(accumulator, transaction_minor_units(transaction))
+
+    return groups
+
+
+def _table_column(table: TransactionTable, field: str) -> Tuple[Sequence[Any], Callable[[Any], Any]]:
+    """Столбец кодов (или значений) таблицы для поля группировки и функция декодирования"""
+    if field == "state":
+        return table.state_codes, table.states.decode
+    if field == "currency":
+        def currency_code(code: int) -> Any:
+            currency = table.currencies.decode(code)
+            return None if currency is None else currency[0]
+        return table.currency_codes, currency_code
+    if field in ("from", "to"):
+        return (table.from_codes if field == "from" else table.to_codes), table.accounts.decode
+    # Группируются номера дней; месяцы получаются при декодировании и слиянии групп
+    return [_day_number(key) for key in table.date_keys], (_day_label if field == "day" else _month_label)
+
+
+def _aggregate_table(table: TransactionTable, fields: Tuple[str, ...]) -> Dict[Tuple[Any, ...], Accumulator]:
+    columns = [_table_column(table, field) for field in fields]
+    coded: Dict[Tuple[Any, ...], Accumulator] = {}
+
+    keys: Iterable[Tuple[Any, ...]] = zip(*(column for column, _ in columns))
+    for key, units in zip(keys, table.amount_units):
+        accumulator = coded.get(key)
+        if accumulator is None:
+            accumulator = coded[key] = _new_accumulator()
+        _add(accumulator, None if units == MISSING_AMOUNT else units)
+
+    # Разные коды могут давать одно значение (одна валюта с разными названиями, дни одного месяца)
+    decoders = [decode for _, decode in columns]
+    groups: Dict[Tuple[Any, ...], Accumulator] = {}
+    for key, accumulator in coded.items():
+        decoded = tuple(decode(code) for decode, code in zip(decoders, key))
+        existing = groups.get(decoded)
+        if existing is None:
+            groups[decoded] = accumulator
+        else:
+            _merge(existing, accumulator)
+    return groups
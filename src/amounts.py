@@ -0,0 +1,97 @@
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Any, Dict, Optional
+
+# Суммы хранятся целым числом сотых долей (копеек, центов) для всех валют.
+# Для валют без дробной части (JPY) сумма тоже хранится в сотых: 100 JPY -> 10000,
+# для валют с тремя знаками (KWD, BHD) третий знак округляется до четного.
+MINOR_DIGITS = 2
+MINOR_UNITS: int = 10 ** MINOR_DIGITS
+AMOUNT_FIELD = "amount_minor"
+
+_MINOR_EXPONENT = Decimal(1)
+
+
+def parse_minor_units(value: Any) -> Optional[int]:
+    """
+    Переводит сумму в целое число минимальных единиц без потерь float.
+    Принимает int, Decimal, float (по кратчайшему представлению, как его
+    записал загрузчик XLSX) и строки: "31957.58", "1 000,50", "1,000.50", "1,000".
+    Доли меньше минимальной единицы округляются до четного. Для пустых
+    и некорректных значений возвращает None.
+    """
+    if type(value) is str:
+        # Быстрый путь для обычной записи "12345.67" без Decimal
+        whole, dot, fraction = value.partition(".")
+        if dot and len(fraction) == MINOR_DIGITS and whole.isdigit() and fraction.isdigit() and value.isascii():
+            return int(whole + fraction)
+    elif value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+
+    text: Optional[str]
+    if isinstance(value, float):
+        text = repr(value)
+    elif isinstance(value, Decimal):
+        text = None
+    elif isinstance(value, str):
+        text = _without_separators(value)
+        if text is None:
+            return None
+    else:
+        return None
+
+    try:
+        amount = value if text is None else Decimal(text)
+    except InvalidOperation:
+        return None
+    if not amount.is_finite():
+        return None
+    return int((amount * MINOR_UNITS).quantize(_MINOR_EXPONENT, rounding=ROUND_HALF_EVEN))
+
+
+def _without_separators(value: str) -> Optional[str]:
+    """
+    Убирает пробелы и разделители тысяч, запятую-десятичный разделитель заменяет точкой.
+    Запятая считается разделителем тысяч, если в числе есть точка или после
+    каждой запятой ровно три цифры ("1,000", "1,000,000"), иначе одна запятая -
+    десятичный разделитель ("1000,5"). Для неоднозначной записи возвращает None.
+    """
+    text = value.strip().replace(" ", "").replace("\u00a0", "")
+    if "," not in text:
+        return text
+    if "." in text:
+        return text.replace(",", "")
+    whole, *groups = text.split(",")
+    if len(groups) == 1 and len(groups[0]) != 3:
+        return f"{whole}.{groups[0]}"
+    if all(len(group) == 3 for group in groups):
+        return whole + "".join(groups)
+    return None
+
+
+def format_minor_units(units: int) -> str:
+    """Строка суммы с двумя знаками после точки: 3195758 -> "31957.58" """
+    sign = "-" if units < 0 else ""
+    whole, fraction = divmod(abs(units), MINOR_UNITS)
+    return f"{sign}{whole}.{fraction:0{MINOR_DIGITS}d}"
+
+
+def to_decimal(units: int) -> Decimal:
+    """Точная сумма Decimal из минимальных единиц"""
+    return Decimal(units).scaleb(-MINOR_DIGITS)
+
+
+def transaction_minor_units(transaction: Dict) -> Optional[int]:
+    """
+    Сумма транзакции в минимальных единицах: из поля amount_minor,
+    заполненного при нормализации, иначе сумма разбирается из
+    operationAmount или плоского поля amount.
+    """
+    units = transaction.get(AMOUNT_FIELD)
+    if isinstance(units, int):
+        return units
+    op_amount = transaction.get("operationAmount")
+    if isinstance(op_amount, dict):
+        return parse_minor_units(op_amount.get("amount"))
+    return parse_minor_units(transaction.get("amount"))
@@ -0,0 +1,286 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from itertools import compress
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.transaction_table import StringDictionary, TransactionTable
+
+# Формат файла: MAGIC, длина заголовка (uint32), JSON заголовок, затем данные столбцов подряд
+MAGIC = b"BANKCOL2"
+TABLE_MAGIC = b"BANKTBL1"
+_HEADER_LENGTH = struct.Struct("<I")
+
+CODE_TYPE = "i"
+# Словарем кодируются только столбцы, где различных значений не больше этой доли заполненных строк
+DICTIONARY_MAX_SHARE = 0.25
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+# Столбцы фиксированной ширины хранятся массивом значений без словаря
+_FIXED_KINDS = {"int": "q", "float": "d"}
+
+# Массивы и словари TransactionTable, которые сохраняет write_table
+_TABLE_ARRAYS = (
+    "ids", "state_codes", "date_keys", "amount_units", "currency_codes", "description_codes", "from_codes", "to_codes",
+)
+_TABLE_DICTIONARIES = ("states", "currencies", "descriptions", "accounts")
+
+FieldPath = Tuple[str, ...]
+
+
+# Столбец одного поля (или вложенного поля вида operationAmount.currency.code):
+# маска заполненных строк и значения в заполненных строках
+Column = Tuple[bytearray, List[Any]]
+
+
+def _flatten(record: Dict, prefix: FieldPath, out: List[Tuple[FieldPath, Any]]) -> None:
+    for key, value in record.items():
+        if type(key) is not str:
+            raise TypeError(f"Ключ {key!r} не является строкой")
+        if type(value) is dict and value:
+            _flatten(value, prefix + (key,), out)
+        else:
+            out.append((prefix + (key,), value))
+
+
+def _encode_column(values: List[Any]) -> Tuple[str, Optional[List[Any]], bytes]:
+    """
+    Выбирает представление столбца: целые и float - массивом array,
+    скаляры с малым числом различных значений - словарем и массивом кодов,
+    остальное (уникальные строки, списки, пустые словари) - списком JSON.
+    """
+    types = set(map(type, values))
+    if types == {int} and _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+        return "int", None, array(_FIXED_KINDS["int"], values).tobytes()
+    if types == {float}:
+        return "float", None, array(_FIXED_KINDS["float"], values).tobytes()
+
+    if types <= _SCALAR_TYPES:
+        # Тип входит в ключ, чтобы 1, 1.0 и True не совпали
+        keys: Iterable[Any] = values if len(types) == 1 else zip(map(type, values), values)
+        index: Dict[Any, int] = {}
+        codes = array(CODE_TYPE, [index.setdefault(key, len(index)) for key in keys])
+        if len(index) <= len(values) * DICTIONARY_MAX_SHARE:
+            distinct = list(index) if len(types) == 1 else [value for _, value in index]
+            return "codes", distinct, codes.tobytes()
+
+    return "json", None, json.dumps(values, ensure_ascii=False).encode("utf-8")
+
+
+def _write_atomic(cache_path: Path, magic: bytes, header: Dict[str, Any], segments: Iterable[bytes]) -> None:
+    """Записывает файл во временный и атомарно заменяет старый"""
+    header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(magic)
+            file.write(_HEADER_LENGTH.pack(len(header_bytes)))
+            file.write(header_bytes)
+            for segment in segments:
+                file.write(segment)
+        os.replace(temp_path, cache_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+
+def _read_header(
+        cache_path: Path, magic: bytes, fingerprint: Dict[str, Any]
+) -> Optional[Tuple[Dict[str, Any], memoryview, int]]:
+    """Заголовок, содержимое файла и позиция начала данных или None для чужого или устаревшего файла"""
+    try:
+        with open(cache_path, "rb") as file:
+            content = file.read()
+    except OSError:
+        return None
+
+    if content[:len(magic)] != magic:
+        return None
+    position = len(magic)
+    (header_length,) = _HEADER_LENGTH.unpack_from(content, position)
+    position += _HEADER_LENGTH.size
+    header = json.loads(content[position:position + header_length].decode("utf-8"))
+    if header["fingerprint"] != fingerprint:
+        return None
+    return header, memoryview(content), position + header_length
+
+
+def _array_from(typecode: str, data: memoryview, byteorder: str) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if byteorder != sys.byteorder:
+        values.byteswap()
+    return values
+
+
+def write_dataset(cache_path: Path, rows: List[Dict], fingerprint: Dict[str, Any]) -> None:
+    """
+    Сохраняет список записей в колоночном виде.
+    Каждое поле (включая вложенные) хранится отдельным столбцом: целые и float -
+    байтами массива array, скаляры с малым числом различных значений - словарем
+    и массивом кодов, остальные - списком JSON. Для полей, которые есть не во
+    всех записях, хранится маска заполненных строк. Значения, не представимые
+    в JSON, вызывают TypeError.
+    """
+    columns: Dict[FieldPath, Column] = {}
+    fields: List[Tuple[FieldPath, Any]] = []
+
+    for number, record in enumerate(rows):
+        if not isinstance(record, dict):
+            raise TypeError(f"Запись {number} не является словарем")
+        fields.clear()
+        _flatten(record, (), fields)
+        for path, value in fields:
+            column = columns.get(path)
+            if column is None:
+                column = columns[path] = (bytearray(number), [])
+            column[0].append(1)
+            column[1].append(value)
+        if len(fields) < len(columns):
+            for present, _ in columns.values():
+                if len(present) == number:
+                    present.append(0)
+
+    descriptions: List[Dict[str, Any]] = []
+    segments: List[bytes] = []
+    for path, (present, values) in columns.items():
+        kind, distinct, data = _encode_column(values)
+        sparse = len(values) < len(rows)
+        description: Dict[str, Any] = {"path": list(path), "kind": kind, "sparse": sparse, "size": len(data)}
+        if distinct is not None:
+            description["values"] = distinct
+        descriptions.append(description)
+        if sparse:
+            segments.append(bytes(present))
+        segments.append(data)
+
+    header = {"fingerprint": fingerprint, "rows": len(rows), "byteorder": sys.byteorder, "columns": descriptions}
+    _write_atomic(cache_path, MAGIC, header, segments)
+
+
+def read_dataset(cache_path: Path, fingerprint: Dict[str, Any]) -> Optional[List[Dict]]:
+    """
+    Читает записи, сохраненные write_dataset.
+    Возвращает None, если файла нет, он поврежден или сохранен для другого
+    отпечатка исходного файла. Вложенные словари и списки создаются заново
+    для каждой записи, поэтому записи можно изменять независимо.
+    """
+    try:
+        found = _read_header(cache_path, MAGIC, fingerprint)
+        if found is None:
+            return None
+        header, view, position = found
+
+        count = header["rows"]
+        expected = position + sum(column["size"] + count * column["sparse"] for column in header["columns"])
+        if len(view) != expected:
+            return None
+
+        rows: List[Dict] = [{} for _ in range(count)]
+        for column in header["columns"]:
+            present = None
+            if column["sparse"]:
+                present = view[position:position + count]
+                position += count
+            data = view[position:position + column["size"]]
+            position += column["size"]
+            kind = column["kind"]
+            values: Iterable[Any]
+            if kind in _FIXED_KINDS:
+                values = _array_from(_FIXED_KINDS[kind], data, header["byteorder"])
+            elif kind == "codes":
+                values = map(column["values"].__getitem__, _array_from(CODE_TYPE, data, header["byteorder"]))
+            elif kind == "json":
+                values = json.loads(bytes(data))
+            else:
+                return None
+            _fill_column(rows if present is None else compress(rows, present), column["path"], values)
+        return rows
+
+    except (AttributeError, KeyError, TypeError, ValueError, IndexError, struct.error):
+        return None
+
+
+def _fill_column(records: Iterable[Dict], path: List[str], values: Iterable[Any]) -> None:
+    *parents, key = path
+    if not parents:
+        for record, value in zip(records, values):
+            record[key] = value
+        return
+
+    for record, value in zip(records, values):
+        target = record
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value
+
+
+def write_table(cache_path: Path, table: TransactionTable, fingerprint: Dict[str, Any]) -> None:
+    """
+    Сохраняет TransactionTable как есть: массивы столбцов записываются байтами
+    array, а даты, словари значений и дополнительные поля - в JSON заголовок.
+    Значения, не представимые в JSON, и нестроковые ключи вызывают TypeError.
+    """
+    for extra in table.extras:
+        if extra and not all(isinstance(key, str) for key in extra):
+            raise TypeError("Ключи дополнительных полей должны быть строками")
+
+    arrays = [getattr(table, name) for name in _TABLE_ARRAYS]
+    header = {
+        "fingerprint": fingerprint,
+        "rows": len(table),
+        "byteorder": sys.byteorder,
+        "arrays": {name: column.typecode for name, column in zip(_TABLE_ARRAYS, arrays)},
+        "dictionaries": {name: getattr(table, name).values for name in _TABLE_DICTIONARIES},
+        "dates": table.dates,
+        "extras": table.extras,
+    }
+    _write_atomic(cache_path, TABLE_MAGIC, header, (column.tobytes() for column in arrays))
+
+
+def read_table(cache_path: Path, fingerprint: Dict[str, Any]) -> Optional[TransactionTable]:
+    """
+    Читает таблицу, сохраненную write_table, без создания словарей записей:
+    массивы восстанавливаются через frombytes, словари значений - из заголовка.
+    Возвращает None, если файла нет, он поврежден или устарел.
+    """
+    try:
+        found = _read_header(cache_path, TABLE_MAGIC, fingerprint)
+        if found is None:
+            return None
+        header, view, position = found
+
+        count = header["rows"]
+        table = TransactionTable()
+        for name in _TABLE_ARRAYS:
+            column = getattr(table, name)
+            if header["arrays"][name] != column.typecode:
+                return None
+            size = count * column.itemsize
+            column.frombytes(view[position:position + size])
+            position += size
+            if header["byteorder"] != sys.byteorder:
+                column.byteswap()
+        if position != len(view) or len(header["dates"]) != count or len(header["extras"]) != count:
+            return None
+
+        for name in _TABLE_DICTIONARIES:
+            values = header["dictionaries"][name]
+            if name == "currencies":
+                # Валюта хранится парой (код, название), JSON возвращает ее списком
+                values = [tuple(value) for value in values]
+            dictionary = StringDictionary.from_values(values)
+            if len(dictionary) != len(values):
+                return None
+            setattr(table, name, dictionary)
+        table.dates = header["dates"]
+        table.extras = header["extras"]
+        return table
+
+    except (AttributeError, KeyError, TypeError, ValueError, IndexError, struct.error):
+        return None
@@ -1,28 +1,120 @@
+import atexit
 import logging
+import math
 import os
+import queue
+import random
+import reprlib
+import threading
+import time
 from datetime import datetime
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable, Dict, Optional, ParamSpec, TypeVar
 
+from src.logging_config import LOG_DIR, LazyFileHandler
 
-def setup_logger(filename=None):
-    logger = logging.getLogger("my_logger")
-    logger.setLevel(logging.DEBUG)
-    formatter = logging.Formatter("%(asctime)s - %(message)s")
+MAX_REPR_LENGTH = 200
 
-    if filename is not None:
-        log_file = os.path.join("logs", filename)
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    else:
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_short_repr = reprlib.Repr()
+_short_repr.maxlist = 10
+_short_repr.maxtuple = 10
+_short_repr.maxdict = 10
+_short_repr.maxset = 10
+_short_repr.maxstring = MAX_REPR_LENGTH
+_short_repr.maxother = MAX_REPR_LENGTH
+
+
+def short_repr(value: Any) -> str:
+    """
+    Ограниченное представление значения для логов.
+    reprlib обходит только первые элементы коллекций, поэтому стоимость
+    не зависит от размера переданного списка транзакций.
+    """
+    text = _short_repr.repr(value)
+    if len(text) > MAX_REPR_LENGTH:
+        text = text[:MAX_REPR_LENGTH - 3] + "..."
+    return text
+
+
+class _RoutingHandler(logging.Handler):
+    """Передает запись из очереди обработчику того файла (или консоли), для которого она создана"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.targets: Dict[str, logging.Handler] = {}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        handler = self.targets.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+        return True
+
+    def close(self) -> None:
+        for handler in self.targets.values():
+            handler.close()
+        super().close()
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_router = _RoutingHandler()
+_listener: Optional[QueueListener] = None
+
+
+def _ensure_listener() -> None:
+    """Запускает фоновый поток записи логов при первом использовании"""
+    global _listener
+    if _listener is None:
+        _listener = QueueListener(_log_queue, _router)
+        _listener.start()
+        atexit.register(_stop_listener)
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def flush_logs() -> None:
+    """Дожидается записи всех накопленных в очереди сообщений"""
+    if _listener is not None:
+        _log_queue.join()
+
+
+def setup_logger(filename: Optional[str] = None) -> logging.Logger:
+    """
+    Возвращает логгер для файла logs/<filename> или для консоли.
+    Обработчик для каждого назначения создается один раз, сами записи
+    уходят в очередь и пишутся фоновым потоком.
+    """
+    name = "my_logger" if filename is None else f"my_logger.{filename}"
+    logger = logging.getLogger(name)
+
+    if name not in _router.targets:
+        formatter = logging.Formatter("%(asctime)s - %(message)s")
+
+        if filename is not None:
+            # Папка и файл создаются при первой записи, а не при декорировании
+            target: logging.Handler = LazyFileHandler(os.path.join(LOG_DIR, filename))
+        else:
+            target = logging.StreamHandler()
+        target.setFormatter(formatter)
+        _router.targets[name] = target
+
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(QueueHandler(_log_queue))
+        logger.propagate = False
+        _ensure_listener()
 
     return logger
 
 
-def log(filename=None):
+def log(filename: Optional[str] = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Декоратор для логирования вызовов функции.
     Этот декоратор записывает информацию о вызовах обернутой функции, включая
@@ -32,21 +124,179 @@ def log(filename=None):
     """
     logger = setup_logger(filename)
 
-    def decorator(func):
-        def wrapper(*args, **kwargs):
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
             function_name = func.__name__
-            start_time = datetime.now()
-            logger.info(f"{function_name} called at {start_time.isoformat()} with args: {args} and kwargs: {kwargs}")
+            enabled = logger.isEnabledFor(logging.INFO)
+            if enabled:
+                start_time = datetime.now()
+                logger.info(
+                    "%s called at %s with args: %s and kwargs: %s",
+                    function_name, start_time.isoformat(), short_repr(args), short_repr(kwargs),
+                )
 
             try:
                 result = func(*args, **kwargs)
-                logger.info(f"{function_name} result: {result}")
+                if enabled:
+                    logger.info("%s result: %s", function_name, short_repr(result))
                 return result
             except Exception as e:
-                error_message = f"{function_name} error: {type(e).__name__}. Inputs: {args}, {kwargs}"
-                logger.error(error_message)
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error(
+                        "%s error: %s. Inputs: %s, %s",
+                        function_name, type(e).__name__, short_repr(args), short_repr(kwargs),
+                    )
                 raise
 
         return wrapper
 
     return decorator
+
+
+# Гистограмма с экспоненциальными корзинами: 8 корзин на каждое удвоение (~9% точности)
+HISTOGRAM_BUCKETS_PER_OCTAVE = 8
+
+
+class FunctionProfile:
+    """Статистика вызовов одной функции: счетчики, суммарное время и гистограмма задержек"""
+
+    __slots__ = ("calls", "sampled", "wall_total", "cpu_total", "wall_max", "histogram")
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.calls = 0
+        self.sampled = 0
+        self.wall_total = 0.0
+        self.cpu_total = 0.0
+        self.wall_max = 0.0
+        self.histogram: Dict[int, int] = {}
+
+    def record(self, wall: float, cpu: float) -> None:
+        self.sampled += 1
+        self.wall_total += wall
+        self.cpu_total += cpu
+        if wall > self.wall_max:
+            self.wall_max = wall
+        bucket = int(math.log2(max(wall * 1e9, 1.0)) * HISTOGRAM_BUCKETS_PER_OCTAVE)
+        self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def percentile(self, fraction: float) -> float:
+        """Приблизительный перцентиль времени вызова в секундах по гистограмме"""
+        if not self.sampled:
+            return 0.0
+        threshold = fraction * self.sampled
+        seen = 0
+        for bucket in sorted(self.histogram):
+            seen += self.histogram[bucket]
+            if seen >= threshold:
+                return min(2 ** ((bucket + 0.5) / HISTOGRAM_BUCKETS_PER_OCTAVE) / 1e9, self.wall_max)
+        return self.wall_max
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "sampled": self.sampled,
+            "wall_total": self.wall_total,
+            "cpu_total": self.cpu_total,
+            "wall_mean": self.wall_total / self.sampled if self.sampled else 0.0,
+            "wall_max": self.wall_max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+        }
+
+
+class ProfileRegistry:
+    """Реестр статистики всех функций, обернутых декоратором profile"""
+
+    def __init__(self) -> None:
+        # Профилирование добавляет накладные расходы к каждому вызову, поэтому включается явно
+        self.enabled = os.getenv("BANK_PROFILE", "0") != "0"
+        self.sample_rate = 1.0
+        self._profiles: Dict[str, FunctionProfile] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool = True, sample_rate: float = 1.0) -> None:
+        """Включает или выключает профилирование и задает долю замеряемых вызовов"""
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("sample_rate должен быть от 0 до 1")
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    def profile_for(self, name: str) -> FunctionProfile:
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = FunctionProfile()
+            return profile
+
+    def count_call(self, name: str) -> FunctionProfile:
+        """Профиль функции с учтенным вызовом; счетчик увеличивается под блокировкой"""
+        with self._lock:
+            profile = self._profiles.get(name)
+            if profile is None:
+                profile = self._profiles[name] = FunctionProfile()
+            profile.calls += 1
+            return profile
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Копия текущей статистики, отсортированная по суммарному времени"""
+        with self._lock:
+            items = [(name, profile.as_dict()) for name, profile in self._profiles.items() if profile.calls]
+        items.sort(key=lambda item: item[1]["wall_total"], reverse=True)
+        return dict(items)
+
+    def reset(self) -> None:
+        """
+        Обнуляет статистику, сохраняя регистрацию функций.
+        Профили очищаются на месте: выполняющиеся вызовы держат ссылку
+        на профиль и записывают замер в него же.
+        """
+        with self._lock:
+            for profile in self._profiles.values():
+                profile.clear()
+
+
+profile_registry = ProfileRegistry()
+
+
+def profile(sample_rate: Optional[float] = None) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """
+    Декоратор для профилирования вызовов функции.
+    Считает вызовы и для выбранной доли вызовов (sample_rate, по умолчанию
+    доля из реестра) замеряет реальное и процессорное время потока. Статистика
+    доступна через profile_registry.snapshot(). Профилирование выключено,
+    пока не задана переменная окружения BANK_PROFILE=1 или не вызван
+    profile_registry.configure(enabled=True).
+    """
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        name = f"{func.__module__}.{func.__qualname__}"
+        registry = profile_registry
+
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not registry.enabled:
+                return func(*args, **kwargs)
+
+            stats = registry.count_call(name)
+            rate = registry.sample_rate if sample_rate is None else sample_rate
+            if rate < 1.0 and random.random() >= rate:
+                return func(*args, **kwargs)
+
+            wall_start = time.perf_counter()
+            cpu_start = time.thread_time()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                wall = time.perf_counter() - wall_start
+                cpu = time.thread_time() - cpu_start
+                with registry._lock:
+                    stats.record(wall, cpu)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,81 @@
+import re
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Union
+
+from src.transaction_table import MISSING_CODE, TransactionTable
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+class DescriptionIndex:
+    """
+    Инвертированный индекс по описаниям операций.
+    Строится один раз по набору данных: описания приводятся к нижнему
+    регистру и разбиваются на слова, для каждого слова хранится
+    упорядоченный список номеров строк. Поиск по слову и префиксу
+    не просматривает сами операции.
+    """
+
+    def __init__(self, data: Union[List[Dict], TransactionTable]) -> None:
+        self.size = len(data)
+        self._postings: Dict[str, array] = {}
+        self._description_rows: Dict[str, array] = {}
+
+        for row, description in enumerate(_descriptions(data)):
+            text = description.lower()
+            rows = self._description_rows.get(text)
+            if rows is None:
+                rows = self._description_rows[text] = array("q")
+            rows.append(row)
+
+            for word in set(WORD_PATTERN.findall(text)):
+                postings = self._postings.get(word)
+                if postings is None:
+                    postings = self._postings[word] = array("q")
+                postings.append(row)
+
+        self._vocabulary = sorted(self._postings)
+
+    def search_word(self, word: str) -> List[int]:
+        """Номера строк, в описании которых есть слово целиком"""
+        return list(self._postings.get(word.lower(), ()))
+
+    def search_prefix(self, prefix: str) -> List[int]:
+        """Номера строк, в описании которых есть слово с заданным началом"""
+        prefix = prefix.lower()
+        vocabulary = self._vocabulary
+        words = []
+        position = bisect_left(vocabulary, prefix)
+        while position < len(vocabulary) and vocabulary[position].startswith(prefix):
+            words.append(vocabulary[position])
+            position += 1
+        return _union(self._postings[word] for word in words)
+
+    def search(self, text: str) -> List[int]:
+        """
+        Номера строк, описание которых содержит подстроку без учета регистра,
+        как в filter_by_description. Подстрока только из букв и цифр
+        целиком лежит внутри одного слова, поэтому ищется по словарю слов;
+        иначе проверяется каждое различное описание.
+        """
+        text = text.lower()
+        if not text:
+            return []
+        if WORD_PATTERN.fullmatch(text):
+            return _union(rows for word, rows in self._postings.items() if text in word)
+        return _union(rows for description, rows in self._description_rows.items() if text in description)
+
+
+def _descriptions(data: Union[List[Dict], TransactionTable]) -> Iterable[str]:
+    if isinstance(data, TransactionTable):
+        values = data.descriptions.values
+        return (values[code] if code != MISSING_CODE else "" for code in data.description_codes)
+    return (operation.get("description") or "" for operation in data)
+
+
+def _union(postings: Iterable[array]) -> List[int]:
+    rows: set = set()
+    for posting in postings:
+        rows.update(posting)
+    return sorted(rows)
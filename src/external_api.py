@@ -1,9 +1,43 @@
+import asyncio
+import contextlib
+import json
 import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-import requests
-from dotenv import load_dotenv
+from src.amounts import MINOR_UNITS, transaction_minor_units
+from src.rate_store import RateStore
 
-load_dotenv()
+if TYPE_CHECKING:
+    import requests
+
+CONVERT_URL = "https://api.apilayer.com/exchangerates_data/convert"
+REQUEST_TIMEOUT = 10
+RATE_CACHE_TTL = 60 * 60
+# Кеш лежит в корне проекта, а не в текущем каталоге запуска
+RATE_CACHE_PATH = Path(__file__).resolve().parent.parent / ".cache" / "rates.json"
+# Ключ текущего курса в кеше; не совпадает ни с одной датой, в том числе пустой
+LIVE_RATE_KEY = "live"
+ASYNC_CONCURRENCY = 8
+ASYNC_RETRIES = 3
+ASYNC_BACKOFF = 0.5
+
+_session: Optional["requests.Session"] = None
+_thread_sessions = threading.local()
+_env_loaded = False
+
+
+def _load_env() -> None:
+    """Читает .env один раз, при первом обращении к API, а не при импорте модуля"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
 
 
 def convert_to_rub(transaction: dict) -> float:
@@ -14,6 +48,9 @@ def convert_to_rub(transaction: dict) -> float:
     if currency == "RUB":
         return float(amount)
 
+    import requests
+
+    _load_env()
     url = f"https://api.apilayer.com/exchangerates_data/convert?to=RUB&from={currency}&amount={amount}"
     headers = {"apikey": os.getenv("API_KEY")}
 
@@ -23,3 +60,368 @@ def convert_to_rub(transaction: dict) -> float:
         return float(response.json()["result"])
     else:
         return float(amount)
+
+
+def _new_session() -> "requests.Session":
+    import requests
+
+    _load_env()
+    session = requests.Session()
+    session.headers["apikey"] = os.getenv("API_KEY") or ""
+    return session
+
+
+def get_session() -> "requests.Session":
+    """Общая сессия с пулом соединений для запросов курсов"""
+    global _session
+    if _session is None:
+        _session = _new_session()
+    return _session
+
+
+def _thread_session() -> "requests.Session":
+    """Сессия текущего потока: requests.Session не рассчитан на общий доступ из нескольких потоков"""
+    session: Optional["requests.Session"] = getattr(_thread_sessions, "session", None)
+    if session is None:
+        session = _thread_sessions.session = _new_session()
+    return session
+
+
+def _get_rate_response(params: Dict[str, Union[str, int]]) -> "requests.Response":
+    return _thread_session().get(CONVERT_URL, params=params, timeout=REQUEST_TIMEOUT)
+
+
+def fetch_rate(currency: str, date: Optional[str] = None) -> Optional[float]:
+    """Запрашивает курс валюты к рублю (на дату, если она задана); None при ошибке"""
+    import requests
+
+    params: Dict[str, Union[str, int]] = {"to": "RUB", "from": currency, "amount": 1}
+    if date:
+        params["date"] = date
+
+    try:
+        response = get_session().get(CONVERT_URL, params=params, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException:
+        return None
+
+    if response.status_code == 200:
+        return float(response.json()["result"])
+    return None
+
+
+class RateCache:
+    """
+    Кеш курсов валют с ограниченным временем жизни.
+    Хранится в памяти и, если задан путь, в JSON файле на диске,
+    чтобы курсы переживали перезапуск программы. Курсы на конкретную
+    дату не меняются, поэтому ttl действует только на текущий курс
+    (без даты) и курс для операции с пустой датой.
+    """
+
+    def __init__(self, ttl: float = RATE_CACHE_TTL, path: Optional[Path] = None) -> None:
+        self.ttl = ttl
+        self.path = path
+        self._rates: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            for key, (rate, fetched_at) in stored.items():
+                currency, _, date = key.partition("|")
+                self._rates[(currency, date)] = (float(rate), float(fetched_at))
+        except (OSError, ValueError, TypeError):
+            # Поврежденный файл кеша просто игнорируется
+            self._rates = {}
+
+    @staticmethod
+    def _expires(date_key: str) -> bool:
+        return date_key in (LIVE_RATE_KEY, "")
+
+    def save(self) -> None:
+        """Сохраняет актуальные курсы на диск"""
+        if self.path is None:
+            return
+        now = time.time()
+        stored = {
+            f"{currency}|{date}": [rate, fetched_at]
+            for (currency, date), (rate, fetched_at) in self._rates.items()
+            if not self._expires(date) or now - fetched_at < self.ttl
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(stored, file)
+
+    def get(self, currency: str, date: Optional[str] = None) -> Optional[float]:
+        key = (currency, LIVE_RATE_KEY if date is None else date)
+        entry = self._rates.get(key)
+        if entry is None:
+            return None
+        rate, fetched_at = entry
+        if self._expires(key[1]) and time.time() - fetched_at >= self.ttl:
+            del self._rates[key]
+            return None
+        return rate
+
+    def put(self, currency: str, rate: float, date: Optional[str] = None) -> None:
+        self._rates[(currency, LIVE_RATE_KEY if date is None else date)] = (rate, time.time())
+
+    def clear(self) -> None:
+        self._rates.clear()
+
+
+_default_cache: Optional[RateCache] = None
+
+
+def get_default_cache() -> RateCache:
+    """Кеш курсов по умолчанию с файлом RATE_CACHE_PATH"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RateCache(path=RATE_CACHE_PATH)
+    return _default_cache
+
+
+def _amount_and_currency(transaction: Dict) -> Tuple[int, str]:
+    """
+    Сумма в минимальных единицах и код валюты из плоской транзакции или из operationAmount.
+    Сумма берется из amount_minor, заполненного при нормализации, строка не разбирается заново.
+    """
+    units = transaction_minor_units(transaction)
+    op_amount = transaction.get("operationAmount")
+    if isinstance(op_amount, dict):
+        currency = op_amount.get("currency", {})
+        code = currency.get("code", "RUB") if isinstance(currency, dict) else str(currency)
+        amount = op_amount.get("amount")
+    else:
+        code = transaction["currency"]
+        amount = transaction.get("amount")
+    if units is None:
+        raise ValueError(f"Некорректная сумма операции: {amount!r}")
+    return units, code
+
+
+def _to_rub(units: int, rate: Optional[float]) -> float:
+    """Сумма в рублях из минимальных единиц; без курса сумма возвращается без конвертации"""
+    return units * rate / MINOR_UNITS if rate is not None else units / MINOR_UNITS
+
+
+def convert_many_to_rub(
+        transactions: Iterable[Dict],
+        fetcher: Callable[[str, Optional[str]], Optional[float]] = fetch_rate,
+        cache: Optional[RateCache] = None,
+        by_date: bool = False
+) -> List[float]:
+    """
+    Конвертирует суммы списка транзакций в рубли.
+    Курс каждой различной валюты (или пары валюта-дата при by_date=True)
+    запрашивается один раз и кешируется, затем применяется ко всем суммам.
+    Если курс получить не удалось, сумма возвращается без конвертации,
+    как в convert_to_rub.
+    """
+    if cache is None:
+        cache = get_default_cache()
+
+    items = []
+    needed = set()
+    for transaction in transactions:
+        units, currency = _amount_and_currency(transaction)
+        date = str(transaction.get("date") or "")[:10] if by_date else None
+        items.append((units, currency, date))
+        if currency != "RUB":
+            needed.add((currency, date))
+
+    rates: Dict[Tuple[str, Optional[str]], Optional[float]] = {}
+    fetched = False
+    for currency, date in needed:
+        rate = cache.get(currency, date)
+        if rate is None:
+            rate = fetcher(currency, date)
+            if rate is not None:
+                cache.put(currency, rate, date)
+                fetched = True
+        rates[(currency, date)] = rate
+
+    if fetched:
+        cache.save()
+
+    return [_to_rub(units, None if currency == "RUB" else rates[(currency, date)]) for units, currency, date in items]
+
+
+def convert_many_historical(transactions: Iterable[Dict], store: RateStore, strict: bool = False) -> List[float]:
+    """
+    Конвертирует суммы транзакций в рубли по курсу на дату каждой операции
+    из локального хранилища RateStore, без обращений к сети.
+    Если курса на дату нет или дата операции некорректна, сумма остается
+    без конвертации, а при strict=True выбрасывается ValueError.
+    """
+    result = []
+    for transaction in transactions:
+        units, currency = _amount_and_currency(transaction)
+        if currency == "RUB":
+            result.append(_to_rub(units, None))
+            continue
+
+        day = transaction.get("date")
+        try:
+            rate = store.rate_on(currency, day) if day else None
+        except ValueError:
+            if strict:
+                raise ValueError(f"Некорректная дата операции: {day!r}")
+            rate = None
+        if rate is None:
+            if strict:
+                raise ValueError(f"Нет курса {currency} на дату {day}")
+        result.append(_to_rub(units, rate))
+    return result
+
+
+class RetryableRateError(Exception):
+    """Временная ошибка получения курса (429, 5xx, сетевой сбой), запрос стоит повторить"""
+
+
+async def afetch_rate(currency: str, date: Optional[str] = None) -> Optional[float]:
+    """
+    Асинхронно запрашивает курс валюты к рублю.
+    Блокирующий запрос выполняется в пуле потоков, у каждого потока своя сессия.
+    Поток нельзя прервать, поэтому отмена дожидается завершения запроса
+    (не дольше REQUEST_TIMEOUT): слот AsyncRateConverter освобождается,
+    только когда запрос действительно закончился.
+    """
+    import requests
+
+    params: Dict[str, Union[str, int]] = {"to": "RUB", "from": currency, "amount": 1}
+    if date:
+        params["date"] = date
+
+    request = asyncio.get_running_loop().run_in_executor(None, partial(_get_rate_response, params))
+    try:
+        response = await asyncio.shield(request)
+    except asyncio.CancelledError:
+        with contextlib.suppress(Exception):
+            await request
+        raise
+    except requests.RequestException as error:
+        raise RetryableRateError(str(error)) from error
+
+    if response.status_code == 200:
+        return float(response.json()["result"])
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableRateError(f"HTTP {response.status_code}")
+    return None
+
+
+class AsyncRateConverter:
+    """
+    Асинхронное получение курсов с ограничением числа одновременных запросов,
+    таймаутом на запрос и повтором с экспоненциальной задержкой при временных ошибках.
+    Одновременные запросы одного и того же курса объединяются в один.
+    Запрос, прерванный по таймауту, занимает слот до своего фактического
+    завершения (см. afetch_rate), поэтому повторы не превышают concurrency.
+    """
+
+    def __init__(
+            self,
+            concurrency: int = ASYNC_CONCURRENCY,
+            timeout: float = REQUEST_TIMEOUT,
+            retries: int = ASYNC_RETRIES,
+            backoff: float = ASYNC_BACKOFF,
+            fetcher: Callable[[str, Optional[str]], Awaitable[Optional[float]]] = afetch_rate,
+            cache: Optional[RateCache] = None
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency должен быть положительным")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.fetcher = fetcher
+        self.cache = cache if cache is not None else get_default_cache()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[Tuple[str, Optional[str]], "asyncio.Future[Optional[float]]"] = {}
+
+    async def rate(self, currency: str, date: Optional[str] = None) -> Optional[float]:
+        """Курс валюты к рублю; None, если его не удалось получить"""
+        if currency == "RUB":
+            return 1.0
+
+        rate = self.cache.get(currency, date)
+        if rate is not None:
+            return rate
+
+        key = (currency, date)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(currency, date))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # shield: отмена одного ожидающего не отменяет общий запрос для остальных
+        return await asyncio.shield(future)
+
+    async def _fetch(self, currency: str, date: Optional[str]) -> Optional[float]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        for attempt in range(self.retries + 1):
+            try:
+                # wait_for дожидается завершения отмененного запроса, поэтому слот держится до конца запроса
+                async with self._semaphore:
+                    rate = await asyncio.wait_for(self.fetcher(currency, date), self.timeout)
+            except (RetryableRateError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    return None
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+                continue
+
+            if rate is not None:
+                self.cache.put(currency, rate, date)
+            return rate
+
+        return None
+
+
+async def aconvert_to_rub(transaction: Dict, converter: Optional[AsyncRateConverter] = None) -> float:
+    """Асинхронно конвертирует сумму транзакции в рубли"""
+    if converter is None:
+        converter = AsyncRateConverter()
+
+    units, currency = _amount_and_currency(transaction)
+    rate = await converter.rate(currency)
+    return _to_rub(units, rate)
+
+
+async def aconvert_many(
+        transactions: Iterable[Dict],
+        converter: Optional[AsyncRateConverter] = None,
+        by_date: bool = False
+) -> List[float]:
+    """
+    Асинхронно конвертирует суммы транзакций в рубли.
+    Курсы различных валют запрашиваются параллельно, каждый один раз.
+    """
+    if converter is None:
+        converter = AsyncRateConverter()
+
+    items = []
+    needed = []
+    for transaction in transactions:
+        units, currency = _amount_and_currency(transaction)
+        date = str(transaction.get("date") or "")[:10] if by_date else None
+        items.append((units, currency, date))
+        needed.append((currency, date))
+
+    keys = list(dict.fromkeys(needed))
+    missing = [
+        (currency, date) for currency, date in keys
+        if currency != "RUB" and converter.cache.get(currency, date) is None
+    ]
+    fetched = await asyncio.gather(*(converter.rate(currency, date) for currency, date in keys))
+    rates = dict(zip(keys, fetched))
+    # Файл кеша перезаписывается, только если получены новые курсы
+    if any(rates[key] is not None for key in missing):
+        converter.cache.save()
+
+    return [_to_rub(units, rates[(currency, date)]) for units, currency, date in items]
@@ -1,23 +1,19 @@
-import json
 import csv
-import logging
+import io
+import json
 import os
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-logger = logging.getLogger("file_loaders")
-logger.setLevel(logging.DEBUG)
+from src.amounts import AMOUNT_FIELD, parse_minor_units
+from src.decorators import profile
+from src.logging_config import get_logger
+from src.transaction_table import TransactionTable
 
-if not os.path.exists("logs"):
-    os.makedirs("logs")
-
-file_handler = logging.FileHandler("logs/file_loaders.log", mode="w", encoding="utf-8")
-file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(file_formatter)
-logger.addHandler(file_handler)
-logger.propagate = False
+logger = get_logger("file_loaders")
 
 
+@profile()
 def load_json(file_path: str) -> List[Dict]:
     """Загружает данные из JSON файла"""
     path = Path(file_path)
@@ -41,79 +37,232 @@ def load_json(file_path: str) -> List[Dict]:
         raise ValueError(f"Некорректный JSON формат в файле {path.name}")
 
 
-def load_csv(file_path: str) -> List[Dict]:
-    """Загружает данные из CSV файла"""
+JSON_CHUNK_SIZE = 64 * 1024
+# Обрыв элемента на конце буфера дает ошибку не дальше длины самого длинного литерала (-Infinity)
+JSON_TAIL_MARGIN = 16
+
+
+def _json_truncated(json_err: json.JSONDecodeError, length: int) -> bool:
+    """Ошибка разбора вызвана концом буфера, а не некорректным элементом"""
+    return json_err.pos >= length - JSON_TAIL_MARGIN or json_err.msg.startswith("Unterminated string")
+
+
+def iter_json(file_path: str, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict]:
+    """
+    Потоково читает массив верхнего уровня из JSON файла.
+    Элементы разбираются по одному, поэтому в памяти находится только
+    текущий элемент и буфер чтения, а не весь документ.
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        logger.error(f"JSON файл не найден: {file_path}")
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+    return _iter_json_array(path, chunk_size)
+
+
+def _iter_json_array(path: Path, chunk_size: int) -> Iterator[Dict]:
+    """Генератор элементов JSON массива с ограниченным буфером чтения"""
+    decoder = json.JSONDecoder()
+    whitespace = " \t\n\r"
+
+    with open(path, "r", encoding="utf-8") as file:
+        buffer = file.read(chunk_size)
+        eof = not buffer
+        pos = 0
+
+        def fill(grow: bool = False) -> bool:
+            """
+            Дочитывает следующий блок в буфер, отбрасывая уже разобранную часть.
+            С grow=True блок не меньше неразобранного остатка, чтобы повторные
+            разборы длинного элемента в сумме оставались линейными.
+            """
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = file.read(max(chunk_size, len(buffer) - pos) if grow else chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def skip_whitespace() -> None:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in whitespace:
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    return
+
+        skip_whitespace()
+        if pos >= len(buffer):
+            logger.error(f"Ошибка декодирования JSON: пустой файл {path.name}")
+            raise ValueError(f"Некорректный JSON формат в файле {path.name}")
+        if buffer[pos] != "[":
+            logger.warning("Данные в JSON файле не являются списком")
+            raise TypeError("Данные в JSON файле должны быть списком")
+        pos += 1
+
+        count = 0
+        skip_whitespace()
+        empty = pos < len(buffer) and buffer[pos] == "]"
+
+        while not empty:
+            skip_whitespace()
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as json_err:
+                    if _json_truncated(json_err, len(buffer)) and fill(grow=True):
+                        continue
+                    logger.error(f"Ошибка декодирования JSON: {json_err}")
+                    raise ValueError(f"Некорректный JSON формат в файле {path.name}")
+                # Число у конца буфера может продолжаться в следующем блоке:
+                # из "1e" разбирается 1, а "1e5" оборвано внутри экспоненты
+                if type(item) in (int, float) and end > len(buffer) - JSON_TAIL_MARGIN and fill(grow=True):
+                    continue
+                break
+
+            pos = end
+            count += 1
+            yield item
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                logger.error(f"Ошибка декодирования JSON: неожиданный конец файла {path.name}")
+                raise ValueError(f"Некорректный JSON формат в файле {path.name}")
+            if buffer[pos] == "]":
+                break
+            if buffer[pos] != ",":
+                logger.error(f"Ошибка декодирования JSON: ожидалась ',' в позиции {pos}")
+                raise ValueError(f"Некорректный JSON формат в файле {path.name}")
+            pos += 1
+
+        # После закрывающей скобки допускаются только пробельные символы, как в load_json
+        pos += 1
+        skip_whitespace()
+        if pos < len(buffer):
+            logger.error(f"Ошибка декодирования JSON: лишние данные после массива в файле {path.name}")
+            raise ValueError(f"Некорректный JSON формат в файле {path.name}")
+
+        logger.info(f"Успешно загружено {count} записей из JSON файла {path.name}")
+
+
+CSV_PROGRESS_EVERY = 100_000
+
+
+def _csv_text(value: str) -> Any:
+    """Пустое значение превращается в None, остальные строки очищаются от пробелов"""
+    if value == '':
+        return None
+    return value.strip()
+
+
+def _csv_state(value: str) -> Any:
+    """Статус операции приводится к верхнему регистру"""
+    if value == '':
+        return None
+    return value.strip().upper()
+
+
+def _csv_id(value: str) -> Any:
+    """Идентификатор приводится к int, дробная часть отбрасывается"""
+    if value == '':
+        return None
+    id_str = value.strip()
+    if not id_str:
+        return id_str
+    try:
+        return int(id_str.split('.')[0])
+    except ValueError:
+        return id_str
+
+
+CSV_CONVERTERS = {"state": _csv_state, "id": _csv_id}
+
+
+def iter_csv(file_path: str, delimiter: str = ';', encoding: str = "utf-8") -> Iterator[Dict]:
+    """
+    Потоково читает CSV файл и выдает нормализованные записи по одной.
+    Заголовок нормализуется один раз, и для каждого столбца заранее
+    выбирается функция преобразования значения.
+    """
     path = Path(file_path)
 
     if not path.exists():
         logger.error(f"CSV файл не найден: {file_path}")
         raise FileNotFoundError(f"Файл не найден: {file_path}")
 
+    return _iter_csv_rows(path, delimiter, encoding)
+
+
+def _csv_plan(header: List[str]) -> List[Tuple[str, Callable[[str], Any]]]:
+    """План нормализации: ключ и функция преобразования для каждого столбца"""
+    keys = [column.strip().lower() for column in header]
+    return [(key, CSV_CONVERTERS.get(key, _csv_text)) for key in keys]
+
+
+def _convert_csv_rows(reader: Iterator[List[str]], plan: List[Tuple[str, Callable[[str], Any]]]) -> Iterator[Dict]:
+    """
+    Применяет план столбцов к строкам csv.reader, пропуская пустые и дополняя короткие строки.
+    Поля сверх заголовка, как в csv.DictReader, сохраняются списком под ключом None.
+    """
+    width = len(plan)
+    for row in reader:
+        if not row:
+            continue
+
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+
+        record: Dict[Any, Any] = {key: convert(value) for (key, convert), value in zip(plan, row)}
+        if len(row) > width:
+            record[None] = row[width:]
+        yield record
+
+
+def _iter_csv_rows(path: Path, delimiter: str, encoding: str) -> Iterator[Dict]:
+    """Генератор записей CSV с предварительно построенным планом столбцов"""
     try:
-        with open(path, "r", encoding="utf-8") as file:
-            # Используем DictReader с явным указанием delimiter
-            reader: csv.DictReader = csv.DictReader(file, delimiter=';')
+        with open(path, "r", encoding=encoding, newline="") as file:
+            reader = csv.reader(file, delimiter=delimiter)
 
-            if not reader.fieldnames:
+            header = next(reader, None)
+            if not header:
                 raise ValueError("CSV файл пуст или не содержит заголовков")
 
-            data: List[Dict[str, Any]] = []
-            processed_count: int = 0
-
-            for row_dict in reader:
-                processed_count += 1
-
-                # Создаем новый словарь с нормализованными ключами
-                processed_row: Dict[str, Any] = {}
-
-                # Явно аннотируем items() как список кортежей
-                row_items: List[tuple[str, Any]] = list(row_dict.items())
-
-                for key, value in row_items:
-                    # Нормализуем ключи: убираем пробелы, приводим к нижнему регистру
-                    normalized_key: str = key.strip().lower()
-
-                    # Обрабатываем значения
-                    if value is None or value == '':
-                        processed_row[normalized_key] = None
-                    else:
-                        # Убираем лишние пробелы у строк
-                        if isinstance(value, str):
-                            processed_row[normalized_key] = value.strip()
-                        else:
-                            processed_row[normalized_key] = value
-
-                if 'state' in processed_row and processed_row['state']:
-                    state_value: Any = processed_row['state']
-                    if isinstance(state_value, str):
-                        processed_row['state'] = state_value.strip().upper()
-                    else:
-                        processed_row['state'] = str(state_value).strip().upper()
-
-                if 'id' in processed_row and processed_row['id']:
-                    try:
-                        id_value: Any = processed_row['id']
-                        if isinstance(id_value, str):
-                            # Убираем возможные дробные части
-                            id_str: str = id_value.split('.')[0]
-                            processed_row['id'] = int(id_str)
-                        else:
-                            processed_row['id'] = int(id_value)
-                    except (ValueError, TypeError):
-                        pass
-
-                data.append(processed_row)
-
-                # Логируем прогресс для больших файлов
-                if processed_count % 100 == 0:
-                    logger.debug(f"Обработано {processed_count} записей из CSV")
-
-            logger.info(f"Успешно загружено {len(data)} записей из CSV файла {path.name}")
-            return data
+            count = 0
+            for record in _convert_csv_rows(reader, _csv_plan(header)):
+                yield record
+
+                count += 1
+                if count % CSV_PROGRESS_EVERY == 0:
+                    logger.debug("Обработано %d записей из CSV", count)
+
+            logger.info(f"Успешно прочитано {count} записей из CSV файла {path.name}")
 
     except csv.Error as csv_err:
         logger.error(f"Ошибка чтения CSV: {csv_err}")
         raise ValueError(f"Некорректный CSV формат в файле {path.name}")
+
+
+@profile()
+def load_csv(file_path: str) -> List[Dict]:
+    """Загружает данные из CSV файла"""
+    path = Path(file_path)
+
+    if not path.exists():
+        logger.error(f"CSV файл не найден: {file_path}")
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+    try:
+        data: List[Dict[str, Any]] = list(iter_csv(file_path))
+        logger.info(f"Успешно загружено {len(data)} записей из CSV файла {path.name}")
+        return data
+
     except UnicodeDecodeError:
         try:
             with open(path, "r", encoding="cp1251") as file:
@@ -125,8 +274,176 @@ def load_csv(file_path: str) -> List[Dict]:
             raise ValueError(f"Некорректная кодировка файла {path.name}")
 
 
-def load_xlsx(file_path: str) -> List[Dict]:
-    """Загружает данные из XLSX файла"""
+# Минимальный размер части файла для параллельного разбора: меньшие файлы
+# быстрее прочитать в одном процессе, чем передавать результаты между процессами
+CSV_PARALLEL_MIN_CHUNK = 4 * 1024 * 1024
+CSV_PARALLEL_SCAN_BLOCK = 1024 * 1024
+# Частей больше, чем процессов, чтобы процессы не простаивали из-за неравных частей
+CSV_PARALLEL_CHUNKS_PER_WORKER = 4
+
+
+def _csv_chunk_bounds(path: Path, start: int, size: int, chunks: int) -> List[Tuple[int, int]]:
+    """
+    Делит байты файла от start до конца на диапазоны, границы которых
+    приходятся на конец строки вне кавычек. Внутри поля в кавычках количество
+    символов '"' до позиции нечетное (экранированная кавычка "" четность не меняет),
+    поэтому перевод строки подходит для границы, только если перед ним четное число кавычек.
+    """
+    targets = [start + (size - start) * i // chunks for i in range(1, chunks)]
+    bounds = [start]
+
+    with open(path, "rb") as file:
+        file.seek(start)
+        offset = start
+        quotes = 0
+        target_index = 0
+        while target_index < len(targets):
+            block = file.read(CSV_PARALLEL_SCAN_BLOCK)
+            if not block:
+                break
+
+            # quotes - число кавычек от start до offset + pos
+            pos = 0
+            while target_index < len(targets):
+                newline = block.find(b"\n", max(pos, targets[target_index] - offset))
+                if newline == -1:
+                    break
+                quotes += block.count(b'"', pos, newline)
+                pos = newline + 1
+                if quotes % 2 == 0:
+                    bounds.append(offset + pos)
+                    while target_index < len(targets) and targets[target_index] < bounds[-1]:
+                        target_index += 1
+
+            quotes += block.count(b'"', pos)
+            offset += len(block)
+
+    bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds, bounds[1:]) if begin < end]
+
+
+def _parse_csv_chunk(
+        file_path: str, start: int, end: int, header: List[str], delimiter: str, encoding: str
+) -> Optional[List[Dict]]:
+    """
+    Разбирает диапазон байтов CSV файла в отдельном процессе.
+    Возвращает None, если часть не закончилась вне поля в кавычках (strict
+    режим csv): тогда граница части выбрана неверно, например из-за кавычки
+    внутри поля без кавычек, нарушившей подсчет четности.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        text = file.read(end - start).decode(encoding)
+
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter, strict=True)
+    try:
+        return list(_convert_csv_rows(reader, _csv_plan(header)))
+    except csv.Error:
+        return None
+
+
+@profile()
+def load_csv_parallel(file_path: str, workers: Optional[int] = None, delimiter: str = ';') -> List[Dict]:
+    """
+    Загружает большой CSV файл в несколько процессов.
+    Файл делится на диапазоны байтов по границам строк (с учетом полей в кавычках),
+    диапазоны разбираются в ProcessPoolExecutor по тем же правилам, что и в load_csv,
+    и результаты объединяются в исходном порядке. Каждая часть проверяется: разбор
+    должен закончиться вне поля в кавычках, тогда следующая часть начинается с начала
+    записи. Если проверка не прошла, файл загружается обычным load_csv, как и
+    небольшие файлы и файлы не в UTF-8.
+    """
+    path = Path(file_path)
+
+    if not path.exists():
+        logger.error(f"CSV файл не найден: {file_path}")
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers должен быть положительным")
+
+    size = path.stat().st_size
+    try:
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            header = next(csv.reader(file, delimiter=delimiter), None)
+            if not header:
+                raise ValueError("CSV файл пуст или не содержит заголовков")
+        with open(path, "rb") as file:
+            # Заголовок в кавычках может занимать несколько физических строк
+            quotes = file.readline().count(b'"')
+            while quotes % 2:
+                line = file.readline()
+                if not line:
+                    break
+                quotes += line.count(b'"')
+            data_start = file.tell()
+    except UnicodeDecodeError:
+        return load_csv(file_path)
+    except csv.Error as csv_err:
+        logger.error(f"Ошибка чтения CSV: {csv_err}")
+        raise ValueError(f"Некорректный CSV формат в файле {path.name}")
+
+    chunks = min(workers * CSV_PARALLEL_CHUNKS_PER_WORKER, (size - data_start) // CSV_PARALLEL_MIN_CHUNK)
+    if workers == 1 or chunks < 2:
+        return load_csv(file_path)
+
+    # multiprocessing нужен только здесь, импорт не замедляет запуск main
+    from concurrent.futures import ProcessPoolExecutor
+
+    bounds = _csv_chunk_bounds(path, data_start, size, chunks)
+    data: List[Dict] = []
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as executor:
+            futures = [
+                executor.submit(_parse_csv_chunk, str(path), start, end, header, delimiter, "utf-8")
+                for start, end in bounds
+            ]
+            for future in futures:
+                rows = future.result()
+                if rows is None:
+                    for pending in futures:
+                        pending.cancel()
+                    logger.warning(f"Границы частей CSV файла {path.name} не подтвердились, загрузка в одном процессе")
+                    return load_csv(file_path)
+                data.extend(rows)
+    except UnicodeDecodeError:
+        return load_csv(file_path)
+    except csv.Error as csv_err:
+        logger.error(f"Ошибка чтения CSV: {csv_err}")
+        raise ValueError(f"Некорректный CSV формат в файле {path.name}")
+
+    logger.info(f"Успешно загружено {len(data)} записей из CSV файла {path.name} ({len(bounds)} частей)")
+    return data
+
+
+def _xlsx_value(cell: Any) -> Any:
+    """Числа сохраняются как есть, остальные значения приводятся к строке без пробелов"""
+    if cell is None or isinstance(cell, (int, float)):
+        return cell
+    return str(cell).strip()
+
+
+def _xlsx_id(cell: Any) -> Any:
+    """Идентификатор приводится к int"""
+    value = _xlsx_value(cell)
+    if value is None:
+        return value
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return value
+
+
+XLSX_CONVERTERS = {"id": _xlsx_id}
+
+
+def iter_xlsx(file_path: str) -> Iterator[Dict]:
+    """
+    Потоково читает XLSX файл в режиме read-only и выдает записи по одной.
+    Функция преобразования для каждого столбца выбирается один раз по заголовку.
+    """
     try:
         import openpyxl
     except ImportError as import_err:
@@ -141,8 +458,18 @@ def load_xlsx(file_path: str) -> List[Dict]:
         logger.error(f"XLSX файл не найден: {file_path}")
         raise FileNotFoundError(f"Файл не найден: {file_path}")
 
+    return _iter_xlsx_rows(openpyxl, path)
+
+
+def _iter_xlsx_rows(openpyxl: Any, path: Path) -> Iterator[Dict]:
+    """Генератор записей первого листа книги, открытой без загрузки всех ячеек в память"""
+    try:
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    except Exception as unexpected_err:
+        logger.error(f"Ошибка при загрузке XLSX: {unexpected_err}")
+        raise RuntimeError(f"Ошибка при загрузке XLSX файла {path.name}")
+
     try:
-        workbook = openpyxl.load_workbook(path, data_only=True)
         sheet = workbook.active
 
         # Получаем заголовки
@@ -156,47 +483,138 @@ def load_xlsx(file_path: str) -> List[Dict]:
         if not headers:
             raise ValueError("XLSX файл не содержит заголовков")
 
-        # Читаем данные
-        data = []
+        # План преобразования: ключ и функция для каждого столбца
+        plan = [(header, XLSX_CONVERTERS.get(header, _xlsx_value)) for header in headers]
+        # Точная сумма считается прямо из значения ячейки, без промежуточного float из строки
+        amount_index = headers.index("amount") if "amount" in headers else None
+
+        count = 0
         for row in sheet.iter_rows(min_row=2, values_only=True):
             # Пропускаем полностью пустые строки
             if all(cell is None for cell in row):
                 continue
 
-            row_dict = {}
-            for i, cell in enumerate(row):
-                if i < len(headers):
-                    # Обработка значений ячеек
-                    if cell is None:
-                        row_dict[headers[i]] = None
-                    elif isinstance(cell, (int, float)):
-                        row_dict[headers[i]] = cell
-                    else:
-                        row_dict[headers[i]] = str(cell).strip()
-
-            # Автоматическое преобразование типов
-            if 'id' in row_dict and row_dict['id'] is not None:
-                try:
-                    row_dict['id'] = int(row_dict['id'])
-                except (ValueError, TypeError):
-                    pass
+            record = {key: convert(cell) for (key, convert), cell in zip(plan, row)}
+            if amount_index is not None and amount_index < len(row):
+                record[AMOUNT_FIELD] = parse_minor_units(row[amount_index])
+            yield record
+            count += 1
 
-            if 'amount' in row_dict and row_dict['amount'] is not None:
-                try:
-                    if isinstance(row_dict['amount'], str):
-                        amount_str = row_dict['amount'].replace(',', '.')
-                        row_dict['amount'] = float(amount_str)
-                except (ValueError, TypeError):
-                    pass
-
-            data.append(row_dict)
-
-        logger.info(f"Успешно загружено {len(data)} записей из XLSX файла {path.name}")
-        return data
+        logger.info(f"Успешно прочитано {count} записей из XLSX файла {path.name}")
 
     except Exception as unexpected_err:
         logger.error(f"Ошибка при загрузке XLSX: {unexpected_err}")
         raise RuntimeError(f"Ошибка при загрузке XLSX файла {path.name}")
+    finally:
+        workbook.close()
+
+
+@profile()
+def load_xlsx(file_path: str) -> List[Dict]:
+    """Загружает данные из XLSX файла"""
+    data = list(iter_xlsx(file_path))
+    logger.info(f"Успешно загружено {len(data)} записей из XLSX файла {Path(file_path).name}")
+    return data
+
+
+# Версия загрузчиков и нормализации: при изменении правил разбора старые кеши становятся недействительными
+LOADER_VERSION = 4
+DATASET_CACHE_SUFFIX = ".cache"
+TABLE_CACHE_SUFFIX = ".table.cache"
+
+
+def _dataset_fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "loader_version": LOADER_VERSION,
+    }
+
+
+def _cached_source(file_path: str) -> Tuple[Path, Callable[[str], Iterable[Dict]]]:
+    """Путь к исходному файлу и загрузчик для его формата"""
+    path = Path(file_path)
+    if not path.exists():
+        logger.error(f"Файл не найден: {file_path}")
+        raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+    loaders: Dict[str, Callable[[str], Iterable[Dict]]] = {".json": iter_json, ".csv": load_csv, ".xlsx": load_xlsx}
+    loader = loaders.get(path.suffix.lower())
+    if loader is None:
+        error_msg = f"Неподдерживаемый формат файла: {path.suffix}"
+        logger.error(error_msg)
+        raise ValueError(error_msg)
+    return path, loader
+
+
+@profile()
+def load_cached(file_path: str, use_cache: bool = True) -> List[Dict]:
+    """
+    Загружает и нормализует транзакции из JSON, CSV или XLSX файла.
+    Результат сохраняется в колоночный кеш рядом с исходным файлом
+    (<имя файла>.cache). Кеш используется, пока не изменились путь, размер,
+    время изменения файла и LOADER_VERSION, иначе файл разбирается заново.
+    """
+    from src.dataset_cache import read_dataset, write_dataset
+    from src.utils import normalize_transaction_data
+
+    path, loader = _cached_source(file_path)
+    cache_path = path.with_name(path.name + DATASET_CACHE_SUFFIX)
+    fingerprint = _dataset_fingerprint(path)
+
+    if use_cache:
+        data = read_dataset(cache_path, fingerprint)
+        if data is not None:
+            logger.info(f"Загружено {len(data)} записей из кеша {cache_path.name}")
+            return data
+
+    # Записи только что прочитаны из файла, поэтому нормализуются на месте
+    data = normalize_transaction_data(loader(str(path)), in_place=True)
+
+    if use_cache:
+        try:
+            write_dataset(cache_path, data, fingerprint)
+            logger.info(f"Сохранен кеш {cache_path.name}")
+        except (OSError, TypeError, ValueError) as cache_err:
+            # Без кеша загрузка остается корректной, только медленнее
+            logger.warning(f"Не удалось сохранить кеш {cache_path.name}: {cache_err}")
+
+    return data
+
+
+@profile()
+def load_table(file_path: str, use_cache: bool = True) -> TransactionTable:
+    """
+    Загружает и нормализует транзакции сразу в TransactionTable.
+    Таблица сохраняется в кеш <имя файла>.table.cache: массивы столбцов
+    хранятся байтами и читаются через frombytes, поэтому повторная загрузка
+    не создает словарей записей. Кеш проверяется так же, как в load_cached.
+    """
+    from src.dataset_cache import read_table, write_table
+    from src.utils import iter_normalized
+
+    path, loader = _cached_source(file_path)
+    cache_path = path.with_name(path.name + TABLE_CACHE_SUFFIX)
+    fingerprint = _dataset_fingerprint(path)
+
+    if use_cache:
+        table = read_table(cache_path, fingerprint)
+        if table is not None:
+            logger.info(f"Загружено {len(table)} записей из кеша {cache_path.name}")
+            return table
+
+    table = TransactionTable.from_transactions(iter_normalized(loader(str(path)), in_place=True))
+
+    if use_cache:
+        try:
+            write_table(cache_path, table, fingerprint)
+            logger.info(f"Сохранен кеш {cache_path.name}")
+        except (OSError, TypeError, ValueError) as cache_err:
+            logger.warning(f"Не удалось сохранить кеш {cache_path.name}: {cache_err}")
+
+    return table
 
 
 def load_transactions(file_type: str = "json") -> List[Dict]:
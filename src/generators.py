@@ -1,8 +1,15 @@
 from typing import Dict, Iterable, Iterator, List, Union
 
+from src.transaction_table import TransactionTable
+
 
 def filter_by_currency(transactions: Iterable[Dict[str, object]], currency: str) -> Iterator[Dict[str, object]]:
     """Генератор, который фильтрует транзакции по заданной валюте."""
+    if isinstance(transactions, TransactionTable):
+        for index in transactions.indices_where_currency(currency):
+            yield transactions.row(index)
+        return
+
     for transaction in transactions:
         op_amount = transaction.get("operationAmount", {})
         if isinstance(op_amount, dict):
@@ -0,0 +1,119 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Set
+
+# Сколько различных строк запоминает count; остальные просматриваются без запоминания
+COUNT_MEMO_SIZE = 65536
+
+
+class KeywordMatcher:
+    """
+    Поиск множества ключевых слов за один проход по строке (алгоритм Ахо-Корасик).
+    Слова сравниваются без учета регистра. Автомат строится один раз,
+    после чего каждая строка просматривается один раз независимо
+    от количества слов.
+    """
+
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords: List[str] = list(keywords)
+
+        # Уникальные слова в нижнем регистре и номера исходных слов для каждого из них
+        self._patterns: List[str] = []
+        self._pattern_keywords: List[List[int]] = []
+        pattern_ids: Dict[str, int] = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if pattern not in pattern_ids:
+                pattern_ids[pattern] = len(self._patterns)
+                self._patterns.append(pattern)
+                self._pattern_keywords.append([])
+            self._pattern_keywords[pattern_ids[pattern]].append(keyword_id)
+
+        self._empty_pattern = pattern_ids.get("")
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[FrozenSet[int]] = [frozenset()]
+        self._build()
+
+    def _build(self) -> None:
+        outputs: List[Set[int]] = [set()]
+
+        # Бор из всех слов
+        for pattern_id, pattern in enumerate(self._patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    outputs.append(set())
+                state = next_state
+            outputs[state].add(pattern_id)
+
+        # Суффиксные ссылки обходом в ширину
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fallback = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                outputs[next_state] |= outputs[self._fail[next_state]]
+
+        self._output = [frozenset(output) for output in outputs]
+
+    def find_patterns(self, text: str) -> Set[int]:
+        """Номера уникальных слов, встречающихся в строке"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found: Set[int] = set()
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found |= output[state]
+
+        if self._empty_pattern is not None:
+            found.add(self._empty_pattern)
+        return found
+
+    def find(self, text: str) -> List[int]:
+        """Номера исходных ключевых слов, встречающихся в строке (с учетом повторов в списке)"""
+        return [
+            keyword_id for pattern_id in self.find_patterns(text) for keyword_id in self._pattern_keywords[pattern_id]
+        ]
+
+    def count(self, texts: Iterable[str], weights: Iterable[int] = ()) -> List[int]:
+        """
+        Для каждого ключевого слова считает количество строк, в которых оно встречается.
+        Одинаковые строки просматриваются один раз (запоминается не больше
+        COUNT_MEMO_SIZE различных строк); weights задает, сколько раз
+        учитывать каждую строку (по умолчанию один).
+        """
+        counts = [0] * len(self.keywords)
+        seen: Dict[str, Set[int]] = {}
+        weights = iter(weights)
+
+        for text in texts:
+            weight = next(weights, 1)
+            patterns = seen.get(text)
+            if patterns is None:
+                patterns = self.find_patterns(text)
+                if len(seen) < COUNT_MEMO_SIZE:
+                    seen[text] = patterns
+            for pattern_id in patterns:
+                for keyword_id in self._pattern_keywords[pattern_id]:
+                    counts[keyword_id] += weight
+
+        return counts
@@ -0,0 +1,45 @@
+import logging
+import os
+from typing import Set
+
+LOG_DIR = "logs"
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_configured: Set[str] = set()
+
+
+class LazyFileHandler(logging.FileHandler):
+    """
+    Файловый обработчик без побочных эффектов при создании:
+    папка создается, а файл открывается (и при mode="w" очищается)
+    только при первой записи в лог.
+    """
+
+    def __init__(self, filename: str, mode: str = "a", encoding: str = "utf-8") -> None:
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):  # type: ignore[no-untyped-def]
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def get_logger(name: str, mode: str = "w") -> logging.Logger:
+    """
+    Возвращает логгер модуля с записью в logs/<name>.log.
+    Обработчик добавляется один раз, файловая система не затрагивается
+    до первого сообщения.
+    """
+    logger = logging.getLogger(name)
+
+    if name not in _configured:
+        _configured.add(name)
+        logger.setLevel(logging.DEBUG)
+
+        file_handler = LazyFileHandler(os.path.join(LOG_DIR, f"{name}.log"), mode=mode)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        logger.addHandler(file_handler)
+        logger.propagate = False  # Отключаем распространение логов
+
+    return logger
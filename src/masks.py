@@ -1,54 +1,109 @@
-import logging
-import os
+from collections import Counter
+from typing import Iterable, List, Optional
 
-if not os.path.exists("logs"):
-    os.makedirs("logs")
+from src.logging_config import get_logger
 
-logger = logging.getLogger("masks")
-logger.setLevel(logging.DEBUG)
-
-file_handler = logging.FileHandler("logs/masks.log", mode="w")
-file_handler.setLevel(logging.DEBUG)
-
-file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(file_formatter)
-
-logger.addHandler(file_handler)
+logger = get_logger("masks")
 
 
 def get_mask_card_number(card_number: str) -> str:
     """Функция маскирует номер карты в формате XXXX XX** **** XXXX, где X — это цифра номера"""
-    logger.debug(f"Получение маски для номера карты: {card_number}")
+    logger.debug("Получение маски для номера карты: %s", card_number)
     if not isinstance(card_number, str):
         logger.error("Ошибка: Неправильный тип данных")
         raise ValueError("Неправильный тип данных")
     if len(card_number) != 16:
-        logger.error(f"Ошибка: Ожидалось 16, а получили {len(card_number)}")
+        logger.error("Ошибка: Ожидалось 16, а получили %d", len(card_number))
         raise ValueError(f"Ожидалось 16, а получили {len(card_number)}")
     if not card_number.isdigit():
         logger.error("Ошибка: В номере карты должны быть только цифры")
         raise ValueError("В номере карты должны быть только цифры")
 
     mask_card = f"{card_number[0:4]} {card_number[4:6]}** **** {card_number[12:]}"
-    logger.info(f"Маска карты успешно создана: {mask_card}")
+    logger.info("Маска карты успешно создана: %s", mask_card)
 
     return mask_card
 
 
 def get_mask_account(account_number: str) -> str:
     """Функция маскирует номер счета в формате **XXXX, где X — это цифра номера"""
-    logger.debug(f"Получение маски для номера счета: {account_number}")
+    logger.debug("Получение маски для номера счета: %s", account_number)
     if not isinstance(account_number, str):
         logger.error("Ошибка: Неправильный тип данных")
         raise ValueError("Неправильный тип данных")
     if len(account_number) != 20:
-        logger.error(f"Ошибка: Ожидалось 20, а получили {len(account_number)}")
+        logger.error("Ошибка: Ожидалось 20, а получили %d", len(account_number))
         raise ValueError(f"Ожидалось 20, а получили {len(account_number)}")
     if not account_number.isdigit():
         logger.error("Ошибка: В номере счета должны быть только цифры")
         raise ValueError("В номере счета должны быть только цифры")
 
     mask_account = f"**{account_number[-4:]}"
-    logger.info(f"Маска карты успешно создана: {mask_account}")
+    logger.info("Маска карты успешно создана: %s", mask_account)
 
     return mask_account
+
+
+def _summarize_errors(kind: str, errors: Counter, strict: bool) -> None:
+    """Одна строка лога (или одно исключение при strict) на весь пакет вместо строки на каждую ошибку"""
+    if not errors:
+        return
+    summary = ", ".join(f"{reason}: {count}" for reason, count in errors.most_common())
+    message = f"Не удалось замаскировать {sum(errors.values())} номеров {kind} ({summary})"
+    logger.warning(message)
+    if strict:
+        raise ValueError(message)
+
+
+def mask_cards_bulk(card_numbers: Iterable[str], strict: bool = False) -> List[Optional[str]]:
+    """
+    Маскирует набор номеров карт в формате XXXX XX** **** XXXX.
+    Некорректные номера дают None, ошибки собираются в одну сводку
+    в логе; при strict=True по сводке выбрасывается ValueError.
+    """
+    masked: List[Optional[str]] = []
+    append = masked.append
+    errors: Counter = Counter()
+
+    for card_number in card_numbers:
+        if type(card_number) is str and len(card_number) == 16 and card_number.isdigit():
+            append(f"{card_number[0:4]} {card_number[4:6]}** **** {card_number[12:]}")
+            continue
+
+        append(None)
+        if not isinstance(card_number, str):
+            errors["Неправильный тип данных"] += 1
+        elif len(card_number) != 16:
+            errors["Неверная длина"] += 1
+        else:
+            errors["Не только цифры"] += 1
+
+    _summarize_errors("карт", errors, strict)
+    return masked
+
+
+def mask_accounts_bulk(account_numbers: Iterable[str], strict: bool = False) -> List[Optional[str]]:
+    """
+    Маскирует набор номеров счетов в формате **XXXX.
+    Некорректные номера дают None, ошибки собираются в одну сводку
+    в логе; при strict=True по сводке выбрасывается ValueError.
+    """
+    masked: List[Optional[str]] = []
+    append = masked.append
+    errors: Counter = Counter()
+
+    for account_number in account_numbers:
+        if type(account_number) is str and len(account_number) == 20 and account_number.isdigit():
+            append("**" + account_number[-4:])
+            continue
+
+        append(None)
+        if not isinstance(account_number, str):
+            errors["Неправильный тип данных"] += 1
+        elif len(account_number) != 20:
+            errors["Неверная длина"] += 1
+        else:
+            errors["Не только цифры"] += 1
+
+    _summarize_errors("счетов", errors, strict)
+    return masked
@@ -1,14 +1,34 @@
-from typing import Dict, List, Union
+import heapq
+from typing import Dict, List, Optional, Sequence, Union
 
+from src.decorators import profile
+from src.transaction_table import TransactionTable
 
+Operations = Union[List[Dict[str, Union[str, int]]], TransactionTable]
+
+
+@profile()
 def filter_by_state(
-        banking_operations: List[Dict[str, Union[str, int]]],
-        state: str = "EXECUTED"
-) -> List[Dict[str, str | int]]:
+        banking_operations: Operations,
+        state: str = "EXECUTED",
+        as_indices: bool = False
+) -> Union[Operations, Sequence[int]]:
     """
     Функция фильтрует операции по статусу.
     Оптимизирована для работы с большими наборами данных.
+    Для TransactionTable возвращает таблицу с подходящими строками.
+    При as_indices=True возвращает номера подходящих строк вместо самих операций.
     """
+    if isinstance(banking_operations, TransactionTable):
+        if not len(banking_operations):
+            raise ValueError("Передан пустой список")
+        if not isinstance(state, str):
+            raise TypeError("state должен быть строкой")
+        indices = banking_operations.indices_where_state(state)
+        if as_indices:
+            return indices
+        return banking_operations.take(indices)
+
     if not isinstance(banking_operations, list):
         raise TypeError("banking_operations должен быть списком")
 
@@ -21,9 +41,9 @@ def filter_by_state(
     # Приводим искомый статус к верхнему регистру
     target_state = state.upper().strip()
 
-    banking_operations_filtered = []
+    banking_operations_filtered: List = []
 
-    for operation in banking_operations:
+    for index, operation in enumerate(banking_operations):
         if not isinstance(operation, dict):
             continue  # Пропускаем некорректные записи
 
@@ -52,7 +72,7 @@ def filter_by_state(
 
             # Сравниваем с искомым статусом
             if current_state == target_state:
-                banking_operations_filtered.append(operation)
+                banking_operations_filtered.append(index if as_indices else operation)
         except (AttributeError, TypeError):
             # Если не можем преобразовать, пропускаем
             continue
@@ -60,11 +80,42 @@ def filter_by_state(
     return banking_operations_filtered
 
 
+def check_page(limit: Optional[int], offset: int) -> None:
+    """Проверяет параметры постраничной выборки"""
+    if limit is not None and (not isinstance(limit, int) or isinstance(limit, bool)):
+        raise TypeError("limit должен быть целым числом")
+    if not isinstance(offset, int) or isinstance(offset, bool):
+        raise TypeError("offset должен быть целым числом")
+    if (limit is not None and limit < 0) or offset < 0:
+        raise ValueError("limit и offset не могут быть отрицательными")
+
+
+@profile()
 def sort_by_date(
-        banking_operations: List[Dict[str, Union[str, int]]],
-        descending_sort: bool = True
-) -> List[Dict[str, str | int]]:
-    """Функция сортирует операции по дате"""
+        banking_operations: Operations,
+        descending_sort: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
+) -> Operations:
+    """
+    Функция сортирует операции по дате.
+    При заданном limit возвращает только операции с offset по offset + limit
+    в отсортированном порядке; они отбираются через кучу за O(n log k),
+    без полной сортировки.
+    """
+    if isinstance(banking_operations, TransactionTable):
+        if not len(banking_operations):
+            raise ValueError("Передан пустой список")
+        if not isinstance(descending_sort, bool):
+            raise TypeError("descending_sort должен быть булевым значением")
+        check_page(limit, offset)
+        if limit is None:
+            # Используется столбец разобранных дат и кешированная перестановка
+            order = banking_operations.sorted_indices(descending_sort)
+            return banking_operations.take(order[offset:] if offset else order)
+        top = banking_operations.top_indices(descending_sort, offset + limit)
+        return banking_operations.take(top[offset:])
+
     if not isinstance(banking_operations, list):
         raise TypeError("banking_operations должен быть списком")
 
@@ -74,6 +125,8 @@ def sort_by_date(
     if not isinstance(descending_sort, bool):
         raise TypeError("descending_sort должен быть булевым значением")
 
+    check_page(limit, offset)
+
     # Разделяем операции с датой и без
     with_date = []
     without_date = []
@@ -88,11 +141,20 @@ def sort_by_date(
         else:
             without_date.append(operation)
 
-    # Сортируем операции с датой
-    with_date.sort(key=lambda x: x[0], reverse=descending_sort)
+    if limit is None:
+        # Сортируем операции с датой
+        with_date.sort(key=lambda x: x[0], reverse=descending_sort)
+    else:
+        # Частичная выборка: nsmallest/nlargest устойчивы, как и полная сортировка
+        select = heapq.nlargest if descending_sort else heapq.nsmallest
+        with_date = select(offset + limit, with_date, key=lambda x: x[0])
 
     # Собираем результат
     result = [op for _, _, op in with_date]
-    result.extend(without_date)
 
-    return result
+    if limit is None:
+        result.extend(without_date)
+        return result[offset:] if offset else result
+
+    result.extend(without_date[:offset + limit - len(result)])
+    return result[offset:]
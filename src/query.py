@@ -0,0 +1,227 @@
+import heapq
+import re
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from src.decorators import profile
+from src.processing import check_page
+from src.transaction_table import MISSING_CODE, MISSING_DATE, TransactionTable
+
+Source = Union[List[Dict], TransactionTable]
+
+# Порядок проверки условий: дешевые сравнения раньше поиска по регулярному выражению
+_STATE, _CURRENCY, _SEARCH = range(3)
+
+
+class QueryResult(NamedTuple):
+    """Выбранные операции и общее число подходящих операций без учета limit/offset"""
+    rows: Source
+    total: int
+
+
+class Query:
+    """
+    Ленивый запрос к операциям:
+    Query(data).where_state("EXECUTED").where_currency("RUB").search("перевод").order_by_date().limit(50)
+
+    Методы только добавляют условия и возвращают новый запрос, данные
+    просматриваются при execute() (или to_list/count/итерации). Все условия
+    проверяются за один проход, от дешевых к дорогим, а сортируется только то,
+    что прошло фильтры. Условия совпадают с processing.filter_by_state,
+    generators.filter_by_currency и regex_operations.filter_by_description.
+    Для TransactionTable условия проверяются по кодам столбцов, результат - таблица.
+    """
+
+    def __init__(self, source: Source) -> None:
+        if not isinstance(source, (list, TransactionTable)):
+            raise TypeError("source должен быть списком или TransactionTable")
+        self.source = source
+        self._conditions: Tuple[Tuple[int, str], ...] = ()
+        self._descending: Optional[bool] = None
+        self._limit: Optional[int] = None
+        self._offset = 0
+
+    def _with(self, **changes: Any) -> "Query":
+        query = Query.__new__(Query)
+        query.__dict__.update(self.__dict__)
+        query.__dict__.update(changes)
+        return query
+
+    def where_state(self, state: str = "EXECUTED") -> "Query":
+        """Операции с заданным статусом (без учета регистра и пробелов)"""
+        if not isinstance(state, str):
+            raise TypeError("state должен быть строкой")
+        return self._with(_conditions=self._conditions + ((_STATE, state.upper().strip()),))
+
+    def where_currency(self, currency: str) -> "Query":
+        """Операции с заданным кодом валюты"""
+        return self._with(_conditions=self._conditions + ((_CURRENCY, currency),))
+
+    def search(self, text: str) -> "Query":
+        """Операции, в описании которых есть text (без учета регистра); пустая строка ничего не фильтрует"""
+        if not text:
+            return self
+        return self._with(_conditions=self._conditions + ((_SEARCH, text),))
+
+    def order_by_date(self, descending: bool = True) -> "Query":
+        """Сортировка по дате; операции без даты идут в конце"""
+        if not isinstance(descending, bool):
+            raise TypeError("descending_sort должен быть булевым значением")
+        return self._with(_descending=descending)
+
+    def limit(self, count: Optional[int], offset: int = 0) -> "Query":
+        """Ограничивает результат count операциями начиная с offset"""
+        check_page(count, offset)
+        return self._with(_limit=count, _offset=offset)
+
+    def count(self) -> int:
+        """Количество подходящих операций без учета limit; без сортировки"""
+        return len(self._matching())
+
+    @profile()
+    def execute(self) -> QueryResult:
+        """Выполняет запрос: один проход по данным, затем сортировка и срез только подходящих строк"""
+        source = self.source
+        matching = self._matching()
+        total = len(matching)
+
+        if self._descending is not None:
+            matching = _order(source, matching, self._descending, self._limit, self._offset)
+        elif self._limit is not None or self._offset:
+            end = None if self._limit is None else self._offset + self._limit
+            matching = matching[self._offset:end]
+
+        if isinstance(source, TransactionTable):
+            return QueryResult(source.take(matching), total)
+        return QueryResult([source[index] for index in matching], total)
+
+    def to_list(self) -> Source:
+        return self.execute().rows
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.execute().rows)
+
+    def _sorted_conditions(self) -> List[Tuple[int, str]]:
+        return sorted(self._conditions, key=lambda condition: condition[0])
+
+    def _matching(self) -> List[int]:
+        """Номера строк источника, удовлетворяющих всем условиям"""
+        if isinstance(self.source, TransactionTable):
+            return _table_matching(self.source, self._sorted_conditions())
+        return _list_matching(self.source, self._sorted_conditions())
+
+
+def _state_of(operation: Dict) -> Any:
+    """Значение статуса с теми же вариантами ключа, что и в filter_by_state"""
+    if "state" in operation:
+        return operation["state"]
+    if "State" in operation:
+        return operation["State"]
+    return operation.get("STATE")
+
+
+def _list_predicate(kind: int, value: str) -> Callable[[Dict], bool]:
+    if kind == _STATE:
+        def matches(operation: Dict) -> bool:
+            state = _state_of(operation)
+            return state is not None and str(state).upper().strip() == value
+    elif kind == _CURRENCY:
+        def matches(operation: Dict) -> bool:
+            op_amount = operation.get("operationAmount")
+            if not isinstance(op_amount, dict):
+                return False
+            currency = op_amount.get("currency")
+            return isinstance(currency, dict) and currency.get("code") == value
+    else:
+        search = re.compile(re.escape(value), re.IGNORECASE).search
+
+        def matches(operation: Dict) -> bool:
+            description = operation.get("description", "")
+            return isinstance(description, str) and search(description) is not None
+    return matches
+
+
+def _list_matching(source: List[Dict], conditions: List[Tuple[int, str]]) -> List[int]:
+    predicates = [_list_predicate(kind, value) for kind, value in conditions]
+    matching = []
+    for index, operation in enumerate(source):
+        if not isinstance(operation, dict):
+            continue
+        for matches in predicates:
+            if not matches(operation):
+                break
+        else:
+            matching.append(index)
+    return matching
+
+
+def _table_matching(table: TransactionTable, conditions: List[Tuple[int, str]]) -> List[int]:
+    """
+    Каждое условие переводится в множество допустимых кодов столбца
+    (строка статуса, валюты или описания проверяется один раз на различное значение),
+    после чего столбцы кодов просматриваются одним проходом.
+    """
+    checks = []
+    for kind, value in conditions:
+        if kind == _STATE:
+            codes = {table.states.lookup(value)} - {MISSING_CODE}
+            column = table.state_codes
+        elif kind == _CURRENCY:
+            codes = {code for code, (currency, _) in enumerate(table.currencies.values) if currency == value}
+            column = table.currency_codes
+        else:
+            search = re.compile(re.escape(value), re.IGNORECASE).search
+            codes = {
+                code for code, text in enumerate(table.descriptions.values)
+                if isinstance(text, str) and search(text)
+            }
+            column = table.description_codes
+        if not codes:
+            return []
+        checks.append((column, codes))
+
+    if not checks:
+        return list(range(len(table)))
+    if len(checks) == 1:
+        column, codes = checks[0]
+        return [index for index, code in enumerate(column) if code in codes]
+
+    columns = [column for column, _ in checks]
+    allowed = [codes for _, codes in checks]
+    return [
+        index for index, row_codes in enumerate(zip(*columns))
+        if all(code in codes for code, codes in zip(row_codes, allowed))
+    ]
+
+
+def _order(source: Source, matching: List[int], descending: bool, limit: Optional[int], offset: int) -> List[int]:
+    """
+    Упорядочивает подходящие строки по дате так же, как processing.sort_by_date:
+    строки без даты идут в конце в исходном порядке, при заданном limit
+    нужные строки отбираются через кучу.
+    """
+    if isinstance(source, TransactionTable):
+        keys: Any = source.date_keys
+        dated = [index for index in matching if keys[index] != MISSING_DATE]
+        undated = [index for index in matching if keys[index] == MISSING_DATE]
+        key = keys.__getitem__
+    else:
+        dates = {}
+        undated = []
+        for index in matching:
+            date = source[index].get("date")
+            if date and isinstance(date, str):
+                dates[index] = date
+            else:
+                undated.append(index)
+        dated = list(dates)
+        key = dates.__getitem__
+
+    if limit is None:
+        dated.sort(key=key, reverse=descending)
+        ordered = dated + undated
+        return ordered[offset:] if offset else ordered
+
+    select = heapq.nlargest if descending else heapq.nsmallest
+    ordered = select(offset + limit, dated, key=key)
+    ordered.extend(undated[:offset + limit - len(ordered)])
+    return ordered[offset:]
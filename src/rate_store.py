@@ -0,0 +1,117 @@
+import csv
+import sqlite3
+from array import array
+from bisect import bisect_right
+from datetime import date as date_type
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+# Насколько старым может быть последний известный курс (выходные, праздники)
+RATE_MAX_AGE_DAYS = 14
+
+RateRow = Tuple[str, Union[str, date_type], Union[str, float]]
+
+
+class RateStore:
+    """
+    Локальное хранилище исторических курсов валют к рублю в SQLite.
+    Ключ - пара (валюта, дата). Для поиска курсы валюты один раз
+    загружаются в упорядоченные массивы, после чего курс на дату
+    находится бинарным поиском. Если на дату курса нет, берется
+    последний известный курс до нее (выходные и праздники), но не старше
+    max_age_days дней; max_age_days=None снимает ограничение.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", max_age_days: Optional[int] = RATE_MAX_AGE_DAYS) -> None:
+        self.path = str(path)
+        self.max_age_days = max_age_days
+        self._connection = sqlite3.connect(self.path)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS rates ("
+            "currency TEXT NOT NULL, date TEXT NOT NULL, rate REAL NOT NULL, "
+            "PRIMARY KEY (currency, date)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+        self._series: Dict[str, Tuple[array, array]] = {}
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "RateStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add_rates(self, rates: Iterable[RateRow]) -> int:
+        """Добавляет или заменяет курсы (валюта, дата YYYY-MM-DD, курс)"""
+        rows = [(currency.strip().upper(), _parse_date(day).isoformat(), float(rate)) for currency, day, rate in rates]
+        self._connection.executemany("INSERT OR REPLACE INTO rates (currency, date, rate) VALUES (?, ?, ?)", rows)
+        self._connection.commit()
+        self._series.clear()
+        return len(rows)
+
+    def import_csv(self, file_path: str, delimiter: str = ",") -> int:
+        """
+        Загружает курсы из CSV файла со столбцами currency, date, rate.
+        Возвращает количество загруженных строк.
+        """
+        path = Path(file_path)
+        if not path.exists():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        with open(path, "r", encoding="utf-8", newline="") as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = [column.strip().lower() for column in next(reader, [])]
+            try:
+                columns = [header.index(name) for name in ("currency", "date", "rate")]
+            except ValueError:
+                raise ValueError("CSV файл курсов должен содержать столбцы currency, date, rate")
+
+            currency_col, date_col, rate_col = columns
+            return self.add_rates(
+                (row[currency_col], row[date_col], row[rate_col].replace(",", "."))
+                for row in reader
+                if row
+            )
+
+    def _load_series(self, currency: str) -> Tuple[array, array]:
+        series = self._series.get(currency)
+        if series is None:
+            days = array("l")
+            rates = array("d")
+            cursor = self._connection.execute(
+                "SELECT date, rate FROM rates WHERE currency = ? ORDER BY date", (currency,)
+            )
+            for day, rate in cursor:
+                days.append(date_type.fromisoformat(day).toordinal())
+                rates.append(rate)
+            series = self._series[currency] = (days, rates)
+        return series
+
+    def rate_on(self, currency: str, day: Union[str, date_type]) -> Optional[float]:
+        """
+        Курс валюты на дату или на ближайшую предыдущую дату не старше max_age_days;
+        None, если такого курса нет. Для некорректной даты выбрасывает ValueError.
+        """
+        currency = currency.strip().upper()
+        if currency == "RUB":
+            return 1.0
+        try:
+            ordinal = _parse_date(day).toordinal()
+        except ValueError:
+            raise ValueError(f"Некорректная дата: {day!r}")
+        days, rates = self._load_series(currency)
+        position = bisect_right(days, ordinal)
+        if position == 0:
+            return None
+        if self.max_age_days is not None and ordinal - days[position - 1] > self.max_age_days:
+            return None
+        return float(rates[position - 1])
+
+
+def _parse_date(day: Union[str, date_type]) -> date_type:
+    """Дата из объекта date или из начала ISO строки (2019-08-26T10:50:58.294041)"""
+    if isinstance(day, date_type):
+        return day
+    return date_type.fromisoformat(str(day).strip()[:10])
@@ -1,19 +1,41 @@
 import re
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, List, Optional, Union
 
+from src.decorators import profile
+from src.description_index import DescriptionIndex
+from src.keyword_matcher import KeywordMatcher
+from src.transaction_table import MISSING_CODE, TransactionTable
 
-def filter_by_description(data: List[Dict], search: str) -> List[Dict]:
+
+@profile()
+def filter_by_description(
+        data: Union[List[Dict], TransactionTable], search: str, index: Optional[DescriptionIndex] = None
+) -> Union[List[Dict], TransactionTable]:
     """
     Фильтрует операции по строке поиска в описании.
     Использует регулярные выражения для поиска.
+    Для TransactionTable шаблон проверяется один раз на каждое различное описание.
+    Если передан DescriptionIndex, построенный по этим же данным, поиск идет по индексу.
     """
     if not data or not search:
-        return []
+        return data.take([]) if isinstance(data, TransactionTable) else []
+
+    if index is not None:
+        if index.size != len(data):
+            raise ValueError("Индекс построен по другому набору данных")
+        rows = index.search(search)
+        if isinstance(data, TransactionTable):
+            return data.take(rows)
+        return [data[row] for row in rows]
 
-    filtered_data = []
     pattern = re.compile(re.escape(search), re.IGNORECASE)
 
+    if isinstance(data, TransactionTable):
+        return data.take(data.indices_where_description(pattern.search))
+
+    filtered_data = []
+
     for operation in data:
         description = operation.get("description", "")
         if pattern.search(description):
@@ -22,33 +44,50 @@ def filter_by_description(data: List[Dict], search: str) -> List[Dict]:
     return filtered_data
 
 
-def count_by_category(data: List[Dict], categories: List[str]) -> Dict[str, int]:
+def compile_categories(categories: List[str]) -> KeywordMatcher:
+    """Строит автомат поиска категорий для повторного использования в count_by_category"""
+    return KeywordMatcher(categories)
+
+
+@profile()
+def count_by_category(
+        data: Union[List[Dict], TransactionTable], categories: Union[List[str], KeywordMatcher]
+) -> Dict[str, int]:
     """
     Считает количество операций по категориям.
-    Использует Counter для подсчета.
+    Все категории ищутся в описании за один проход автоматом Ахо-Корасик,
+    одинаковые описания просматриваются один раз. Вместо списка категорий
+    можно передать готовый автомат из compile_categories.
     """
+    matcher: Optional[KeywordMatcher] = None
+    if isinstance(categories, KeywordMatcher):
+        matcher = categories
+        keywords = categories.keywords
+    else:
+        keywords = categories
+
     if not data:
-        return {category: 0 for category in categories} if categories else {}
+        return {category: 0 for category in keywords} if keywords else {}
 
-    if not categories:
+    if not keywords:
         return {}
 
-    counter = Counter()
-
-    # Считаем операции по категориям
-    for operation in data:
-        description = operation.get("description", "").lower()
-
-        # Проверяем каждую категорию
-        for category in categories:
-            category_lower = category.lower()
-            if category_lower in description:
-                counter[category] += 1
+    if matcher is None:
+        matcher = KeywordMatcher(keywords)
 
-    # Добавляем категории с нулевым количеством
-    for category in categories:
-        if category not in counter:
-            counter[category] = 0
+    if isinstance(data, TransactionTable):
+        # Каждое различное описание учитывается столько раз, сколько встречается в таблице
+        frequency = Counter(data.description_codes)
+        descriptions = data.descriptions.values
+        counts = matcher.count(
+            (descriptions[code] if code != MISSING_CODE else "" for code in frequency),
+            frequency.values(),
+        )
+    else:
+        counts = matcher.count(operation.get("description") or "" for operation in data)
 
-    return dict(counter)
+    counter: Dict[str, int] = {}
+    for category, count in zip(keywords, counts):
+        counter[category] = counter.get(category, 0) + count
 
+    return counter
@@ -0,0 +1,337 @@
+import heapq
+from array import array
+from datetime import datetime, timedelta, timezone
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.amounts import AMOUNT_FIELD, format_minor_units, transaction_minor_units
+
+MISSING_ID = -1
+MISSING_CODE = -1
+
+# Статусы получают постоянные коды 0, 1, 2 в любой таблице
+KNOWN_STATES = ("EXECUTED", "CANCELED", "PENDING")
+
+MISSING_DATE = -(2 ** 63)
+MISSING_AMOUNT = -(2 ** 63)
+_EPOCH = datetime(1970, 1, 1)
+
+# Поля, которые хранятся в столбцах таблицы; остальные поля транзакции сохраняются как есть
+COLUMN_FIELDS = frozenset((
+    "id", "state", "date", "operationAmount", "amount", "currency", "currency_code", "currency_name",
+    "description", "from", "to", AMOUNT_FIELD,
+))
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class StringDictionary:
+    """Словарное кодирование строк: каждое различное значение хранится один раз"""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    @classmethod
+    def from_values(cls, values: Iterable[Any]) -> "StringDictionary":
+        """Словарь, в котором значения получают коды по порядку"""
+        dictionary = cls()
+        for value in values:
+            dictionary.encode(value)
+        return dictionary
+
+    def encode(self, value: Any) -> int:
+        """Возвращает код значения, добавляя его в словарь при первом появлении"""
+        if value is None:
+            return MISSING_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Any) -> int:
+        """Возвращает код значения без добавления или MISSING_CODE"""
+        return self._codes.get(value, MISSING_CODE)
+
+    def decode(self, code: int) -> Any:
+        return None if code == MISSING_CODE else self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+def _parse_id(value: Any) -> int:
+    if value is None or isinstance(value, bool):
+        return MISSING_ID
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return MISSING_ID
+
+
+def parse_date_key(date: Any) -> int:
+    """
+    Переводит ISO дату в число микросекунд от начала эпохи.
+    Поддерживает форматы JSON (2019-08-26T10:50:58.294041) и CSV (2023-09-05T11:30:32Z),
+    даты без часового пояса считаются UTC. Для пустых и некорректных дат возвращает MISSING_DATE.
+    """
+    if not date or not isinstance(date, str):
+        return MISSING_DATE
+    try:
+        parsed = datetime.fromisoformat(date.strip())
+    except ValueError:
+        return MISSING_DATE
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def extract_currency(transaction: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """Достает код и название валюты из вложенного operationAmount или плоских полей CSV/XLSX"""
+    op_amount = transaction.get("operationAmount")
+    if isinstance(op_amount, dict):
+        currency = op_amount.get("currency")
+        if isinstance(currency, dict):
+            return currency.get("code"), currency.get("name")
+        return None, None
+    code = transaction.get("currency_code", transaction.get("currency"))
+    return code, transaction.get("currency_name", code)
+
+
+class TransactionTable:
+    """
+    Колоночное хранилище транзакций.
+    Идентификаторы и суммы хранятся в массивах array (сумма - в
+    amount_units, целым числом минимальных единиц), строковые поля
+    (статус, валюта, описание, счета) кодируются словарем и хранятся
+    как массивы целых кодов. Поля вне COLUMN_FIELDS хранятся словарем
+    extras для строки, у которой они есть.
+    """
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.state_codes = array("h")
+        self.dates: List[Optional[str]] = []
+        self.date_keys = array("q")
+        self.amount_units = array("q")
+        self.currency_codes = array("h")
+        self.description_codes = array("i")
+        self.from_codes = array("i")
+        self.to_codes = array("i")
+        self.extras: List[Optional[Dict]] = []
+
+        self.states = StringDictionary()
+        self.currencies = StringDictionary()
+        self.descriptions = StringDictionary()
+        self.accounts = StringDictionary()
+
+        for state in KNOWN_STATES:
+            self.states.encode(state)
+
+        self._state_index: Dict[int, array] = {}
+        self._date_order: Dict[bool, array] = {}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Dict]) -> "TransactionTable":
+        """Строит таблицу из списка или потока словарей транзакций"""
+        table = cls()
+        for transaction in transactions:
+            if isinstance(transaction, dict):
+                table.append(transaction)
+        return table
+
+    def append(self, transaction: Dict) -> None:
+        """Добавляет одну транзакцию в конец таблицы"""
+        state = transaction.get("state")
+        if isinstance(state, str):
+            state = state.strip().upper() or None
+
+        date = transaction.get("date")
+
+        self.ids.append(_parse_id(transaction.get("id")))
+        self.state_codes.append(self.states.encode(state))
+        self.dates.append(date if isinstance(date, str) else None)
+        self.date_keys.append(parse_date_key(date))
+        units = transaction_minor_units(transaction)
+        self.amount_units.append(MISSING_AMOUNT if units is None else units)
+        self.currency_codes.append(self.currencies.encode(extract_currency(transaction)))
+        self.description_codes.append(self.descriptions.encode(transaction.get("description")))
+        self.from_codes.append(self.accounts.encode(transaction.get("from")))
+        self.to_codes.append(self.accounts.encode(transaction.get("to")))
+        self.extras.append(
+            None if COLUMN_FIELDS.issuperset(transaction)
+            else {key: value for key, value in transaction.items() if key not in COLUMN_FIELDS}
+        )
+        if self._state_index:
+            self._state_index = {}
+        if self._date_order:
+            self._date_order = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getitem__(self, index: int) -> Dict:
+        return self.row(index)
+
+    def row(self, index: int) -> Dict:
+        """Собирает словарь транзакции в нормализованном формате"""
+        currency = self.currencies.decode(self.currency_codes[index])
+        code, name = currency if currency is not None else (None, None)
+
+        row: Dict[str, Any] = {}
+        if self.ids[index] != MISSING_ID:
+            row["id"] = self.ids[index]
+        head = (
+            ("state", self.states.decode(self.state_codes[index])),
+            ("date", self.dates[index]),
+        )
+        for key, value in head:
+            if value is not None:
+                row[key] = value
+        units = self.amount_units[index]
+        row["operationAmount"] = {
+            "amount": None if units == MISSING_AMOUNT else format_minor_units(units),
+            "currency": {"name": name, "code": code},
+        }
+        tail = (
+            ("description", self.descriptions.decode(self.description_codes[index])),
+            ("from", self.accounts.decode(self.from_codes[index])),
+            ("to", self.accounts.decode(self.to_codes[index])),
+        )
+        for key, value in tail:
+            if value is not None:
+                row[key] = value
+        if units != MISSING_AMOUNT:
+            row[AMOUNT_FIELD] = units
+        extra = self.extras[index]
+        if extra:
+            row.update(extra)
+        return row
+
+    def to_list(self) -> List[Dict]:
+        return list(self)
+
+    def take(self, indices: Sequence[int]) -> "TransactionTable":
+        """Возвращает новую таблицу из строк с указанными номерами; словари значений общие"""
+        table = TransactionTable.__new__(TransactionTable)
+        table.ids = array("q", [self.ids[i] for i in indices])
+        table.state_codes = array("h", [self.state_codes[i] for i in indices])
+        table.dates = [self.dates[i] for i in indices]
+        table.date_keys = array("q", [self.date_keys[i] for i in indices])
+        table.amount_units = array("q", [self.amount_units[i] for i in indices])
+        table.currency_codes = array("h", [self.currency_codes[i] for i in indices])
+        table.description_codes = array("i", [self.description_codes[i] for i in indices])
+        table.from_codes = array("i", [self.from_codes[i] for i in indices])
+        table.to_codes = array("i", [self.to_codes[i] for i in indices])
+        table.extras = [self.extras[i] for i in indices]
+
+        table.states = self.states
+        table.currencies = self.currencies
+        table.descriptions = self.descriptions
+        table.accounts = self.accounts
+        table._state_index = {}
+        table._date_order = {}
+        return table
+
+    def indices_where_state(self, state: str) -> array:
+        """
+        Номера строк с заданным статусом.
+        Сравниваются только целые коды, строка статуса нормализуется один раз
+        на запрос. Номера кешируются до следующего append, поэтому
+        повторная фильтрация по тому же статусу не сканирует столбец;
+        вызывающий получает копию, и ее изменение не портит кеш.
+        """
+        code = self.states.lookup(state.upper().strip())
+        if code == MISSING_CODE:
+            return array("q")
+        indices = self._state_index.get(code)
+        if indices is None:
+            indices = array("q", compress(range(len(self.state_codes)), map(code.__eq__, self.state_codes)))
+            self._state_index[code] = indices
+        return array("q", indices)
+
+    def sorted_indices(self, descending: bool = True) -> array:
+        """
+        Перестановка строк по дате; строки без даты идут в конце.
+        Сортировка выполняется один раз, перестановка для обратного порядка
+        получается разворотом за O(n) с сохранением исходного порядка равных дат.
+        Обе перестановки кешируются до следующего append.
+        """
+        order = self._date_order.get(descending)
+        if order is not None:
+            return order
+
+        keys = self.date_keys
+        opposite = self._date_order.get(not descending)
+        if opposite is None:
+            dated = [i for i, key in enumerate(keys) if key != MISSING_DATE]
+            dated.sort(key=keys.__getitem__, reverse=descending)
+        else:
+            dated = list(opposite[:len(opposite) - self._missing_date_count()])
+            dated.reverse()
+            _restore_tie_order(dated, keys)
+
+        dated.extend(i for i, key in enumerate(keys) if key == MISSING_DATE)
+        order = array("q", dated)
+        self._date_order[descending] = order
+        return order
+
+    def top_indices(self, descending: bool, count: int) -> array:
+        """
+        Первые count строк перестановки sorted_indices.
+        Если перестановка уже в кеше, берется ее начало, иначе строки
+        отбираются через кучу за O(n log count).
+        """
+        order = self._date_order.get(descending)
+        if order is not None:
+            return order[:count]
+
+        keys = self.date_keys
+        dated = (i for i, key in enumerate(keys) if key != MISSING_DATE)
+        select = heapq.nlargest if descending else heapq.nsmallest
+        top = select(count, dated, key=keys.__getitem__)
+        if len(top) < count:
+            missing = (i for i, key in enumerate(keys) if key == MISSING_DATE)
+            top.extend(i for _, i in zip(range(count - len(top)), missing))
+        return array("q", top)
+
+    def _missing_date_count(self) -> int:
+        return self.date_keys.count(MISSING_DATE)
+
+    def indices_where_currency(self, currency: str) -> List[int]:
+        """Номера строк с заданным кодом валюты"""
+        codes = {i for i, (code, _) in enumerate(self.currencies.values) if code == currency}
+        if not codes:
+            return []
+        return [i for i, value in enumerate(self.currency_codes) if value in codes]
+
+    def indices_where_description(self, matches: Any) -> List[int]:
+        """
+        Номера строк, описание которых удовлетворяет предикату.
+        Предикат вызывается один раз для каждого различного описания.
+        """
+        codes = {i for i, description in enumerate(self.descriptions.values) if matches(description)}
+        if not codes:
+            return []
+        return [i for i, value in enumerate(self.description_codes) if value in codes]
+
+
+def _restore_tie_order(indices: List[int], keys: array) -> None:
+    """После разворота возвращает строкам с одинаковой датой исходный порядок"""
+    start = 0
+    total = len(indices)
+    while start < total:
+        end = start + 1
+        key = keys[indices[start]]
+        while end < total and keys[indices[end]] == key:
+            end += 1
+        if end - start > 1:
+            indices[start:end] = indices[start:end][::-1]
+        start = end
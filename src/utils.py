@@ -1,28 +1,23 @@
 import json
-import logging
-import os
-from typing import Dict, List
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Union
 
-if not os.path.exists("logs"):
-    os.makedirs("logs")
+from src.amounts import AMOUNT_FIELD, parse_minor_units
+from src.decorators import profile
+from src.logging_config import get_logger
 
-logger = logging.getLogger("utils")
-logger.setLevel(logging.DEBUG)
+logger = get_logger("utils")
 
-file_handler = logging.FileHandler("logs/utils.log", mode="w", encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
 
-file_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-file_handler.setFormatter(file_formatter)
-
-logger.addHandler(file_handler)
-logger.propagate = False  # Отключаем распространение логов
-
-
-def transactions_loaded(file_path: str) -> List[Dict]:
-    """Загружает транзакции из JSON-файла"""
+def transactions_loaded(file_path: str, stream: bool = False) -> Union[List[Dict], Iterator[Dict]]:
+    """
+    Загружает транзакции из JSON-файла.
+    При stream=True возвращает генератор, читающий файл по одной транзакции.
+    """
     try:
-        from src.file_loaders import load_json
+        from src.file_loaders import iter_json, load_json
+        if stream:
+            return _guarded_stream(iter_json(file_path), file_path)
         return load_json(file_path)
     except (FileNotFoundError, ValueError, TypeError, PermissionError, json.JSONDecodeError) as e:
         # Логируем ошибку, но не падаем
@@ -37,23 +32,79 @@ def transactions_loaded(file_path: str) -> List[Dict]:
         return []
 
 
-def normalize_transaction_data(transactions: List[Dict]) -> List[Dict]:
+def _guarded_stream(transactions: Iterator[Dict], file_path: str) -> Iterator[Dict]:
+    """Прерывает поток при ошибке чтения так же, как transactions_loaded возвращает []"""
+    try:
+        yield from transactions
+    except (ValueError, TypeError, PermissionError) as e:
+        logger.error(f"Ошибка при загрузке транзакций из {file_path}: {type(e).__name__} - {e}")
+
+
+DEFAULT_CURRENCY = ("RUB", "руб.")
+
+
+def _currency(code: str, name: str) -> Dict[str, str]:
     """
-    Нормализует структуру транзакций из разных источников
-    к единому формату.
+    Новый словарь валюты для записи. Строки кода и названия интернируются
+    (sys.intern), поэтому одинаковые значения хранятся один раз, а словари
+    у записей свои и изменение одной записи не затрагивает другие.
     """
-    if not isinstance(transactions, list):
-        raise TypeError("transactions должен быть списком")
+    return {"code": sys.intern(code), "name": sys.intern(name)}
 
-    normalized = []
+
+def _intern_operation_amount(op_amount: Dict) -> None:
+    """Интернирует код и название во вложенном словаре валюты"""
+    currency = op_amount.get("currency")
+    if isinstance(currency, dict):
+        code = currency.get("code")
+        name = currency.get("name")
+        if type(code) is str:
+            currency["code"] = sys.intern(code)
+        if type(name) is str:
+            currency["name"] = sys.intern(name)
+
+
+def _parse_operation_amount(op_amount: str) -> Any:
+    """Разбирает operationAmount, записанный в CSV строкой JSON (в том числе с одинарными кавычками)"""
+    try:
+        parsed = json.loads(op_amount.replace("'", '"') if "'" in op_amount else op_amount)
+    except json.JSONDecodeError:
+        # Если не JSON, создаем простую структуру
+        return {"amount": "0", "currency": _currency(*DEFAULT_CURRENCY)}
+    if isinstance(parsed, dict):
+        _intern_operation_amount(parsed)
+    return parsed
+
+
+def iter_normalized(transactions: Iterable[Dict], in_place: bool = False) -> Iterator[Dict]:
+    """
+    Потоково нормализует транзакции из разных источников к единому формату.
+    Подключается к загрузчикам как стадия генератора: iter_normalized(iter_json(path)).
+    При in_place=True записи изменяются на месте без копирования - так стоит
+    делать, когда данные принадлежат вызывающему (только что прочитаны из файла).
+    Строки кода и названия валюты интернируются и хранятся один раз.
+    Сумма разбирается один раз и добавляется в поле amount_minor целым числом
+    минимальных единиц (см. src.amounts); дальше ее читают без разбора строки.
+    """
+    # Строка и словарь итерируемы, но перебираются символами и ключами, а не записями
+    if isinstance(transactions, (str, bytes, dict)) or not isinstance(transactions, Iterable):
+        raise TypeError("transactions должен быть списком или другой коллекцией записей")
+
+    return _normalize_stream(transactions, in_place)
+
+
+def _normalize_stream(transactions: Iterable[Dict], in_place: bool) -> Iterator[Dict]:
+    normalized = 0
+    total = 0
 
     for i, transaction in enumerate(transactions):
+        total += 1
         if not isinstance(transaction, dict):
             logger.warning(f"Транзакция {i} не является словарем, пропускаем")
             continue
 
         try:
-            normalized_transaction = transaction.copy()
+            normalized_transaction = transaction if in_place else transaction.copy()
 
             # Нормализация поля state - удаляем пустые значения
             if "state" in normalized_transaction:
@@ -65,39 +116,46 @@ def normalize_transaction_data(transactions: List[Dict]) -> List[Dict]:
                     del normalized_transaction["state"]
 
             # Нормализация поля operationAmount
-            if "operationAmount" not in normalized_transaction or not normalized_transaction["operationAmount"]:
+            op_amount = normalized_transaction.get("operationAmount")
+            if not op_amount:
                 amount = normalized_transaction.get("amount", "0")
-                currency_code = normalized_transaction.get("currency", "RUB")
-                currency_name = "руб." if str(currency_code).upper() == "RUB" else str(currency_code)
+                currency_code = str(normalized_transaction.get("currency", "RUB"))
+                currency_name = "руб." if currency_code.upper() == "RUB" else currency_code
 
                 normalized_transaction["operationAmount"] = {
                     "amount": str(amount),
-                    "currency": {
-                        "code": str(currency_code),
-                        "name": currency_name
-                    }
+                    "currency": _currency(currency_code, currency_name)
                 }
-
-            # Убедимся, что operationAmount - это словарь
-            op_amount = normalized_transaction.get("operationAmount")
-            if isinstance(op_amount, str):
-                try:
-                    # Пытаемся распарсить как JSON
-                    normalized_transaction["operationAmount"] = json.loads(
-                        op_amount.replace("'", '"')
-                    )
-                except json.JSONDecodeError:
-                    # Если не JSON, создаем простую структуру
-                    normalized_transaction["operationAmount"] = {
-                        "amount": "0",
-                        "currency": {"code": "RUB", "name": "руб."}
-                    }
-
-            normalized.append(normalized_transaction)
+            elif isinstance(op_amount, str):
+                # Убедимся, что operationAmount - это словарь
+                normalized_transaction["operationAmount"] = _parse_operation_amount(op_amount)
+            elif in_place and isinstance(op_amount, dict):
+                _intern_operation_amount(op_amount)
+
+            # Загрузчик XLSX заполняет amount_minor сам, из значения ячейки
+            if normalized_transaction.get(AMOUNT_FIELD) is None:
+                op_amount = normalized_transaction["operationAmount"]
+                normalized_transaction[AMOUNT_FIELD] = parse_minor_units(
+                    op_amount.get("amount") if isinstance(op_amount, dict) else None
+                )
+
+            normalized += 1
+            yield normalized_transaction
 
         except (KeyError, TypeError, ValueError) as e:
             logger.warning(f"Ошибка при нормализации транзакции {i}: {e}")
             continue
 
-    logger.info(f"Успешно нормализовано {len(normalized)} из {len(transactions)} транзакций")
-    return normalized
\ No newline at end of file
+    logger.info(f"Успешно нормализовано {normalized} из {total} транзакций")
+
+
+@profile()
+def normalize_transaction_data(transactions: Iterable[Dict], in_place: bool = False) -> List[Dict]:
+    """
+    Нормализует структуру транзакций из разных источников
+    к единому формату.
+    Принимает список или итератор (например, iter_json), чтобы не держать
+    в памяти исходные данные вместе с нормализованными. При in_place=True
+    записи не копируются, а изменяются на месте.
+    """
+    return list(iter_normalized(transactions, in_place))
@@ -1,8 +1,13 @@
+from functools import lru_cache
+from typing import Dict, Optional
+
 from src.masks import get_mask_account, get_mask_card_number
 
+# Размер кешей: число различных карт/счетов и дат, для которых хранится результат
+WIDGET_CACHE_SIZE = 65536
 
-def mask_account_card(number_of_card_or_account: str) -> str:
-    """Функция маскирует номер карты или счета"""
+
+def _mask_account_card(number_of_card_or_account: str) -> str:
     if number_of_card_or_account == "":
         raise ValueError("Неверный формат ввода")
     if number_of_card_or_account[:4] == "Счет":
@@ -11,10 +16,56 @@ def mask_account_card(number_of_card_or_account: str) -> str:
         return f"{number_of_card_or_account[-17::-1][-1::-1]}{get_mask_card_number(number_of_card_or_account[-16:])}"
 
 
-def get_date(date: str) -> str:
-    """Функция преобразует дату в формат 'ДД.ММ.ГГГГ'"""
+def _get_date(date: str) -> str:
     if len(date[:11]) != 11:
         raise ValueError("Неверный формат даты")
     if date[0] == "0" or date[5:7] == "00" or date[8:10] == "00" or date[5:7] > "12" or date[8:10] > "31":
         raise ValueError("Неверный формат даты")
     return f"{date[8:10]}.{date[5:7]}.{date[:4]}"
+
+
+_cached_mask_account_card = lru_cache(maxsize=WIDGET_CACHE_SIZE)(_mask_account_card)
+_cached_get_date = lru_cache(maxsize=WIDGET_CACHE_SIZE)(_get_date)
+
+
+def mask_account_card(number_of_card_or_account: str) -> str:
+    """
+    Функция маскирует номер карты или счета.
+    Результат для каждой строки кешируется (LRU), поэтому повторяющиеся
+    карты и счета маскируются один раз.
+    """
+    if type(number_of_card_or_account) is str:
+        return _cached_mask_account_card(number_of_card_or_account)
+    return _mask_account_card(number_of_card_or_account)
+
+
+def get_date(date: str) -> str:
+    """Функция преобразует дату в формат 'ДД.ММ.ГГГГ'"""
+    if type(date) is str:
+        return _cached_get_date(date)
+    return _get_date(date)
+
+
+def widget_cache_stats() -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Размер, попадания, промахи и доля попаданий кешей mask_account_card и get_date.
+    maxsize равен None для кеша без ограничения размера.
+    """
+    stats: Dict[str, Dict[str, Optional[float]]] = {}
+    for name, cached in (("mask_account_card", _cached_mask_account_card), ("get_date", _cached_get_date)):
+        info = cached.cache_info()
+        requests = info.hits + info.misses
+        stats[name] = {
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / requests if requests else 0.0,
+        }
+    return stats
+
+
+def clear_widget_caches() -> None:
+    """Очищает кеши маскирования и форматирования дат"""
+    _cached_mask_account_card.cache_clear()
+    _cached_get_date.cache_clear()
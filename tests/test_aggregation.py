@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+import pytest
+
+from benchmarks.synthetic import generate_operations
+from src.aggregation import GroupStats, aggregate
+from src.transaction_table import TransactionTable
+from src.utils import normalize_transaction_data
+
+
+@pytest.fixture
+def operations():
+    return normalize_transaction_data([
+        {"state": "EXECUTED", "date": "2019-08-26T10:50:58", "amount": "100.10", "currency": "RUB", "from": "A"},
+        {"state": "EXECUTED", "date": "2019-08-27T10:00:00", "amount": "0.20", "currency": "RUB", "from": "B"},
+        {"state": "CANCELED", "date": "2019-09-01T00:00:00", "amount": "5", "currency": "USD", "from": "A"},
+        {"state": "EXECUTED", "date": "2019-09-02T00:00:00", "amount": "n/a", "currency": "USD"},
+    ])
+
+
+def test_aggregate_by_state_and_currency(operations):
+    result = aggregate(operations, ["state", "currency"])
+
+    assert list(result) == [("EXECUTED", "RUB"), ("CANCELED", "USD"), ("EXECUTED", "USD")]
+    assert result[("EXECUTED", "RUB")] == GroupStats(
+        2, Decimal("100.30"), Decimal("0.20"), Decimal("100.10"), Decimal("50.15")
+    )
+    # Операция без суммы учитывается в operations, но не в суммах
+    assert result[("EXECUTED", "USD")] == GroupStats(1, None, None, None, None)
+
+
+def test_aggregate_by_currency_and_calendar(operations):
+    totals = aggregate(operations)
+    assert list(totals) == [("RUB",), ("USD",)]
+    assert totals[("RUB",)].operations == 2
+    assert totals[("RUB",)].sum == Decimal("100.30")
+
+    assert {key: stats.operations for key, stats in aggregate(operations, ("currency", "month")).items()} == {
+        ("RUB", "2019-08"): 2, ("USD", "2019-09"): 2,
+    }
+    assert len(aggregate(operations, ("currency", "day", "from"))) == 4
+
+
+def test_calendar_buckets_use_utc_dates():
+    rows = normalize_transaction_data([
+        {"date": "2019-08-31T23:30:00", "amount": "1", "currency": "RUB"},
+        {"date": "2019-09-01T01:30:00+03:00", "amount": "2", "currency": "RUB"},
+        {"date": "2019-08-31T22:00:00Z", "amount": "3", "currency": "RUB"},
+        {"date": "2019-09-01T00:00:00Z", "amount": "4", "currency": "RUB"},
+        {"date": "не дата", "amount": "5", "currency": "RUB"},
+    ])
+    table = TransactionTable.from_transactions(rows)
+
+    for data in (rows, table):
+        assert {key: stats.operations for key, stats in aggregate(data, ("currency", "day")).items()} == {
+            ("RUB", "2019-08-31"): 3, ("RUB", "2019-09-01"): 1, ("RUB", None): 1,
+        }
+        assert {key: stats.operations for key, stats in aggregate(data, ("month", "currency")).items()} == {
+            ("2019-08", "RUB"): 3, ("2019-09", "RUB"): 1, (None, "RUB"): 1,
+        }
+
+
+def test_table_path_matches_rows():
+    rows = normalize_transaction_data(list(generate_operations(2000, seed=3)))
+    table = TransactionTable.from_transactions(rows)
+
+    groupings = [
+        "currency", ("state", "currency"), ("currency", "month"), ("currency", "from"), ("to", "currency", "day"),
+    ]
+    for by in groupings:
+        assert aggregate(table, by) == aggregate(rows, by)
+
+
+def test_table_merges_currency_names():
+    table = TransactionTable.from_transactions([
+        {"amount": "1", "currency_code": "EUR", "currency_name": "Euro"},
+        {"amount": "2", "currency_code": "EUR", "currency_name": "EUR"},
+    ])
+
+    assert aggregate(table, "currency") == {("EUR",): GroupStats(
+        2, Decimal("3.00"), Decimal("1.00"), Decimal("2.00"), Decimal("1.50")
+    )}
+
+
+def test_aggregate_unknown_field(operations):
+    with pytest.raises(ValueError, match="Неизвестные поля группировки"):
+        aggregate(operations, ["amount", "currency"])
+
+
+@pytest.mark.parametrize("by", [(), "state", ("day", "from")])
+def test_aggregate_requires_currency(operations, by):
+    with pytest.raises(ValueError, match="currency"):
+        aggregate(operations, by)
@@ -0,0 +1,68 @@
+from decimal import Decimal
+
+import pytest
+
+from src.amounts import format_minor_units, parse_minor_units, to_decimal, transaction_minor_units
+from src.transaction_table import TransactionTable
+from src.utils import normalize_transaction_data
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("31957.58", 3195758),
+    (" 8221.37 ", 822137),
+    ("1,000.50", 100050),
+    ("1 000,5", 100050),
+    ("1,000", 100000),
+    ("1,000,000", 100000000),
+    ("1000,50", 100050),
+    ("1,00,0", None),
+    ("-5.005", -500),
+    (16210, 1621000),
+    (69857.86, 6985786),
+    (0.1 + 0.2, 30),
+    (Decimal("2.345"), 234),
+    ("abc", None),
+    ("", None),
+    (None, None),
+    (True, None),
+    (float("nan"), None),
+])
+def test_parse_minor_units(value, expected):
+    assert parse_minor_units(value) == expected
+
+
+def test_format_and_decimal():
+    assert format_minor_units(3195758) == "31957.58"
+    assert format_minor_units(-5) == "-0.05"
+    assert to_decimal(3195758) == Decimal("31957.58")
+
+
+def test_normalization_adds_exact_amount():
+    transactions = [
+        {"id": 1, "operationAmount": {"amount": "0.10", "currency": {"code": "RUB", "name": "руб."}}},
+        {"id": 2, "amount": 0.2, "currency": "USD"},
+        {"id": 3, "operationAmount": "invalid json"},
+        {"id": 4, "amount": "n/a"},
+    ]
+
+    result = normalize_transaction_data(transactions)
+
+    assert [transaction["amount_minor"] for transaction in result] == [10, 20, 0, None]
+    assert sum(transaction["amount_minor"] for transaction in result[:2]) == 30
+
+
+def test_transaction_minor_units_prefers_parsed_field():
+    assert transaction_minor_units({"amount_minor": 7, "amount": "100"}) == 7
+    assert transaction_minor_units({"amount": "1.5"}) == 150
+    assert transaction_minor_units({"operationAmount": {"amount": "2"}}) == 200
+
+
+def test_table_keeps_exact_amount_column():
+    table = TransactionTable.from_transactions([{"id": 1, "amount": 69857.86}, {"id": 2}])
+
+    assert list(table.amount_units)[0] == 6985786
+    assert table[0]["amount_minor"] == 6985786
+    assert "amount_minor" not in table[1]
+    assert table.take([0])[0]["amount_minor"] == 6985786
+    assert table[0]["operationAmount"]["amount"] == "69857.86"
+    assert table[1]["operationAmount"]["amount"] is None
@@ -0,0 +1,104 @@
+import json
+
+import pytest
+
+from benchmarks.regression import BASELINE_PATH, HOST_MISMATCH, compare, format_report, host_mismatch, timing_stats
+from benchmarks.regression import main as regression_main
+from benchmarks.suite import BENCHMARKS, host_info, run_benchmarks
+from benchmarks.synthetic import XLSX_MAX_ROWS, generate_operations, write_csv, write_json, write_xlsx
+from src.file_loaders import load_csv, load_json
+
+
+def test_synthetic_files_match_data_shapes(tmp_path):
+    operations = load_json(str(write_json(tmp_path / "operations.json", 50, seed=1)))
+    rows = load_csv(str(write_csv(tmp_path / "transactions.csv", 50, seed=1)))
+
+    assert operations == list(generate_operations(50, seed=1))
+    assert set(operations[0]) >= {"id", "state", "date", "operationAmount", "description", "to"}
+    assert len({operation["id"] for operation in operations}) == 50
+    assert [row["id"] for row in rows] == [operation["id"] for operation in operations]
+    assert rows[0]["currency_code"] == operations[0]["operationAmount"]["currency"]["code"]
+    assert any(row["from"].split()[-1].isdigit() and len(row["from"].split()[-1]) == 16 for row in rows if row["from"])
+
+
+def test_write_xlsx_limit(tmp_path):
+    with pytest.raises(ValueError):
+        write_xlsx(tmp_path / "too_big.xlsx", XLSX_MAX_ROWS + 1)
+
+
+def test_run_benchmarks_report():
+    names = [name for name in BENCHMARKS if name != "file_loaders.load_xlsx"]
+
+    report = run_benchmarks(sizes=[200], names=names, repeat=2)
+
+    assert json.loads(json.dumps(report))["meta"]["repeat"] == 2
+    assert report["meta"]["host"] == host_info()
+    assert [result["name"] for result in report["results"]] == names
+    for result in report["results"]:
+        assert len(result["timings"]) == 2
+        assert result["peak_bytes"] > 0
+        assert result["rows_per_second"] > 0
+
+    with pytest.raises(ValueError):
+        run_benchmarks(sizes=[10], names=["unknown"])
+
+
+def _report(timings, peak=1000, host=None):
+    return {"meta": {"host": host or {"machine": "x86_64", "cpu_count": 8}},
+            "results": [{"name": "processing.sort_by_date", "size": 100, "timings": timings, "peak_bytes": peak}]}
+
+
+def test_timing_stats():
+    assert timing_stats([3.0]) == (3.0, 3.0, 3.0)
+    stats = timing_stats([1.0, 2.0, 3.0, 4.0, 100.0])
+    assert stats.median == 3.0
+    assert stats.iqr == 2.0
+
+
+def test_compare_detects_regressions_beyond_noise():
+    baseline = _report([1.0, 1.1, 0.9, 1.0, 1.05])
+
+    assert compare(baseline, _report([1.0, 0.95, 1.1, 1.02, 0.99])) == []
+    # Медиана выросла, но разброс замеров перекрывается с базовым - шум
+    assert compare(baseline, _report([1.0, 1.5, 1.05, 1.6, 1.4]), tolerance=0.2) == []
+
+    findings = compare(baseline, _report([1.5, 1.6, 1.55, 1.7, 1.5], peak=1500), tolerance=0.2)
+    assert [finding.metric for finding in findings] == ["median_seconds", "peak_bytes"]
+    assert round(findings[0].change, 2) == 0.55
+    assert "Регрессия processing.sort_by_date" in format_report(baseline, _report([1.6]), findings)
+
+
+def test_regression_main_exit_code(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report([1.0, 1.0, 1.0])), encoding="utf-8")
+
+    current.write_text(json.dumps(_report([1.0, 1.1, 0.9])), encoding="utf-8")
+    assert regression_main(["--baseline", str(baseline), "--current", str(current)]) == 0
+
+    current.write_text(json.dumps(_report([2.0, 2.1, 1.9])), encoding="utf-8")
+    assert regression_main(["--baseline", str(baseline), "--current", str(current)]) == 1
+
+
+def test_regression_main_refuses_other_host(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_report([1.0, 1.0, 1.0])), encoding="utf-8")
+    other_host = {"machine": "arm64", "cpu_count": 8}
+    current.write_text(json.dumps(_report([2.0, 2.1, 1.9], host=other_host)), encoding="utf-8")
+
+    assert host_mismatch(_report([1.0]), _report([1.0], host=other_host)) == ["machine"]
+    assert regression_main(["--baseline", str(baseline), "--current", str(current)]) == HOST_MISMATCH
+    assert "machine" in capsys.readouterr().err
+
+    arguments = ["--baseline", str(baseline), "--current", str(current), "--allow-host-mismatch"]
+    assert regression_main(arguments) == 1
+    assert "Предупреждение" in capsys.readouterr().err
+
+
+def test_committed_baseline_covers_hot_paths():
+    with open(BASELINE_PATH, encoding="utf-8") as file:
+        baseline = json.load(file)
+    assert {result["name"] for result in baseline["results"]} == set(BENCHMARKS)
+    assert len({result["size"] for result in baseline["results"]}) > 1
+    assert set(baseline["meta"]["host"]) == set(host_info())
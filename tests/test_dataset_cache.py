@@ -0,0 +1,170 @@
+import json
+import math
+import os
+
+import pytest
+
+from benchmarks.synthetic import generate_operations
+from src import file_loaders
+from src.dataset_cache import _read_header, MAGIC, read_dataset, read_table, write_dataset, write_table
+from src.file_loaders import load_cached, load_table
+from src.transaction_table import TransactionTable
+from src.utils import normalize_transaction_data
+
+
+@pytest.fixture
+def fingerprint():
+    return {"path": "data.json", "size": 1, "mtime_ns": 1, "loader_version": 1}
+
+
+def test_round_trip_preserves_rows(tmp_path, fingerprint):
+    rows = [
+        {
+            "id": 1, "state": "EXECUTED",
+            "operationAmount": {"amount": "10.5", "currency": {"name": "руб.", "code": "RUB"}},
+        },
+        {"id": 2, "amount": 1.0, "flag": True, "tags": ["a", "b"], "extra": {}, "missing": None},
+        {"id": 3, "amount": 1, "flag": 1, "limit": math.inf, "operationAmount": {"amount": "7"}},
+    ]
+    cache_path = tmp_path / "data.json.cache"
+
+    write_dataset(cache_path, rows, fingerprint)
+    loaded = read_dataset(cache_path, fingerprint)
+
+    assert loaded == rows
+    assert [type(row.get("amount")) for row in loaded] == [type(None), float, int]
+    assert type(loaded[2]["flag"]) is int
+    assert list(loaded[0]) == list(rows[0])
+    # Вложенные словари не общие для разных записей
+    loaded[0]["operationAmount"]["currency"]["code"] = "USD"
+    assert read_dataset(cache_path, fingerprint)[0]["operationAmount"]["currency"]["code"] == "RUB"
+
+
+def test_columns_encoding_by_cardinality(tmp_path, fingerprint):
+    rows = [
+        {"id": i, "state": "EXECUTED" if i % 2 else "CANCELED", "description": f"Операция {i}", "rate": i / 2}
+        for i in range(100)
+    ]
+    rows[5]["flag"] = True
+    cache_path = tmp_path / "data.json.cache"
+
+    write_dataset(cache_path, rows, fingerprint)
+    header, _, _ = _read_header(cache_path, MAGIC, fingerprint)
+
+    kinds = {tuple(column["path"]): (column["kind"], column["sparse"]) for column in header["columns"]}
+    assert kinds == {
+        ("id",): ("int", False),
+        ("state",): ("codes", False),
+        ("description",): ("json", False),
+        ("rate",): ("float", False),
+        ("flag",): ("json", True),
+    }
+    assert read_dataset(cache_path, fingerprint) == rows
+
+
+def test_read_rejects_stale_or_corrupt_cache(tmp_path, fingerprint):
+    cache_path = tmp_path / "data.json.cache"
+    assert read_dataset(cache_path, fingerprint) is None
+
+    write_dataset(cache_path, [{"id": 1}], fingerprint)
+    assert read_dataset(cache_path, dict(fingerprint, size=2)) is None
+
+    cache_path.write_bytes(cache_path.read_bytes()[:-1])
+    assert read_dataset(cache_path, fingerprint) is None
+
+
+def test_load_cached_uses_cache_until_source_changes(tmp_path, monkeypatch):
+    source = tmp_path / "operations.json"
+    source.write_text(json.dumps([{"id": 1, "state": "executed", "amount": "5", "currency": "USD"}]), encoding="utf-8")
+
+    first = load_cached(str(source))
+    assert first == [{
+        "id": 1, "state": "EXECUTED", "amount": "5", "currency": "USD",
+        "operationAmount": {"amount": "5", "currency": {"code": "USD", "name": "USD"}}, "amount_minor": 500,
+    }]
+    assert (tmp_path / "operations.json.cache").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Файл не должен разбираться повторно")
+
+    monkeypatch.setattr(file_loaders, "iter_json", fail)
+    assert load_cached(str(source)) == first
+
+    monkeypatch.undo()
+    source.write_text(json.dumps([{"id": 2, "state": "pending"}, {"id": 3}]), encoding="utf-8")
+    os.utime(source, ns=(0, 0))
+    assert [row["id"] for row in load_cached(str(source))] == [2, 3]
+
+
+def test_load_cached_loader_version_invalidates(tmp_path, monkeypatch):
+    source = tmp_path / "transactions.csv"
+    source.write_text("id;state\n1;executed\n", encoding="utf-8")
+    load_cached(str(source))
+
+    monkeypatch.setattr(file_loaders, "LOADER_VERSION", file_loaders.LOADER_VERSION + 1)
+    calls = []
+    monkeypatch.setattr(file_loaders, "load_csv", lambda path: calls.append(path) or [{"id": 1, "state": "x"}])
+
+    assert load_cached(str(source))[0]["state"] == "X"
+    assert calls == [str(source)]
+
+
+def test_load_cached_errors(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_cached(str(tmp_path / "missing.json"))
+    # Отсутствующий файл сообщается раньше формата
+    with pytest.raises(FileNotFoundError):
+        load_cached(str(tmp_path / "data.txt"))
+    with pytest.raises(FileNotFoundError):
+        load_table(str(tmp_path / "data.txt"))
+
+    (tmp_path / "data.txt").write_text("id;state\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_cached(str(tmp_path / "data.txt"))
+
+
+def test_table_round_trip(tmp_path, fingerprint):
+    rows = normalize_transaction_data(list(generate_operations(500, seed=1)))
+    rows[0]["comment"] = {"text": "проверка"}
+    rows.append({"id": None, "amount": None})
+    table = TransactionTable.from_transactions(rows)
+    cache_path = tmp_path / "data.json.table.cache"
+
+    write_table(cache_path, table, fingerprint)
+    loaded = read_table(cache_path, fingerprint)
+
+    assert isinstance(loaded, TransactionTable)
+    assert loaded.to_list() == table.to_list()
+    assert loaded.sorted_indices() == table.sorted_indices()
+    assert loaded.indices_where_state("executed") == table.indices_where_state("EXECUTED")
+    assert loaded.indices_where_currency("USD") == table.indices_where_currency("USD")
+
+    assert read_table(cache_path, dict(fingerprint, size=2)) is None
+    cache_path.write_bytes(cache_path.read_bytes()[:-1])
+    assert read_table(cache_path, fingerprint) is None
+
+
+def test_write_table_rejects_non_string_keys(tmp_path, fingerprint):
+    table = TransactionTable.from_transactions([{"id": 1, None: ["лишнее поле"]}])
+
+    with pytest.raises(TypeError):
+        write_table(tmp_path / "data.csv.table.cache", table, fingerprint)
+
+
+def test_load_table_uses_cache(tmp_path, monkeypatch):
+    source = tmp_path / "operations.json"
+    source.write_text(json.dumps([{"id": 1, "state": "executed", "amount": "5", "currency": "USD"}]), encoding="utf-8")
+
+    first = load_table(str(source))
+    assert (tmp_path / "operations.json.table.cache").exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Файл не должен разбираться повторно")
+
+    monkeypatch.setattr(file_loaders, "iter_json", fail)
+    cached = load_table(str(source))
+    assert cached.to_list() == first.to_list() == [{
+        "id": 1, "state": "EXECUTED",
+        "operationAmount": {"amount": "5.00", "currency": {"name": "USD", "code": "USD"}},
+        "amount_minor": 500,
+    }]
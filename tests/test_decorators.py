@@ -1,6 +1,8 @@
+from logging.handlers import QueueHandler
+
 import pytest
 
-from src.decorators import log
+from src.decorators import ProfileRegistry, flush_logs, log, profile, profile_registry, setup_logger, short_repr
 
 
 @log(filename="mylog.txt")
@@ -16,6 +18,7 @@ def division(x, y):
 def test_summary(capsys):
     result = summary(1, 2)
     assert result == 3
+    flush_logs()
 
     with open("logs/mylog.txt", "r") as log_file:
         log_content = log_file.readlines()
@@ -26,7 +29,102 @@ def test_summary(capsys):
 def test_division(capsys):
     with pytest.raises(ZeroDivisionError):
         division(1, 0)
+    flush_logs()
 
     with open("logs/mylog.txt", "r") as log_file:
         log_content = log_file.readlines()
         assert any("division error: ZeroDivisionError" in line for line in log_content)
+
+
+def test_handler_registered_once():
+    logger = setup_logger("mylog.txt")
+    assert logger is setup_logger("mylog.txt")
+    assert sum(isinstance(handler, QueueHandler) for handler in logger.handlers) == 1
+
+    flush_logs()
+    with open("logs/mylog.txt", "r") as log_file:
+        lines_before = len(log_file.readlines())
+
+    summary(2, 2)
+    flush_logs()
+    with open("logs/mylog.txt", "r") as log_file:
+        new_lines = log_file.readlines()[lines_before:]
+    assert len(new_lines) == 2
+    assert "summary result: 4" in new_lines[-1]
+
+
+def test_short_repr_truncates_large_values():
+    transactions = [{"id": i, "description": "Перевод организации"} for i in range(100000)]
+    text = short_repr((transactions,))
+    assert len(text) <= 200
+    assert text.startswith("([{")
+
+
+@pytest.fixture
+def registry():
+    enabled = profile_registry.enabled
+    profile_registry.configure(enabled=True, sample_rate=1.0)
+    profile_registry.reset()
+    yield profile_registry
+    profile_registry.configure(enabled=enabled, sample_rate=1.0)
+    profile_registry.reset()
+
+
+def test_profile_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("BANK_PROFILE", raising=False)
+    assert not ProfileRegistry().enabled
+    monkeypatch.setenv("BANK_PROFILE", "1")
+    assert ProfileRegistry().enabled
+
+
+@profile()
+def busy(n):
+    return sum(range(n))
+
+
+def test_profile_records_calls_and_percentiles(registry):
+    for _ in range(20):
+        busy(1000)
+
+    stats = registry.snapshot()[f"{__name__}.busy"]
+    assert stats["calls"] == 20
+    assert stats["sampled"] == 20
+    assert stats["wall_total"] > 0
+    assert 0 < stats["p50"] <= stats["p95"] <= stats["p99"] <= stats["wall_max"]
+
+
+def test_profile_sampling_and_reset(registry):
+    registry.configure(enabled=True, sample_rate=0.0)
+    busy(10)
+    stats = registry.snapshot()[f"{__name__}.busy"]
+    assert stats["calls"] == 1
+    assert stats["sampled"] == 0
+
+    registry.reset()
+    assert f"{__name__}.busy" not in registry.snapshot()
+
+    registry.configure(enabled=False)
+    busy(10)
+    assert registry.snapshot() == {}
+
+    with pytest.raises(ValueError):
+        registry.configure(sample_rate=2)
+
+
+def test_profile_reset_keeps_profile_objects(registry):
+    busy(10)
+    stats = registry.profile_for(f"{__name__}.busy")
+    registry.reset()
+    assert registry.profile_for(f"{__name__}.busy") is stats
+    assert stats.calls == 0 and stats.histogram == {}
+
+    busy(10)
+    assert registry.snapshot()[f"{__name__}.busy"]["calls"] == 1
+
+
+def test_profile_keeps_function_metadata(registry):
+    assert busy.__name__ == "busy"
+    from src.processing import filter_by_state
+
+    filter_by_state([{"state": "EXECUTED"}])
+    assert registry.snapshot()["src.processing.filter_by_state"]["calls"] == 1
@@ -0,0 +1,49 @@
+import pytest
+
+from src.description_index import DescriptionIndex
+from src.regex_operations import filter_by_description
+from src.transaction_table import TransactionTable
+
+DATA = [
+    {"id": 1, "description": "Перевод организации"},
+    {"id": 2, "description": "Перевод с карты на карту"},
+    {"id": 3, "description": "Открытие вклада"},
+    {"id": 4, "description": "перевод ОРГАНИЗАЦИИ"},
+    {"id": 5, "description": "Пополнение (срочное)"},
+    {"id": 6},
+    {"id": 7, "description": "Снятие-наличных"},
+]
+
+
+@pytest.fixture
+def index():
+    return DescriptionIndex(DATA)
+
+
+class TestDescriptionIndex:
+    """Тесты для инвертированного индекса описаний"""
+
+    def test_search_word(self, index):
+        assert index.search_word("ПЕРЕВОД") == [0, 1, 3]
+        assert index.search_word("карт") == []
+        assert index.search_word("карты") == [1]
+
+    def test_search_prefix(self, index):
+        assert index.search_prefix("ка") == [1]
+        assert index.search_prefix("Пере") == [0, 1, 3]
+        assert index.search_prefix("я") == []
+
+    @pytest.mark.parametrize(
+        "search", ["перевод", "ОРГАН", "вклад", "е-н", "(срочное)", "с карты на", "ревод орг", "нет такого", "е"]
+    )
+    def test_filter_with_index_matches_scan(self, index, search):
+        assert filter_by_description(DATA, search, index=index) == filter_by_description(DATA, search)
+
+    def test_filter_table_with_index(self):
+        table = TransactionTable.from_transactions(DATA)
+        result = filter_by_description(table, "перевод", index=DescriptionIndex(table))
+        assert [row["id"] for row in result] == [1, 2, 4]
+
+    def test_index_for_other_data(self, index):
+        with pytest.raises(ValueError, match="Индекс построен по другому набору данных"):
+            filter_by_description(DATA[:2], "перевод", index=index)
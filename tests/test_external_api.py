@@ -0,0 +1,285 @@
+import asyncio
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+from src import external_api  # noqa: E402
+from src.external_api import (  # noqa: E402
+    AsyncRateConverter,
+    RateCache,
+    RetryableRateError,
+    aconvert_many,
+    aconvert_to_rub,
+    afetch_rate,
+    convert_many_historical,
+    convert_many_to_rub,
+    fetch_rate,
+)
+from src.rate_store import RateStore  # noqa: E402
+
+
+class TestConvertManyToRub:
+    """Тесты для пакетной конвертации convert_many_to_rub"""
+
+    def test_each_currency_fetched_once(self):
+        """Тест что курс каждой валюты запрашивается один раз"""
+        fetcher = MagicMock(side_effect=lambda currency, date: {"USD": 90.0, "EUR": 100.0}[currency])
+        transactions = [
+            {"amount": "10", "currency": "USD"},
+            {"amount": "2", "currency": "EUR"},
+            {"amount": "5", "currency": "RUB"},
+            {"operationAmount": {"amount": "1.5", "currency": {"code": "USD", "name": "USD"}}},
+        ]
+
+        result = convert_many_to_rub(transactions, fetcher=fetcher, cache=RateCache())
+
+        assert result == [900.0, 200.0, 5.0, 135.0]
+        assert fetcher.call_count == 2
+
+    def test_rates_per_date(self):
+        """Тест конвертации по курсу на дату операции"""
+        fetcher = MagicMock(side_effect=lambda currency, date: 90.0 if date == "2019-01-01" else 60.0)
+        transactions = [
+            {"amount": "1", "currency": "USD", "date": "2019-01-01T10:00:00"},
+            {"amount": "1", "currency": "USD", "date": "2015-06-01T10:00:00"},
+            {"amount": "1", "currency": "USD", "date": "2019-01-01T23:00:00"},
+        ]
+
+        result = convert_many_to_rub(transactions, fetcher=fetcher, cache=RateCache(), by_date=True)
+
+        assert result == [90.0, 60.0, 90.0]
+        assert fetcher.call_count == 2
+
+    def test_failed_rate_keeps_amount(self):
+        """Тест что при ошибке получения курса сумма не меняется и не кешируется"""
+        cache = RateCache()
+        result = convert_many_to_rub([{"amount": "7", "currency": "USD"}], fetcher=lambda c, d: None, cache=cache)
+
+        assert result == [7.0]
+        assert cache.get("USD") is None
+
+
+class TestRateCache:
+    """Тесты для кеша курсов RateCache"""
+
+    def test_ttl_expiry(self):
+        cache = RateCache(ttl=10)
+        with patch("src.external_api.time.time", return_value=1000.0):
+            cache.put("USD", 90.0)
+        with patch("src.external_api.time.time", return_value=1005.0):
+            assert cache.get("USD") == 90.0
+        with patch("src.external_api.time.time", return_value=1011.0):
+            assert cache.get("USD") is None
+
+    def test_dated_rates_do_not_expire(self, tmp_path):
+        path = tmp_path / "rates.json"
+        cache = RateCache(ttl=10, path=path)
+        with patch("src.external_api.time.time", return_value=1000.0):
+            cache.put("USD", 90.0)
+            cache.put("USD", 70.0, "2019-01-01")
+            cache.put("USD", 80.0, "")
+        with patch("src.external_api.time.time", return_value=5000.0):
+            assert cache.get("USD", "2019-01-01") == 70.0
+            assert cache.get("USD", "") is None
+            cache.save()
+            assert RateCache(ttl=10, path=path).get("USD", "2019-01-01") == 70.0
+            assert cache.get("USD") is None
+
+    def test_live_and_empty_date_keys_differ(self):
+        cache = RateCache()
+        cache.put("USD", 90.0)
+        assert cache.get("USD", "") is None
+        cache.put("USD", 80.0, "")
+        assert (cache.get("USD"), cache.get("USD", "")) == (90.0, 80.0)
+
+    def test_default_path_is_anchored_to_project(self):
+        assert external_api.RATE_CACHE_PATH.parent.parent == Path(external_api.__file__).resolve().parent.parent
+
+    def test_disk_roundtrip(self, tmp_path):
+        path = tmp_path / "rates.json"
+        cache = RateCache(path=path)
+        cache.put("USD", 90.0)
+        cache.put("EUR", 100.0, "2020-01-01")
+        cache.save()
+
+        restored = RateCache(path=path)
+        assert restored.get("USD") == 90.0
+        assert restored.get("EUR", "2020-01-01") == 100.0
+        assert restored.get("EUR") is None
+
+    def test_corrupted_file_ignored(self, tmp_path):
+        path = tmp_path / "rates.json"
+        path.write_text("{broken")
+        assert RateCache(path=path).get("USD") is None
+
+
+def test_fetch_rate_uses_shared_session():
+    """Тест что запросы курсов идут через общую сессию с таймаутом"""
+    session = MagicMock()
+    session.get.return_value.status_code = 200
+    session.get.return_value.json.return_value = {"result": 91.5}
+
+    with patch.object(external_api, "_session", session):
+        assert fetch_rate("USD", "2020-01-01") == 91.5
+
+    kwargs = session.get.call_args.kwargs
+    assert kwargs["params"] == {"to": "RUB", "from": "USD", "amount": 1, "date": "2020-01-01"}
+    assert kwargs["timeout"] == external_api.REQUEST_TIMEOUT
+
+
+def test_afetch_rate_uses_session_per_thread():
+    """Тест что асинхронные запросы идут через сессию своего потока"""
+    sessions = {}
+
+    def new_session():
+        session = MagicMock()
+        session.get.return_value.status_code = 200
+        session.get.return_value.json.return_value = {"result": 90.0}
+        sessions[threading.get_ident()] = session
+        return session
+
+    with patch.object(external_api, "_new_session", side_effect=new_session):
+        assert asyncio.run(afetch_rate("USD")) == 90.0
+        worker = threading.Thread(target=external_api._thread_session)
+        worker.start()
+        worker.join()
+
+    assert len(sessions) == 2
+    assert threading.get_ident() not in sessions
+
+
+class FakeRateServer:
+    """Имитация сервиса курсов: задержка, счетчик запросов и заданные ошибки"""
+
+    def __init__(self, rates, failures=0, delay=0.01):
+        self.rates = rates
+        self.failures = failures
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, currency, date):
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise RetryableRateError("HTTP 429")
+            return self.rates.get(currency)
+        finally:
+            self.active -= 1
+
+
+class TestAsyncConversion:
+    """Тесты для асинхронной конвертации"""
+
+    def test_aconvert_many_limits_concurrency(self):
+        rates = {f"C{i}": float(i) for i in range(10)}
+        server = FakeRateServer(rates)
+        converter = AsyncRateConverter(concurrency=3, fetcher=server, cache=RateCache())
+        transactions = [{"amount": "2", "currency": f"C{i % 10}"} for i in range(50)]
+        transactions.append({"amount": "3", "currency": "RUB"})
+
+        result = asyncio.run(aconvert_many(transactions, converter))
+
+        assert result[:10] == [2.0 * i for i in range(10)]
+        assert result[-1] == 3.0
+        assert server.calls == 10
+        assert server.max_active == 3
+
+    def test_aconvert_many_saves_only_new_rates(self):
+        cache = RateCache()
+        cache.put("USD", 90.0)
+        converter = AsyncRateConverter(fetcher=FakeRateServer({"EUR": 100.0}), cache=cache)
+
+        with patch.object(cache, "save") as save:
+            cached = [{"amount": "1", "currency": "USD"}, {"amount": "1", "currency": "RUB"}]
+            asyncio.run(aconvert_many(cached, converter))
+            asyncio.run(aconvert_many([{"amount": "1", "currency": "GBP"}], converter))
+            save.assert_not_called()
+
+            asyncio.run(aconvert_many([{"amount": "1", "currency": "EUR"}], converter))
+            save.assert_called_once()
+
+    def test_concurrent_requests_coalesced(self):
+        server = FakeRateServer({"USD": 90.0})
+        converter = AsyncRateConverter(fetcher=server, cache=RateCache())
+
+        async def run():
+            transaction = {"amount": "1", "currency": "USD"}
+            return await asyncio.gather(*(aconvert_to_rub(transaction, converter) for _ in range(5)))
+
+        assert asyncio.run(run()) == [90.0] * 5
+        assert server.calls == 1
+
+    def test_timed_out_request_keeps_its_slot(self):
+        """Тест что запрос в потоке, прерванный по таймауту, занимает слот, пока не завершится"""
+        lock = threading.Lock()
+        load = {"active": 0, "max_active": 0}
+
+        def slow_get(*args, **kwargs):
+            with lock:
+                load["active"] += 1
+                load["max_active"] = max(load["max_active"], load["active"])
+            time.sleep(0.05)
+            with lock:
+                load["active"] -= 1
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"result": 90.0}
+            return response
+
+        session = MagicMock()
+        session.get.side_effect = slow_get
+        converter = AsyncRateConverter(concurrency=1, timeout=0.01, retries=2, backoff=0.001, cache=RateCache())
+        transactions = [{"amount": "1", "currency": "USD"}, {"amount": "1", "currency": "EUR"}]
+
+        with patch.object(external_api, "_new_session", return_value=session):
+            assert asyncio.run(aconvert_many(transactions, converter)) == [1.0, 1.0]
+        assert load["max_active"] == 1
+
+    def test_retry_with_backoff(self):
+        server = FakeRateServer({"USD": 90.0}, failures=2)
+        converter = AsyncRateConverter(retries=3, backoff=0.001, fetcher=server, cache=RateCache())
+
+        assert asyncio.run(aconvert_to_rub({"amount": "2", "currency": "USD"}, converter)) == 180.0
+        assert server.calls == 3
+
+    def test_retries_exhausted_and_timeout(self):
+        server = FakeRateServer({"USD": 90.0}, failures=10)
+        converter = AsyncRateConverter(retries=1, backoff=0.001, fetcher=server, cache=RateCache())
+        assert asyncio.run(aconvert_to_rub({"amount": "2", "currency": "USD"}, converter)) == 2.0
+        assert server.calls == 2
+
+        slow = FakeRateServer({"USD": 90.0}, delay=1)
+        converter = AsyncRateConverter(timeout=0.01, retries=0, fetcher=slow, cache=RateCache())
+        assert asyncio.run(aconvert_to_rub({"amount": "2", "currency": "USD"}, converter)) == 2.0
+
+
+def test_convert_many_historical():
+    """Тест конвертации по курсу на дату операции из локального хранилища"""
+    with RateStore(max_age_days=None) as store:
+        store.add_rates([("USD", "2019-01-01", 70.0), ("USD", "2019-07-01", 60.0)])
+        transactions = [
+            {"date": "2019-03-15T10:00:00", "operationAmount": {"amount": "2", "currency": {"code": "USD"}}},
+            {"date": "2019-08-26T10:50:58.294041", "amount": "1", "currency": "USD"},
+            {"date": "2019-08-26T10:50:58.294041", "amount": "5", "currency": "RUB"},
+            {"date": "2018-01-01T00:00:00", "amount": "3", "currency": "USD"},
+        ]
+
+        assert convert_many_historical(transactions, store) == [140.0, 60.0, 5.0, 3.0]
+        with pytest.raises(ValueError, match="Нет курса USD"):
+            convert_many_historical(transactions, store, strict=True)
+
+        malformed = [{"date": "26.08.2019", "amount": "4", "currency": "USD"}]
+        assert convert_many_historical(malformed, store) == [4.0]
+        with pytest.raises(ValueError, match="Некорректная дата операции: '26.08.2019'"):
+            convert_many_historical(malformed, store, strict=True)
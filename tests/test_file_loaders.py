@@ -6,7 +6,18 @@ from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
-from src.file_loaders import load_csv, load_json, load_transactions, load_xlsx
+from src import file_loaders
+from src.file_loaders import (
+    JSON_CHUNK_SIZE,
+    iter_csv,
+    iter_json,
+    iter_xlsx,
+    load_csv,
+    load_csv_parallel,
+    load_json,
+    load_transactions,
+    load_xlsx,
+)
 
 
 class TestLoadJson:
@@ -59,6 +70,120 @@ class TestLoadJson:
             os.unlink(temp_path)
 
 
+class TestIterJson:
+    """Тесты для функции iter_json"""
+
+    def test_iter_json_matches_load_json(self):
+        """Тест что потоковое чтение дает те же данные, что и load_json"""
+        test_data = [{"id": i, "description": "Перевод организации", "amount": i * 1.5} for i in range(200)]
+        test_data.append({"id": 12345678901, "nested": {"list": [1, 2, 3]}, "text": "скобка ] и запятая ,"})
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as f:
+            json.dump(test_data, f, ensure_ascii=False, indent=2)
+            temp_path = f.name
+
+        try:
+            # Маленький блок чтения, чтобы элементы попадали на границы блоков
+            assert list(iter_json(temp_path, chunk_size=7)) == test_data
+            assert list(iter_json(temp_path)) == load_json(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.parametrize("content, expected", [("[]", []), (" [ 1 , 22 , 333 ] ", [1, 22, 333])])
+    def test_iter_json_scalars_and_empty(self, content, expected):
+        """Тест пустого массива и чисел на границе блока"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write(content)
+            temp_path = f.name
+
+        try:
+            assert list(iter_json(temp_path, chunk_size=2)) == expected
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.parametrize("content", ["[1e5]", "[1, 1e5]", "[-2.5E-3, 10.25]", '[{"id": 1}, 123456789.5e2]'])
+    def test_iter_json_numbers_cut_in_fraction_or_exponent(self, content):
+        """Тест чисел, оборванных на границе блока внутри дробной части или экспоненты"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write(content)
+            temp_path = f.name
+
+        try:
+            for chunk_size in range(1, len(content) + 1):
+                assert list(iter_json(temp_path, chunk_size=chunk_size)) == json.loads(content)
+        finally:
+            os.unlink(temp_path)
+
+    @pytest.mark.parametrize("content", ["[1] garbage", "[] x", '[{"id": 1}]\n]'])
+    def test_iter_json_rejects_data_after_array(self, content):
+        """Тест что после закрывающей скобки допускаются только пробелы, как в load_json"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write(content)
+            temp_path = f.name
+
+        try:
+            for chunk_size in (1, 3, JSON_CHUNK_SIZE):
+                with pytest.raises(ValueError, match="Некорректный JSON формат"):
+                    list(iter_json(temp_path, chunk_size=chunk_size))
+            with pytest.raises(ValueError):
+                load_json(temp_path)
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_json_is_lazy(self):
+        """Тест что элементы выдаются до чтения конца файла"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write('[{"id": 1}, {"id": 2}, {broken')
+            temp_path = f.name
+
+        try:
+            items = iter_json(temp_path, chunk_size=4)
+            assert next(items) == {"id": 1}
+            assert next(items) == {"id": 2}
+            with pytest.raises(ValueError, match="Некорректный JSON формат"):
+                next(items)
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_json_malformed_element_fails_fast(self, monkeypatch):
+        """Тест что некорректный элемент не перечитывается до конца файла"""
+        calls = []
+
+        class CountingDecoder(json.JSONDecoder):
+            def raw_decode(self, s, idx=0):
+                calls.append(idx)
+                return super().raw_decode(s, idx)
+
+        monkeypatch.setattr(file_loaders.json, "JSONDecoder", CountingDecoder)
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            f.write('[{"id": 1, "amount": oops}, ' + ", ".join(['{"id": 2}'] * 5000) + "]")
+            temp_path = f.name
+
+        try:
+            with pytest.raises(ValueError, match="Некорректный JSON формат"):
+                list(iter_json(temp_path, chunk_size=64))
+            assert len(calls) == 1
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_json_not_list(self):
+        """Тест потокового чтения JSON не являющегося списком"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+            json.dump({"id": 1}, f)
+            temp_path = f.name
+
+        try:
+            with pytest.raises(TypeError, match="Данные в JSON файле должны быть списком"):
+                list(iter_json(temp_path))
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_json_file_not_found(self):
+        """Тест что отсутствие файла обнаруживается сразу при вызове"""
+        with pytest.raises(FileNotFoundError):
+            iter_json("non_existent_file.json")
+
+
 class TestLoadCsv:
     """Тесты для функции load_csv"""
 
@@ -120,6 +245,137 @@ class TestLoadCsv:
             load_csv("non_existent_file.csv")
 
 
+class TestIterCsv:
+    """Тесты для функции iter_csv"""
+
+    def test_iter_csv_normalizes_rows(self):
+        """Тест нормализации заголовков и значений"""
+        csv_content = " ID ;State;Description;Amount\n1.0; executed ;Перевод организации ;100\n\nabc;;;\n3;PENDING\n"
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write(csv_content)
+            temp_path = f.name
+
+        try:
+            rows = iter_csv(temp_path)
+            assert next(rows) == {"id": 1, "state": "EXECUTED", "description": "Перевод организации", "amount": "100"}
+            assert next(rows) == {"id": "abc", "state": None, "description": None, "amount": None}
+            assert next(rows) == {"id": 3, "state": "PENDING", "description": None, "amount": None}
+            assert list(rows) == []
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_csv_keeps_extra_fields(self):
+        """Тест что поля сверх заголовка сохраняются под ключом None, как в csv.DictReader"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write("id;state\n1;EXECUTED;лишнее; поле \n")
+            temp_path = f.name
+
+        try:
+            assert list(iter_csv(temp_path)) == [{"id": 1, "state": "EXECUTED", None: ["лишнее", " поле "]}]
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_csv_matches_load_csv(self):
+        """Тест что load_csv и iter_csv дают одинаковый результат"""
+        assert list(iter_csv("data/transactions.csv")) == load_csv("data/transactions.csv")
+
+    def test_iter_csv_empty_file(self):
+        """Тест потокового чтения пустого CSV файла"""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            temp_path = f.name
+
+        try:
+            with pytest.raises(ValueError, match="CSV файл пуст или не содержит заголовков"):
+                next(iter_csv(temp_path))
+        finally:
+            os.unlink(temp_path)
+
+    def test_iter_csv_file_not_found(self):
+        """Тест что отсутствие файла обнаруживается сразу при вызове"""
+        with pytest.raises(FileNotFoundError):
+            iter_csv("non_existent_file.csv")
+
+
+class TestLoadCsvParallel:
+    """Тесты для функции load_csv_parallel"""
+
+    @pytest.fixture
+    def quoted_csv(self, tmp_path):
+        """CSV с переводами строк, кавычками и разделителями внутри полей"""
+        lines = ['"id";state;description;amount']
+        for i in range(300):
+            description = f'"Перевод\n""{i}""; строка {i}"' if i % 3 == 0 else f"Перевод {i}"
+            lines.append(f"{i};executed;{description};{i * 10}")
+            if i % 50 == 0:
+                lines.append("")
+        path = tmp_path / "big.csv"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def test_load_csv_parallel_matches_load_csv(self, quoted_csv, monkeypatch):
+        """Тест что параллельная загрузка дает тот же результат в том же порядке"""
+        monkeypatch.setattr(file_loaders, "CSV_PARALLEL_MIN_CHUNK", 64)
+        monkeypatch.setattr(file_loaders, "CSV_PARALLEL_SCAN_BLOCK", 37)
+
+        result = load_csv_parallel(str(quoted_csv), workers=3)
+
+        assert result == load_csv(str(quoted_csv))
+        assert result[3]["description"] == 'Перевод\n"3"; строка 3'
+
+    def test_chunk_bounds_respect_quotes(self, quoted_csv, monkeypatch):
+        """Тест что границы частей не попадают внутрь полей в кавычках"""
+        monkeypatch.setattr(file_loaders, "CSV_PARALLEL_SCAN_BLOCK", 37)
+        content = quoted_csv.read_bytes()
+        start = content.index(b"\n") + 1
+
+        bounds = file_loaders._csv_chunk_bounds(quoted_csv, start, len(content), 20)
+
+        assert bounds[0][0] == start and bounds[-1][1] == len(content)
+        for (_, end), (begin, _) in zip(bounds, bounds[1:]):
+            assert end == begin
+            assert content[end - 1:end] == b"\n"
+            assert content[start:end].count(b'"') % 2 == 0
+
+    def test_unverified_chunks_fall_back_to_load_csv(self, tmp_path, monkeypatch):
+        """Тест что при кавычке в поле без кавычек четность ломается и загрузка идет в одном процессе"""
+        monkeypatch.setattr(file_loaders, "CSV_PARALLEL_MIN_CHUNK", 64)
+        lines = ["id;description;amount"]
+        for i in range(200):
+            description = f'Монитор {i}" экран' if i % 7 == 0 else f'"Перевод\n{i}"'
+            lines.append(f"{i};{description};{i}")
+        path = tmp_path / "stray.csv"
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+        serial_calls = []
+        serial = file_loaders.load_csv
+
+        def counting_load_csv(file_path):
+            serial_calls.append(file_path)
+            return serial(file_path)
+
+        monkeypatch.setattr(file_loaders, "load_csv", counting_load_csv)
+
+        result = load_csv_parallel(str(path), workers=2)
+
+        assert result == serial(str(path))
+        assert result[7]["description"] == 'Монитор 7" экран'
+        assert serial_calls == [str(path)]
+
+    def test_load_csv_parallel_small_file_uses_load_csv(self):
+        """Тест что небольшой файл читается в одном процессе"""
+        with patch("concurrent.futures.ProcessPoolExecutor") as mock_executor:
+            assert load_csv_parallel("data/transactions.csv", workers=4) == load_csv("data/transactions.csv")
+        mock_executor.assert_not_called()
+
+    def test_load_csv_parallel_errors(self):
+        """Тест ошибок параметров и отсутствующего файла"""
+        with pytest.raises(FileNotFoundError):
+            load_csv_parallel("non_existent_file.csv")
+        with pytest.raises(ValueError):
+            load_csv_parallel("data/transactions.csv", workers=0)
+
+
 class TestLoadXlsx:
     """Тесты для функции load_xlsx"""
 
@@ -165,6 +421,40 @@ class TestLoadXlsx:
         assert result[0]["amount"] == 1000.0
 
 
+class TestIterXlsx:
+    """Тесты для функции iter_xlsx"""
+
+    def test_iter_xlsx_read_only_with_column_plan(self):
+        """Тест потокового чтения XLSX с преобразованием по заголовку"""
+        mock_openpyxl = MagicMock()
+        mock_workbook = mock_openpyxl.load_workbook.return_value
+        mock_sheet = mock_workbook.active
+        mock_sheet.__getitem__.return_value = [
+            MagicMock(value="id"), MagicMock(value=" description "), MagicMock(value="amount"), MagicMock(value=None)
+        ]
+        mock_sheet.iter_rows.return_value = iter([
+            (1.0, " Перевод ", "1000,50", 7),
+            (None, None, None, None),
+            ("x", "Пополнение", 500, None),
+        ])
+
+        with tempfile.NamedTemporaryFile(suffix=".xlsx", delete=False) as f:
+            temp_path = f.name
+
+        try:
+            with patch.dict("sys.modules", {"openpyxl": mock_openpyxl}):
+                rows = list(iter_xlsx(temp_path))
+        finally:
+            os.unlink(temp_path)
+
+        assert mock_openpyxl.load_workbook.call_args.kwargs["read_only"] is True
+        mock_workbook.close.assert_called_once()
+        assert rows == [
+            {"id": 1, "description": "Перевод", "amount": "1000,50", "column_4": 7, "amount_minor": 100050},
+            {"id": "x", "description": "Пополнение", "amount": 500, "column_4": None, "amount_minor": 50000},
+        ]
+
+
 class TestLoadTransactions:
     """Тесты для функции load_transactions"""
 
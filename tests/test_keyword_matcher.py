@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from src.keyword_matcher import KeywordMatcher
+from src.regex_operations import compile_categories, count_by_category
+from src.transaction_table import TransactionTable
+
+
+def naive_count(data, categories):
+    result = {category: 0 for category in categories}
+    for operation in data:
+        description = operation.get("description", "").lower()
+        for category in categories:
+            if category.lower() in description:
+                result[category] += 1
+    return result
+
+
+@pytest.mark.parametrize(
+    "keywords, text, expected",
+    [
+        (["he", "she", "his", "hers"], "ushers", [0, 1, 3]),
+        (["a", "ab", "bab", "bc", "bca", "c", "caa"], "abccab", [0, 1, 3, 5]),
+        (["Перевод", "перевод", "СЧЕТ"], "Перевод со счета на счет", [0, 1, 2]),
+        (["abc"], "ab", []),
+        (["", "x"], "y", [0]),
+    ],
+)
+def test_find(keywords, text, expected):
+    assert sorted(KeywordMatcher(keywords).find(text)) == expected
+
+
+def test_count_matches_naive_scan():
+    rng = random.Random(42)
+    alphabet = "abcАБв "
+    categories = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(60)]
+    categories.append(categories[0])
+    data = [{"description": "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))} for _ in range(300)]
+    data.append({"id": 1})
+
+    assert count_by_category(data, categories) == naive_count(data, categories)
+
+    matcher = compile_categories(categories)
+    assert count_by_category(data, matcher) == naive_count(data, categories)
+    assert count_by_category(TransactionTable.from_transactions(data), matcher) == naive_count(data, categories)
+
+
+def test_count_with_compiled_matcher_and_empty_data():
+    matcher = compile_categories(["Перевод", "Вклад"])
+    assert count_by_category([], matcher) == {"Перевод": 0, "Вклад": 0}
+
+
+def test_count_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr("src.keyword_matcher.COUNT_MEMO_SIZE", 2)
+    matcher = KeywordMatcher(["ab"])
+    texts = ["ab", "xab", "c", "ab", "c", "xab"]
+    assert matcher.count(texts, [1, 2, 3, 4, 5, 6]) == [13]
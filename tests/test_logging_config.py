@@ -0,0 +1,29 @@
+import logging
+
+from benchmarks.startup import measure_startup
+from src.logging_config import LazyFileHandler, get_logger
+
+
+def test_lazy_file_handler_creates_file_on_first_record(tmp_path):
+    log_file = tmp_path / "nested" / "lazy.log"
+    handler = LazyFileHandler(str(log_file), mode="w")
+    assert not log_file.parent.exists()
+
+    handler.emit(logging.LogRecord("lazy", logging.INFO, __file__, 1, "первая запись", None, None))
+    handler.close()
+
+    assert log_file.read_text(encoding="utf-8").strip() == "первая запись"
+
+
+def test_get_logger_configures_once():
+    logger = get_logger("test_logging_config")
+    assert get_logger("test_logging_config") is logger
+    assert sum(isinstance(handler, LazyFileHandler) for handler in logger.handlers) == 1
+    assert not logger.propagate
+
+
+def test_import_main_has_no_side_effects():
+    """Импорт main не создает папку logs и не загружает openpyxl, requests и dotenv"""
+    result = measure_startup(runs=1)
+    assert result["files_created"] == []
+    assert result["heavy_modules_imported"] == []
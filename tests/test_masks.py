@@ -1,6 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
-from src.masks import get_mask_account, get_mask_card_number
+from src.masks import get_mask_account, get_mask_card_number, mask_accounts_bulk, mask_cards_bulk
 
 
 @pytest.mark.parametrize(
@@ -53,3 +55,32 @@ def test_raises_get_mask_account(
         get_mask_card_number(few_digits_for_account_number)
     with pytest.raises(ValueError):
         get_mask_card_number(many_digits)
+
+
+def test_mask_cards_bulk() -> None:
+    cards = ["1234567890123456", "7893567873803481", "12345", 12345, "12345678901234ab"]
+    assert mask_cards_bulk(cards) == ["1234 56** **** 3456", "7893 56** **** 3481", None, None, None]
+    assert mask_cards_bulk(iter([])) == []
+
+
+def test_mask_accounts_bulk() -> None:
+    accounts = ["12345678901234564356", "78935678738034823521", "1234", None]
+    assert mask_accounts_bulk(accounts) == ["**4356", "**3521", None, None]
+
+
+def test_bulk_matches_single_masking() -> None:
+    cards = [f"{n:016d}" for n in range(1000, 1100)]
+    accounts = [f"{n:020d}" for n in range(1000, 1100)]
+    assert mask_cards_bulk(cards) == [get_mask_card_number(card) for card in cards]
+    assert mask_accounts_bulk(accounts) == [get_mask_account(account) for account in accounts]
+
+
+def test_bulk_errors_summarized_once() -> None:
+    with patch("src.masks.logger") as mock_logger:
+        mask_cards_bulk(["1"] * 1000 + ["x" * 16])
+    mock_logger.warning.assert_called_once()
+    assert "1001" in mock_logger.warning.call_args[0][0]
+    mock_logger.error.assert_not_called()
+
+    with pytest.raises(ValueError, match="Неверная длина: 1"):
+        mask_accounts_bulk(["1"], strict=True)
@@ -87,3 +87,28 @@ def test_sort_by_date(
 def test_empty_data_for_sort_by_date(empty_data: List[Dict[str, Union[str, int]]]) -> None:
     with pytest.raises(ValueError):
         sort_by_date(empty_data)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit, offset", [(0, 0), (2, 0), (3, 2), (10, 0), (2, 5), (None, 3)])
+def test_sort_by_date_limit_offset(descending: bool, limit, offset: int) -> None:
+    data = [
+        {"id": 1, "date": "2020-01-02T12:00:00.000"},
+        {"id": 2},
+        {"id": 3, "date": "2021-05-01T12:00:00.000"},
+        {"id": 4, "date": "2020-01-02T12:00:00.000"},
+        {"id": 5, "date": "2019-11-30T12:00:00.000"},
+        {"id": 6, "date": ""},
+    ]
+    full = sort_by_date(data, descending)
+    end = None if limit is None else offset + limit
+
+    assert sort_by_date(data, descending, limit=limit, offset=offset) == full[offset:end]
+
+
+def test_sort_by_date_invalid_page() -> None:
+    data = [{"id": 1, "date": "2020-01-02T12:00:00.000"}]
+    with pytest.raises(ValueError):
+        sort_by_date(data, True, limit=-1)
+    with pytest.raises(TypeError):
+        sort_by_date(data, True, limit=1, offset="1")
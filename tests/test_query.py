@@ -0,0 +1,76 @@
+import pytest
+
+from src.file_loaders import load_cached
+from src.generators import filter_by_currency
+from src.processing import filter_by_state, sort_by_date
+from src.query import Query
+from src.regex_operations import filter_by_description
+from src.transaction_table import TransactionTable
+
+
+@pytest.fixture
+def operations(tmp_path):
+    source = tmp_path / "operations.json"
+    with open("data/operations.json", "rb") as file:
+        source.write_bytes(file.read())
+    return load_cached(str(source), use_cache=False)
+
+
+@pytest.mark.parametrize("descending", [True, False])
+def test_query_matches_function_pipeline(operations, descending):
+    expected = filter_by_state(operations, "executed")
+    expected = list(filter_by_currency(expected, "RUB"))
+    expected = filter_by_description(expected, "перевод")
+    expected = sort_by_date(expected, descending)
+
+    query = Query(operations).search("перевод").where_currency("RUB").where_state("executed")
+    result = query.order_by_date(descending).limit(5, offset=2).execute()
+
+    assert result.total == len(expected)
+    assert result.rows == expected[2:7]
+    assert query.count() == len(expected)
+    assert query.to_list() == filter_by_description(list(filter_by_currency(
+        filter_by_state(operations, "EXECUTED"), "RUB")), "перевод")
+
+
+def test_query_on_table(operations):
+    table = TransactionTable.from_transactions(operations)
+    query = Query(table).where_state("EXECUTED").where_currency("USD").order_by_date(False)
+
+    rows, total = query.execute()
+
+    assert isinstance(rows, TransactionTable)
+    expected = [row["id"] for row in Query(table.to_list()).where_state().where_currency("USD").order_by_date(False)]
+    assert [row["id"] for row in rows] == expected
+    assert total == len(expected)
+    assert Query(table).where_state("UNKNOWN").count() == 0
+
+
+def test_query_is_immutable_and_lazy():
+    data = [
+        {"id": 1, "state": "EXECUTED", "date": "2020-01-02"},
+        {"id": 2, "State": "executed"},
+        {"id": 3, "state": "CANCELED", "date": "2020-01-03"},
+        "not a dict",
+        {"id": 4, "state": "EXECUTED", "date": "2020-01-01", "description": None},
+    ]
+    base = Query(data)
+    executed = base.where_state()
+
+    assert base.count() == 4
+    assert [row["id"] for row in executed.order_by_date()] == [1, 4, 2]
+    assert [row["id"] for row in executed.search("x")] == []
+    assert executed.search("") is executed
+    assert [row["id"] for row in executed.limit(1, offset=1)] == [2]
+
+
+def test_query_validation():
+    with pytest.raises(TypeError):
+        Query("not a list")
+    with pytest.raises(TypeError):
+        Query([]).where_state(1)
+    with pytest.raises(TypeError):
+        Query([]).order_by_date("yes")
+    with pytest.raises(ValueError):
+        Query([]).limit(-1)
+    assert Query([]).execute() == ([], 0)
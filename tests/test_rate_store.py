@@ -0,0 +1,88 @@
+import os
+import tempfile
+
+import pytest
+
+from src.rate_store import RateStore
+
+
+@pytest.fixture
+def store():
+    with RateStore() as rate_store:
+        rate_store.add_rates([
+            ("USD", "2019-01-01", 69.5),
+            ("USD", "2019-01-10", 67.0),
+            ("usd ", "2019-01-05", 68.0),
+            ("EUR", "2019-01-01", 79.0),
+        ])
+        yield rate_store
+
+
+class TestRateStore:
+    """Тесты для хранилища исторических курсов"""
+
+    @pytest.mark.parametrize(
+        "currency, day, expected",
+        [
+            ("USD", "2019-01-01", 69.5),
+            ("USD", "2019-01-04T23:59:59.000001", 69.5),
+            ("USD", "2019-01-05", 68.0),
+            ("usd ", "2019-01-05", 68.0),
+            ("USD", "2019-01-24", 67.0),
+            ("USD", "2019-01-25", None),
+            ("USD", "2018-12-31", None),
+            ("EUR", "2019-01-15", 79.0),
+            ("GBP", "2019-03-01", None),
+            ("RUB", "2000-01-01", 1.0),
+        ],
+    )
+    def test_rate_on(self, store, currency, day, expected):
+        assert store.rate_on(currency, day) == expected
+
+    def test_unlimited_age(self):
+        with RateStore(max_age_days=None) as store:
+            store.add_rates([("USD", "2019-01-10", 67.0)])
+            assert store.rate_on("USD", "2020-06-01") == 67.0
+
+    def test_malformed_date(self, store):
+        with pytest.raises(ValueError, match="Некорректная дата: '26.08.2019'"):
+            store.rate_on("USD", "26.08.2019")
+
+    def test_replace_rate(self, store):
+        assert store.rate_on("USD", "2019-01-10") == 67.0
+        store.add_rates([("USD", "2019-01-10", 66.0)])
+        assert store.rate_on("USD", "2019-01-10") == 66.0
+
+    def test_import_csv(self):
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+            f.write("Date;Currency;Rate\n2020-01-01;USD;61,9\n\n2020-01-02;EUR;69,3\n")
+            temp_path = f.name
+
+        try:
+            with RateStore() as store:
+                assert store.import_csv(temp_path, delimiter=";") == 2
+                assert store.rate_on("USD", "2020-01-03") == 61.9
+                assert store.rate_on("EUR", "2020-01-02") == 69.3
+        finally:
+            os.unlink(temp_path)
+
+    def test_import_csv_errors(self):
+        with RateStore() as store:
+            with pytest.raises(FileNotFoundError):
+                store.import_csv("non_existent_rates.csv")
+
+            with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False, encoding="utf-8") as f:
+                f.write("code,value\nUSD,1\n")
+                temp_path = f.name
+            try:
+                with pytest.raises(ValueError, match="currency, date, rate"):
+                    store.import_csv(temp_path)
+            finally:
+                os.unlink(temp_path)
+
+    def test_persisted_to_file(self, tmp_path):
+        path = tmp_path / "rates.sqlite"
+        with RateStore(path) as store:
+            store.add_rates([("USD", "2021-01-01", 73.0)])
+        with RateStore(path) as store:
+            assert store.rate_on("USD", "2021-01-10") == 73.0
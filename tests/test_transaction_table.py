@@ -0,0 +1,187 @@
+import pytest
+
+from src.generators import filter_by_currency
+from src.processing import filter_by_state, sort_by_date
+from src.regex_operations import filter_by_description
+from src.transaction_table import MISSING_DATE, TransactionTable, extract_currency, parse_date_key
+
+
+@pytest.fixture
+def table(transactions):
+    return TransactionTable.from_transactions(transactions)
+
+
+class TestTransactionTable:
+    """Тесты для колоночного хранилища TransactionTable"""
+
+    def test_roundtrip_rows(self, transactions, table):
+        """Тест что строки таблицы совпадают с исходными транзакциями"""
+        assert len(table) == len(transactions)
+        for row, transaction in zip(table, transactions):
+            assert row["id"] == transaction["id"]
+            assert row["state"] == transaction["state"]
+            assert row["date"] == transaction["date"]
+            assert row["description"] == transaction["description"]
+            assert row["from"] == transaction["from"]
+            assert row["to"] == transaction["to"]
+            assert float(row["operationAmount"]["amount"]) == float(transaction["operationAmount"]["amount"])
+            assert row["operationAmount"]["currency"] == transaction["operationAmount"]["currency"]
+
+    def test_strings_are_dictionary_encoded(self, table):
+        """Тест что повторяющиеся строки хранятся один раз"""
+        assert len(table.states) == 3
+        assert len(table.currencies) == 2
+        assert len(table.descriptions) == 3
+
+    def test_flat_csv_rows(self):
+        """Тест построения таблицы из плоских записей CSV"""
+        table = TransactionTable.from_transactions([
+            {"id": 1, "state": " executed ", "amount": "100", "currency_code": "PEN", "currency_name": "Sol"},
+            {"id": None, "amount": None},
+            "not a dict",
+        ])
+
+        assert len(table) == 2
+        assert table[0]["state"] == "EXECUTED"
+        assert table[0]["operationAmount"] == {"amount": "100.00", "currency": {"name": "Sol", "code": "PEN"}}
+        assert "id" not in table[1]
+        assert table[1]["operationAmount"]["amount"] is None
+
+    def test_unknown_fields_are_kept(self):
+        """Тест что поля вне столбцов таблицы сохраняются в строке и после take"""
+        table = TransactionTable.from_transactions([
+            {"id": 1, "state": "EXECUTED", "category": "Переводы", None: ["лишнее"]},
+            {"id": 2, "state": "EXECUTED"},
+        ])
+
+        assert table[0]["category"] == "Переводы"
+        assert table[0][None] == ["лишнее"]
+        assert "category" not in table[1]
+        assert table.take([1, 0])[1]["category"] == "Переводы"
+
+
+class TestTableWithExistingFunctions:
+    """Тесты что существующие функции принимают TransactionTable"""
+
+    def test_filter_by_state(self, transactions, table):
+        table.append({"id": 1, "state": "canceled", "date": "2020-01-01T00:00:00"})
+
+        executed = filter_by_state(table, "executed")
+        assert isinstance(executed, TransactionTable)
+        assert [row["id"] for row in executed] == [t["id"] for t in filter_by_state(transactions, "EXECUTED")]
+        assert [row["id"] for row in filter_by_state(table, "CANCELED")] == [594226727, 1]
+        assert len(filter_by_state(table, "PENDING")) == 0
+
+    def test_filter_by_state_errors(self, table):
+        with pytest.raises(ValueError, match="Передан пустой список"):
+            filter_by_state(TransactionTable())
+        with pytest.raises(TypeError):
+            filter_by_state(table, 1)
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_sort_by_date(self, transactions, table, descending):
+        expected = [op["id"] for op in sort_by_date(transactions, descending)]
+        assert [row["id"] for row in sort_by_date(table, descending)] == expected
+
+    def test_filter_by_description(self, transactions, table):
+        expected = [op["id"] for op in filter_by_description(transactions, "ОРГАНИЗАЦИИ")]
+        result = filter_by_description(table, "ОРГАНИЗАЦИИ")
+        assert isinstance(result, TransactionTable)
+        assert [row["id"] for row in result] == expected
+
+    def test_filter_by_description_empty_returns_table(self, table):
+        assert isinstance(filter_by_description(table, ""), TransactionTable)
+        assert isinstance(filter_by_description(TransactionTable(), "Перевод"), TransactionTable)
+        assert len(filter_by_description(table, "")) == 0
+
+    def test_filter_by_currency(self, transactions, table):
+        expected = [op["id"] for op in filter_by_currency(transactions, "USD")]
+        assert [row["id"] for row in filter_by_currency(table, "USD")] == expected
+        assert list(filter_by_currency(table, "BYN")) == []
+
+    def test_filter_by_state_as_indices(self, transactions, table):
+        assert list(filter_by_state(table, " canceled ", as_indices=True)) == [4]
+        assert filter_by_state(transactions, "CANCELED", as_indices=True) == [4]
+
+    def test_state_index_is_cached_until_append(self, table):
+        first = table.indices_where_state("EXECUTED")
+        assert table._state_index[table.states.lookup("EXECUTED")] == first
+        # Изменение результата не портит кеш
+        first.append(100)
+        assert list(table.indices_where_state("executed")) == [0, 1, 2, 3]
+        assert table.states.lookup("PENDING") == 2
+
+        table.append({"id": 1, "state": "EXECUTED"})
+        assert list(table.indices_where_state("EXECUTED")) == [0, 1, 2, 3, 5]
+
+
+@pytest.mark.parametrize(
+    "transaction, expected",
+    [
+        ({"operationAmount": {"currency": {"code": "USD", "name": "USD"}}}, ("USD", "USD")),
+        ({"operationAmount": {"currency": "USD"}}, (None, None)),
+        ({"currency_code": "RUB", "currency_name": "Ruble"}, ("RUB", "Ruble")),
+        ({"currency": "EUR"}, ("EUR", "EUR")),
+        ({}, (None, None)),
+    ],
+)
+def test_extract_currency(transaction, expected):
+    assert extract_currency(transaction) == expected
+
+
+class TestDateKeys:
+    """Тесты столбца разобранных дат и кеша сортировки"""
+
+    @pytest.mark.parametrize(
+        "date, expected",
+        [
+            ("1970-01-01T00:00:00", 0),
+            ("1970-01-01T00:00:01.000002", 1_000_002),
+            ("1970-01-01T00:00:01Z", 1_000_000),
+            ("1970-01-02", 86_400_000_000),
+        ],
+    )
+    def test_parse_date_key(self, date, expected):
+        assert parse_date_key(date) == expected
+
+    @pytest.mark.parametrize("date", [None, "", "не дата", 123])
+    def test_parse_date_key_missing(self, date):
+        assert parse_date_key(date) == MISSING_DATE
+
+    def test_mixed_formats_and_ties(self):
+        table = TransactionTable.from_transactions([
+            {"id": 1, "date": "2023-09-05T11:30:32Z"},
+            {"id": 2, "date": "2023-09-05T11:30:32.500000"},
+            {"id": 3},
+            {"id": 4, "date": "2019-08-26T10:50:58.294041"},
+            {"id": 5, "date": "2023-09-05T11:30:32"},
+        ])
+
+        ascending = [row["id"] for row in sort_by_date(table, False)]
+        descending = [row["id"] for row in sort_by_date(table, True)]
+
+        assert ascending == [4, 1, 5, 2, 3]
+        assert descending == [2, 1, 5, 4, 3]
+
+    def test_sorted_indices_cached(self, table):
+        descending = table.sorted_indices(True)
+        ascending = table.sorted_indices(False)
+        assert table.sorted_indices(True) is descending
+        assert list(ascending) == list(reversed(descending))
+
+        table.append({"id": 1, "date": "2030-01-01T00:00:00"})
+        assert table.sorted_indices(True)[0] == len(table) - 1
+
+    @pytest.mark.parametrize("descending", [True, False])
+    def test_sort_limit_offset(self, transactions, descending):
+        expected = [op["id"] for op in sort_by_date(transactions, descending)]
+        table = TransactionTable.from_transactions(transactions + [{"id": 7}])
+        expected.append(7)
+
+        # Без кеша - выборка через кучу, с кешем - срез перестановки
+        first = [row["id"] for row in sort_by_date(table, descending, limit=3, offset=2)]
+        table.sorted_indices(descending)
+        second = [row["id"] for row in sort_by_date(table, descending, limit=3, offset=4)]
+
+        assert first == expected[2:5]
+        assert second == expected[4:7]
@@ -3,7 +3,7 @@ import tempfile
 import os
 import pytest
 from unittest.mock import patch, MagicMock
-from src.utils import transactions_loaded, normalize_transaction_data
+from src.utils import iter_normalized, transactions_loaded, normalize_transaction_data
 
 
 class TestTransactionsLoaded:
@@ -28,6 +28,37 @@ class TestTransactionsLoaded:
         finally:
             os.unlink(temp_path)
 
+    def test_load_transactions_stream(self):
+        """Тест потоковой загрузки транзакций"""
+        test_data = [{"id": 1, "amount": "100"}, {"id": 2, "amount": "200"}]
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(test_data, f)
+            temp_path = f.name
+
+        try:
+            result = transactions_loaded(temp_path, stream=True)
+            assert not isinstance(result, list)
+            assert list(result) == test_data
+            assert normalize_transaction_data(transactions_loaded(temp_path, stream=True))[1]["id"] == 2
+        finally:
+            os.unlink(temp_path)
+
+    def test_load_transactions_stream_errors(self):
+        """Тест что ошибки потоковой загрузки логируются, а не пробрасываются"""
+        assert transactions_loaded("non_existent_file.json", stream=True) == []
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            f.write('[{"id": 1}, {broken')
+            temp_path = f.name
+
+        try:
+            with patch('src.utils.logger') as mock_logger:
+                assert list(transactions_loaded(temp_path, stream=True)) == [{"id": 1}]
+                mock_logger.error.assert_called()
+        finally:
+            os.unlink(temp_path)
+
     @patch('src.utils.logger')
     @patch('src.file_loaders.load_json')
     def test_load_transactions_valid_file(self, mock_load_json, mock_logger):
@@ -346,4 +377,76 @@ class TestNormalizeTransactionData:
         assert result[0]["state"] == "EXECUTED"
         assert result[0]["operationAmount"]["amount"] == "1000"
         # Проверяем что пользовательское поле сохранено
-        assert result[0]["custom_field"] == "custom_value"
\ No newline at end of file
+        assert result[0]["custom_field"] == "custom_value"
+
+    def test_normalize_in_place(self):
+        """Тест нормализации без копирования записей"""
+        transactions = [{"id": 1, "state": "executed", "amount": "100", "currency": "USD"}]
+
+        result = normalize_transaction_data(transactions, in_place=True)
+
+        assert result[0] is transactions[0]
+        assert transactions[0]["state"] == "EXECUTED"
+        assert transactions[0]["operationAmount"]["currency"] == {"code": "USD", "name": "USD"}
+
+    def test_normalize_does_not_modify_source(self):
+        """Тест что без in_place исходные записи не изменяются"""
+        transactions = [{"id": 1, "state": "executed"}]
+
+        result = normalize_transaction_data(transactions)
+
+        assert result[0] is not transactions[0]
+        assert transactions[0] == {"id": 1, "state": "executed"}
+
+    def test_normalize_interns_currency_strings(self):
+        """Тест что строки валют общие, а словари валют у записей свои"""
+        transactions = [
+            {"id": 1, "amount": "100", "currency": "USD"},
+            {"id": 2, "amount": "200", "currency": "USD"},
+            {"id": 3, "operationAmount": "{'amount': '300', 'currency': {'code': 'USD', 'name': 'USD'}}"},
+            {"id": 4, "operationAmount": {"amount": "400", "currency": {"code": "USD", "name": "USD"}}},
+        ]
+
+        result = normalize_transaction_data(transactions, in_place=True)
+
+        currencies = [transaction["operationAmount"]["currency"] for transaction in result]
+        assert len({id(currency) for currency in currencies}) == 4
+        assert len({id(currency["code"]) for currency in currencies}) == 1
+        assert result[2]["operationAmount"]["amount"] == "300"
+
+        currencies[0]["name"] = "Доллар США"
+        assert [currency["name"] for currency in currencies[1:]] == ["USD", "USD", "USD"]
+        assert normalize_transaction_data([{"amount": "1", "currency": "USD"}])[0]["operationAmount"]["currency"] == {
+            "code": "USD", "name": "USD"
+        }
+
+    def test_iter_normalized_is_lazy(self):
+        """Тест что потоковая нормализация обрабатывает записи по мере чтения"""
+        consumed = []
+
+        def source():
+            for i in range(3):
+                consumed.append(i)
+                yield {"id": i, "state": "pending"}
+
+        stream = iter_normalized(source())
+        assert consumed == []
+        assert next(stream)["state"] == "PENDING"
+        assert consumed == [0]
+        assert [transaction["id"] for transaction in stream] == [1, 2]
+
+    def test_iter_normalized_rejects_invalid_type(self):
+        """Тест что неподходящий тип отклоняется сразу"""
+        with pytest.raises(TypeError):
+            iter_normalized("not a list")
+        with pytest.raises(TypeError):
+            iter_normalized({"id": 1, "state": "EXECUTED"})
+        with pytest.raises(TypeError):
+            iter_normalized(42)
+
+    def test_iter_normalized_accepts_any_collection(self):
+        """Тест что кортеж и другие коллекции записей принимаются наравне со списком"""
+        records = ({"id": 1, "state": "executed"}, {"id": 2, "state": "canceled"})
+
+        assert [transaction["state"] for transaction in iter_normalized(records)] == ["EXECUTED", "CANCELED"]
+        assert len(normalize_transaction_data(records)) == 2
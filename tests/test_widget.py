@@ -1,6 +1,6 @@
 import pytest
 
-from src.widget import get_date, mask_account_card
+from src.widget import clear_widget_caches, get_date, mask_account_card, widget_cache_stats
 
 
 @pytest.mark.parametrize(
@@ -45,3 +45,28 @@ def test_raises_get_date(
         get_date(invalid_day)
     with pytest.raises(ValueError):
         get_date(invalid_year)
+
+
+def test_widget_caches_repeated_values() -> None:
+    clear_widget_caches()
+
+    for _ in range(10):
+        assert mask_account_card("Visa 5364728986491234") == "Visa 5364 72** **** 1234"
+        assert get_date("2019-05-10T18:35:29.512364") == "10.05.2019"
+
+    stats = widget_cache_stats()
+    assert stats["mask_account_card"]["size"] == 1
+    assert stats["mask_account_card"]["hits"] == 9
+    assert stats["mask_account_card"]["hit_rate"] == 0.9
+    assert stats["get_date"]["misses"] == 1
+
+    clear_widget_caches()
+    assert widget_cache_stats()["get_date"] == {"size": 0, "maxsize": 65536, "hits": 0, "misses": 0, "hit_rate": 0.0}
+
+
+def test_widget_errors_not_cached(invalid_data_empty_string: str) -> None:
+    clear_widget_caches()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            mask_account_card(invalid_data_empty_string)
+    assert widget_cache_stats()["mask_account_card"]["size"] == 0